@@ -1,82 +1,286 @@
-from typing import Iterable
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from crewai import Crew, Process
 from pydantic import ValidationError
 
 from .agents import ImagePromptGenerationAgents, PromptConversionAgents
+from .progress import CrewProgressTracker, ProgressCallback, parse_structured_output, structured_call
 from .tasks import ImagePromptGenerationTasks, PromptConversionTasks
+from .templates import CrewTemplateRegistry, build_sequential_crew, crew_token_usage, kickoff_template
 from ..models.schemas import (
     ConvertPromptRequest,
     ConvertPromptResponse,
-    GeneratePromptFromImageRequest,
+    GeneratedPromptData,
     GeneratePromptRequest,
     GeneratePromptResponse,
     ProviderOptimizedPayload,
+    RegenerateSectionsRequest,
+    RegenerateSectionsResponse,
 )
+from ..services.blueprint_sections import (
+    SectionPath,
+    format_section_path,
+    merge_sections,
+    section_context,
+    section_schema,
+    section_values,
+)
+from ..services.image_ingest import PreparedImage
+from ..services.incremental_conversion import ConversionDelta, RewrittenPrompt
+from ..services.metrics import observe_progress, record_validation_error, timed_stage
+from ..services.prompt_encoding import compact_encoding, verbose_encoding
 from ..services.provider_config import ProviderConfigurationService
+from ..services.resilience import record_provider_failure
+from ..services.token_accounting import accounting, count_crew_tokens, count_message_tokens, count_tokens
+
+if TYPE_CHECKING:
+    from crewai import Crew
 
 
 class ImagePromptGenerationCrew:
     """Manages the CrewAI workflow for prompt generation."""
 
+    # Always shown to the model when regenerating sections, unless they are being regenerated themselves.
+    _SECTION_ANCHORS = (("intent",), ("prompt", "primary"))
+
     def __init__(self, provider_service: ProviderConfigurationService) -> None:
         self.provider_service = provider_service
         self.tasks = ImagePromptGenerationTasks()
+        self.templates = CrewTemplateRegistry()
+        provider_service.on_llm_evicted(self.templates.forget)
 
     @staticmethod
-    def _run_crew(agents: Iterable, tasks: Iterable) -> GeneratePromptResponse:
-        crew = Crew(agents=list(agents), tasks=list(tasks), process=Process.sequential, verbose=True)
+    def _run_crew(
+        crew: "Crew", inputs: Dict[str, Any], tracker: Optional[CrewProgressTracker] = None
+    ) -> GeneratePromptResponse:
         try:
-            result = crew.kickoff()
+            with timed_stage("crew"):
+                result = kickoff_template(crew, inputs, tracker)
         except Exception as error:  # pragma: no cover - CrewAI surfaces rich errors
+            record_provider_failure()
             return GeneratePromptResponse(success=False, error=str(error))
-        token_usage = getattr(result, "token_usage", None)
+        token_usage = crew_token_usage(crew)
         if token_usage is None:
-            token_usage = getattr(result, "usage_metrics", None)
+            token_usage = getattr(result, "token_usage", None)
         data = getattr(result, "json_dict", None)
-        return GeneratePromptResponse(success=True, data=data, token_usage=token_usage)
+        return GeneratePromptResponse(
+            success=True, data=data, token_usage=token_usage, prompt_tokens=accounting(count_crew_tokens(crew))
+        )
 
-    def generate_structured_prompt(self, request: GeneratePromptRequest) -> GeneratePromptResponse:
+    def generate_structured_prompt(
+        self,
+        request: GeneratePromptRequest,
+        progress: Optional[ProgressCallback] = None,
+        seed: Optional[GeneratedPromptData] = None,
+    ) -> GeneratePromptResponse:
+        """Generate a blueprint; with a ``seed`` (a similar prompt's blueprint) one call adapts it at any quality."""
         try:
-            llm = self.provider_service.create_llm(request.provider, api_keys=request.provider_api_keys)
+            lease = self.provider_service.lease_llm(request.provider, api_keys=request.provider_api_keys)
         except ValueError as error:
             return GeneratePromptResponse(success=False, error=str(error))
 
+        with lease as llm:
+            if request.quality == "fast" or seed is not None:
+                return self._generate_fast(llm, request, progress, seed)
+            crew = self.templates.get(llm, "generate", lambda: self._generation_crew(llm))
+            tracker = CrewProgressTracker(
+                observe_progress(progress),
+                llm,
+                ["refine_prompt", "edit_prompt"],
+                GeneratedPromptData if progress else None,
+            )
+            return self._run_crew(crew, {"prompt": request.prompt}, tracker)
+
+    def warm_up(self, provider_id: Optional[str] = None) -> None:
+        """Create the provider's pooled client and prebuild its generation (and, with vision, description) templates."""
+        with self.provider_service.lease_llm(provider_id) as llm:
+            self.templates.get(llm, "generate", lambda: self._generation_crew(llm))
+            self.templates.get(llm, "generate_fast", lambda: self._fast_agents(llm))
+            if self.provider_service.get_provider(provider_id).supports_vision:
+                self.templates.get(
+                    llm, "describe_image", lambda: ImagePromptGenerationAgents(llm).image_description_agent()
+                )
+
+    def estimate_tokens(self, request: GeneratePromptRequest, seed: Optional[GeneratedPromptData] = None) -> int:
+        """Token cost used to admit a generation run against provider rate limits."""
+        if seed is not None:
+            return self.tasks.estimate_seeded_tokens(request.prompt, seed, 2 if request.review else 1)
+        calls = 2 if request.quality == "standard" or request.review else 1
+        return self.tasks.estimate_generation_tokens(request.prompt, calls)
+
+    def estimate_image_tokens(self) -> int:
+        return self.tasks.estimate_description_tokens()
+
+    def _generation_crew(self, llm) -> "Crew":
         agents_factory = ImagePromptGenerationAgents(llm)
         prompt_drafter = agents_factory.prompt_drafter_agent()
         supervising_editor = agents_factory.supervising_editor_agent()
 
-        refine_prompt_task = self.tasks.refine_prompt(prompt_drafter, request.prompt)
+        refine_prompt_task = self.tasks.refine_prompt(prompt_drafter, "{prompt}")
         edit_prompt_task = self.tasks.edit_prompt(supervising_editor, [refine_prompt_task])
+        return build_sequential_crew([prompt_drafter, supervising_editor], [refine_prompt_task, edit_prompt_task])
 
-        return self._run_crew(
-            agents=[prompt_drafter, supervising_editor],
-            tasks=[refine_prompt_task, edit_prompt_task],
-        )
+    @staticmethod
+    def _structured_call(llm, messages: List[Dict[str, Any]]) -> Tuple[Optional[GeneratedPromptData], str]:
+        """One provider-native structured-output call, validated locally; returns the blueprint (or None) and raw text."""
+        raw = structured_call(llm, messages, GeneratedPromptData)
+        return parse_structured_output(SimpleNamespace(raw=raw, json_dict=None), GeneratedPromptData), raw
 
-    def generate_structured_prompt_from_image(
-        self, request: GeneratePromptFromImageRequest
+    def _generate_fast(
+        self,
+        llm,
+        request: GeneratePromptRequest,
+        progress: Optional[ProgressCallback] = None,
+        seed: Optional[GeneratedPromptData] = None,
     ) -> GeneratePromptResponse:
+        """Draft the blueprint in one schema-constrained call; run the editor only on invalid output or on request."""
+        drafter, editor = self.templates.get(llm, "generate_fast", lambda: self._fast_agents(llm))
+        planned = ["draft_prompt", "edit_prompt"] if request.review else ["draft_prompt"]
+        tracker = CrewProgressTracker(
+            observe_progress(progress), llm, planned, GeneratedPromptData if progress else None
+        )
+
+        input_tokens = 0
         try:
-            llm = self.provider_service.create_llm(
-                request.provider,
-                require_vision=True,
-                api_keys=request.provider_api_keys,
+            tracker.start()
+            if seed is not None:
+                messages = self.tasks.seeded_draft_messages(drafter, request.prompt, seed)
+            else:
+                messages = self.tasks.draft_prompt_messages(drafter, request.prompt)
+            input_tokens += count_message_tokens(messages)
+            data, raw = self._structured_call(llm, messages)
+            tracker.on_task_complete(SimpleNamespace(raw=raw, json_dict=None, agent=drafter.role))
+
+            if data is None or request.review:
+                if not request.review:
+                    tracker.extend("edit_prompt")
+                messages = self.tasks.edit_prompt_messages(editor, raw)
+                input_tokens += count_message_tokens(messages)
+                data, raw = self._structured_call(llm, messages)
+                tracker.on_task_complete(SimpleNamespace(raw=raw, json_dict=None, agent=editor.role))
+        except Exception as error:  # pragma: no cover - provider SDKs surface rich errors
+            record_provider_failure()
+            return GeneratePromptResponse(success=False, error=str(error))
+
+        token_usage = llm.get_token_usage_summary()
+        prompt_tokens = accounting(input_tokens)
+        if data is None:
+            record_validation_error()
+            return GeneratePromptResponse(
+                success=False,
+                error="Model did not return valid GeneratedPromptData JSON.",
+                token_usage=token_usage,
+                prompt_tokens=prompt_tokens,
             )
+        return GeneratePromptResponse(success=True, data=data, token_usage=token_usage, prompt_tokens=prompt_tokens)
+
+    def regenerate_sections(
+        self,
+        request: RegenerateSectionsRequest,
+        sections: Sequence[SectionPath],
+        progress: Optional[ProgressCallback] = None,
+    ) -> RegenerateSectionsResponse:
+        """Rewrite only ``sections`` of the blueprint in one schema-constrained call, then merge and validate locally."""
+        paths = [format_section_path(steps) for steps in sections]
+        try:
+            lease = self.provider_service.lease_llm(request.provider, api_keys=request.provider_api_keys)
         except ValueError as error:
-            return GeneratePromptResponse(success=False, error=str(error))
+            return RegenerateSectionsResponse(success=False, error=str(error), sections=paths)
 
-        agents_factory = ImagePromptGenerationAgents(llm)
-        image_analyst = agents_factory.image_description_agent()
+        schema = section_schema(GeneratedPromptData, tuple(sections))
+        material = self.section_material(request, sections)
+        with lease as llm:
+            drafter, editor = self.templates.get(llm, "generate_fast", lambda: self._fast_agents(llm))
+            messages = self.tasks.regenerate_sections_messages(drafter, material)
+            tracker = CrewProgressTracker(observe_progress(progress), llm, ["regenerate_sections"])
+            try:
+                tracker.start()
+                raw = structured_call(llm, messages, schema)
+            except Exception as error:  # pragma: no cover - provider SDKs surface rich errors
+                record_provider_failure()
+                return RegenerateSectionsResponse(success=False, error=str(error), sections=paths)
+            tracker.on_task_complete(SimpleNamespace(raw=raw, json_dict=None, agent=drafter.role))
+            token_usage = llm.get_token_usage_summary()
+            # Baseline: an editor pass over the whole blueprint, the cheapest way to redo it before.
+            full_pass = count_message_tokens(self.tasks.edit_prompt_messages(editor, compact_encoding(request.data)))
 
-        describe_image_task = self.tasks.describe_image(
-            image_analyst, request.image_base64, request.filename
+        input_tokens = count_message_tokens(messages)
+        prompt_tokens = accounting(input_tokens, max(0, full_pass - input_tokens))
+        regenerated = parse_structured_output(SimpleNamespace(raw=raw, json_dict=None), schema)
+        data = None
+        if regenerated is not None:
+            try:
+                data = merge_sections(request.data, sections, regenerated)
+            except ValidationError:
+                data = None
+        if data is None:
+            record_validation_error()
+            return RegenerateSectionsResponse(
+                success=False,
+                error="Model did not return valid JSON for the requested sections.",
+                token_usage=token_usage,
+                prompt_tokens=prompt_tokens,
+                sections=paths,
+            )
+        return RegenerateSectionsResponse(
+            success=True, data=data, token_usage=token_usage, prompt_tokens=prompt_tokens, sections=paths
         )
 
-        return self._run_crew(
-            agents=[image_analyst],
-            tasks=[describe_image_task],
-        )
+    def section_material(self, request: RegenerateSectionsRequest, sections: Sequence[SectionPath]) -> str:
+        context = section_context(request.data, sections, self._SECTION_ANCHORS)
+        return self.tasks.section_material(context, section_values(request.data, sections), request.instructions)
+
+    def estimate_section_tokens(self, request: RegenerateSectionsRequest, sections: Sequence[SectionPath]) -> int:
+        return self.tasks.estimate_section_tokens(self.section_material(request, sections))
+
+    @staticmethod
+    def _fast_agents(llm) -> Tuple[Any, Any]:
+        agents_factory = ImagePromptGenerationAgents(llm)
+        return agents_factory.prompt_drafter_agent(), agents_factory.supervising_editor_agent()
+
+    def describe_prepared_image(
+        self,
+        image: PreparedImage,
+        *,
+        provider: Optional[str],
+        api_keys: Optional[Dict[str, str]] = None,
+        filename: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> GeneratePromptResponse:
+        """Describe an already-normalised image with one vision call carrying the pixels as an image part."""
+        try:
+            lease = self.provider_service.lease_llm(provider, require_vision=True, api_keys=api_keys)
+        except ValueError as error:
+            return GeneratePromptResponse(success=False, error=str(error))
+
+        with lease as llm:
+            image_analyst = self.templates.get(
+                llm, "describe_image", lambda: ImagePromptGenerationAgents(llm).image_description_agent()
+            )
+            messages = self.tasks.describe_image_messages(image_analyst, image, filename)
+            tracker = CrewProgressTracker(observe_progress(progress), llm, ["describe_image"])
+
+            try:
+                tracker.start()
+                raw_output = llm.call(messages)
+            except Exception as error:  # pragma: no cover - provider SDKs surface rich errors
+                record_provider_failure()
+                return GeneratePromptResponse(success=False, error=str(error))
+
+            output = SimpleNamespace(raw=str(raw_output), json_dict=None, agent=image_analyst.role)
+            tracker.on_task_complete(output)
+            token_usage = llm.get_token_usage_summary()
+        prompt_tokens = accounting(count_message_tokens(messages))
+        data = parse_structured_output(output, GeneratedPromptData)
+        if data is None:
+            record_validation_error()
+            return GeneratePromptResponse(
+                success=False,
+                error="Vision model did not return valid GeneratedPromptData JSON.",
+                token_usage=token_usage,
+                prompt_tokens=prompt_tokens,
+            )
+        return GeneratePromptResponse(success=True, data=data, token_usage=token_usage, prompt_tokens=prompt_tokens)
 
 
 class PromptConversionCrew:
@@ -85,43 +289,191 @@ class PromptConversionCrew:
     def __init__(self, provider_service: ProviderConfigurationService) -> None:
         self.provider_service = provider_service
         self.tasks = PromptConversionTasks()
+        self.templates = CrewTemplateRegistry()
+        provider_service.on_llm_evicted(self.templates.forget)
 
     @staticmethod
-    def _run_crew(agents: Iterable, tasks: Iterable) -> ConvertPromptResponse:
-        crew = Crew(agents=list(agents), tasks=list(tasks), process=Process.sequential, verbose=True)
+    def _run_crew(
+        crew: "Crew",
+        inputs: Dict[str, Any],
+        tracker: Optional[CrewProgressTracker] = None,
+        baseline_tokens: int = 0,
+    ) -> ConvertPromptResponse:
+        """Kick off ``crew``; ``baseline_tokens`` is what the inputs would cost as indented JSON, for savings accounting."""
         try:
-            result = crew.kickoff()
+            with timed_stage("crew"):
+                result = kickoff_template(crew, inputs, tracker)
         except Exception as error:  # pragma: no cover - CrewAI surfaces rich errors
+            record_provider_failure()
             return ConvertPromptResponse(success=False, error=str(error))
-        token_usage = getattr(result, "token_usage", None)
+        token_usage = crew_token_usage(crew)
         if token_usage is None:
-            token_usage = getattr(result, "usage_metrics", None)
+            token_usage = getattr(result, "token_usage", None)
+        input_tokens = sum(count_tokens(str(value)) for value in inputs.values())
+        prompt_tokens = accounting(count_crew_tokens(crew), baseline_tokens - input_tokens)
         data_dict = getattr(result, "json_dict", None)
         if data_dict is None:
-            return ConvertPromptResponse(success=False, error="Crew did not return JSON data.")
+            record_validation_error()
+            return ConvertPromptResponse(
+                success=False, error="Crew did not return JSON data.", prompt_tokens=prompt_tokens
+            )
         try:
             payload = ProviderOptimizedPayload(**data_dict)
         except ValidationError as error:
-            return ConvertPromptResponse(success=False, error=f"Invalid provider payload: {error}")
-        return ConvertPromptResponse(success=True, data=payload, token_usage=token_usage)
+            record_validation_error()
+            return ConvertPromptResponse(
+                success=False, error=f"Invalid provider payload: {error}", prompt_tokens=prompt_tokens
+            )
+        return ConvertPromptResponse(success=True, data=payload, token_usage=token_usage, prompt_tokens=prompt_tokens)
 
-    def convert_prompt(self, request: ConvertPromptRequest) -> ConvertPromptResponse:
+    def convert_prompt(
+        self,
+        request: ConvertPromptRequest,
+        blueprint: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> ConvertPromptResponse:
+        """Convert ``request.data``; pass ``blueprint`` to reuse a snapshot shared across several targets."""
         try:
-            llm = self.provider_service.create_llm(request.provider, api_keys=request.provider_api_keys)
+            lease = self.provider_service.lease_llm(request.provider, api_keys=request.provider_api_keys)
         except ValueError as error:
             return ConvertPromptResponse(success=False, error=str(error))
 
+        with lease as llm:
+            try:
+                crew = self.templates.get(
+                    llm,
+                    "convert",
+                    lambda: self._conversion_crew(llm, request.target_model),
+                    target_model=request.target_model,
+                )
+            except ValueError as error:
+                return ConvertPromptResponse(success=False, error=str(error))
+
+            tracker = CrewProgressTracker(
+                observe_progress(progress),
+                llm,
+                ["convert_prompt", "review_conversion"],
+                ProviderOptimizedPayload if progress else None,
+            )
+            inputs = {"blueprint": blueprint or self.tasks.prompt_snapshot(request.data)}
+            return self._run_crew(crew, inputs, tracker, count_tokens(verbose_encoding(request.data)))
+
+    def warm_up(self, provider_id: Optional[str] = None, target_models: Iterable[str] = ()) -> None:
+        """Create the provider's pooled client and prebuild conversion and polish templates per target model."""
+        with self.provider_service.lease_llm(provider_id) as llm:
+            for target_model in target_models:
+                self.templates.get(
+                    llm, "convert", lambda: self._conversion_crew(llm, target_model), target_model=target_model
+                )
+                self.templates.get(
+                    llm, "polish", lambda: self._polish_crew(llm, target_model), target_model=target_model
+                )
+
+    def estimate_tokens(
+        self,
+        request: ConvertPromptRequest,
+        blueprint: Optional[str] = None,
+        draft: Optional[ProviderOptimizedPayload] = None,
+    ) -> int:
+        """Token cost used to admit a conversion (two calls) or, given a ``draft``, a one-call polish pass."""
+        if draft is not None:
+            return self.tasks.estimate_conversion_tokens(
+                request.target_model, self.tasks.polish_material(request.data, draft), 1
+            )
+        material = blueprint or self.tasks.prompt_snapshot(request.data)
+        return self.tasks.estimate_conversion_tokens(request.target_model, material, 2)
+
+    def _conversion_crew(self, llm, target_model: str) -> "Crew":
         agents_factory = PromptConversionAgents(llm)
+        specialist = agents_factory.specialist_for(target_model)
+        reviewer = agents_factory.conversion_reviewer_agent()
+
+        convert_task = self.tasks.convert_prompt(specialist, target_model, blueprint="{blueprint}")
+        review_task = self.tasks.review_conversion(reviewer, target_model, [convert_task])
+        return build_sequential_crew([specialist, reviewer], [convert_task, review_task])
+
+    def polish_conversion(
+        self,
+        request: ConvertPromptRequest,
+        draft: ProviderOptimizedPayload,
+        progress: Optional[ProgressCallback] = None,
+    ) -> ConvertPromptResponse:
+        """Run a single reviewer pass over a rule-based draft."""
         try:
-            specialist = agents_factory.specialist_for(request.target_model)
+            lease = self.provider_service.lease_llm(request.provider, api_keys=request.provider_api_keys)
         except ValueError as error:
             return ConvertPromptResponse(success=False, error=str(error))
-        reviewer = agents_factory.conversion_reviewer_agent()
 
-        convert_task = self.tasks.convert_prompt(specialist, request.target_model, request.data)
-        review_task = self.tasks.review_conversion(reviewer, request.target_model, [convert_task])
+        with lease as llm:
+            crew = self.templates.get(
+                llm,
+                "polish",
+                lambda: self._polish_crew(llm, request.target_model),
+                target_model=request.target_model,
+            )
+            tracker = CrewProgressTracker(observe_progress(progress), llm, ["polish_conversion"])
+            inputs = {"material": self.tasks.polish_material(request.data, draft)}
+            baseline_tokens = count_tokens(verbose_encoding(request.data)) + count_tokens(verbose_encoding(draft))
+            return self._run_crew(crew, inputs, tracker, baseline_tokens)
 
-        return self._run_crew(
-            agents=[specialist, reviewer],
-            tasks=[convert_task, review_task],
-        )
+    def rewrite_prompt(
+        self,
+        request: ConvertPromptRequest,
+        delta: ConversionDelta,
+        progress: Optional[ProgressCallback] = None,
+    ) -> ConvertPromptResponse:
+        """Rewrite only the positive prompt of ``delta.draft`` for its prompt-bearing edits, in one call."""
+        try:
+            lease = self.provider_service.lease_llm(request.provider, api_keys=request.provider_api_keys)
+        except ValueError as error:
+            return ConvertPromptResponse(success=False, error=str(error))
+
+        material = self.tasks.rewrite_material(delta.draft.prompt, delta.prompt_changes)
+        with lease as llm:
+            try:
+                specialist = self.templates.get(
+                    llm,
+                    "rewrite",
+                    lambda: PromptConversionAgents(llm).specialist_for(request.target_model),
+                    target_model=request.target_model,
+                )
+            except ValueError as error:
+                return ConvertPromptResponse(success=False, error=str(error))
+            messages = self.tasks.rewrite_prompt_messages(specialist, request.target_model, material)
+            tracker = CrewProgressTracker(observe_progress(progress), llm, ["rewrite_prompt"])
+            try:
+                tracker.start()
+                raw = structured_call(llm, messages, RewrittenPrompt)
+            except Exception as error:  # pragma: no cover - provider SDKs surface rich errors
+                record_provider_failure()
+                return ConvertPromptResponse(success=False, error=str(error))
+            tracker.on_task_complete(SimpleNamespace(raw=raw, json_dict=None, agent=specialist.role))
+            token_usage = llm.get_token_usage_summary()
+
+        input_tokens = count_message_tokens(messages)
+        prompt_tokens = accounting(input_tokens, self.full_conversion_tokens(request, delta.draft) - input_tokens)
+        rewritten = parse_structured_output(SimpleNamespace(raw=raw, json_dict=None), RewrittenPrompt)
+        if rewritten is None or not rewritten.prompt.strip():
+            record_validation_error()
+            return ConvertPromptResponse(
+                success=False,
+                error="Model did not return a rewritten prompt.",
+                token_usage=token_usage,
+                prompt_tokens=prompt_tokens,
+            )
+        prompt = rewritten.prompt.strip()
+        data = delta.draft.model_copy(update={"prompt": prompt, "payload": {**delta.draft.payload, "prompt": prompt}})
+        return ConvertPromptResponse(success=True, data=data, token_usage=token_usage, prompt_tokens=prompt_tokens)
+
+    def full_conversion_tokens(self, request: ConvertPromptRequest, draft: ProviderOptimizedPayload) -> int:
+        """Authored input a full conversion of ``request.data`` would send: the blueprint, then the draft to review."""
+        return count_tokens(self.tasks.prompt_snapshot(request.data)) + count_tokens(compact_encoding(draft))
+
+    def estimate_rewrite_tokens(self, request: ConvertPromptRequest, delta: ConversionDelta) -> int:
+        material = self.tasks.rewrite_material(delta.draft.prompt, delta.prompt_changes)
+        return self.tasks.estimate_rewrite_tokens(request.target_model, material)
+
+    def _polish_crew(self, llm, target_model: str) -> "Crew":
+        reviewer = PromptConversionAgents(llm).conversion_reviewer_agent()
+        polish_task = self.tasks.polish_conversion(reviewer, target_model, "{material}")
+        return build_sequential_crew([reviewer], [polish_task])
@@ -0,0 +1,133 @@
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Type
+
+from pydantic import BaseModel, ValidationError
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def _usage_snapshot(llm: Any) -> Dict[str, int]:
+    summary = getattr(llm, "get_token_usage_summary", None)
+    if summary is None:
+        return {}
+    try:
+        return summary().model_dump()
+    except Exception:  # pragma: no cover - usage tracking must never break a run
+        return {}
+
+
+def parse_structured_output(output: Any, model: Type[BaseModel]) -> Optional[BaseModel]:
+    """Validate a task output (or anything with ``json_dict``/``raw``) against ``model``, tolerating prose around the JSON."""
+    data = getattr(output, "json_dict", None)
+    if data is None:
+        raw = getattr(output, "raw", "") or ""
+        start, end = raw.find("{"), raw.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            data = json.loads(raw[start : end + 1])
+        except ValueError:
+            return None
+    try:
+        return model.model_validate(data)
+    except ValidationError:
+        return None
+
+
+def _rejected_output(error: Exception) -> Optional[str]:
+    """The model's text when the SDK refused to parse a structured output, or None for any other failure."""
+    if isinstance(error, ValidationError):
+        # Invalid JSON carries the raw text; a schema mismatch carries the parsed object at its shallowest error.
+        details = min(error.errors(include_url=False), key=lambda detail: len(detail["loc"]), default=None)
+        if details is None:
+            return ""
+        value = details.get("input")
+        return value if isinstance(value, str) else json.dumps(value, default=str)
+    completion = getattr(error, "completion", None)  # openai.LengthFinishReasonError: cut off at max_tokens
+    choices = getattr(completion, "choices", None)
+    if choices:
+        return getattr(choices[0].message, "content", None) or ""
+    return None
+
+
+def structured_call(llm: Any, messages: List[Dict[str, Any]], model: Type[BaseModel]) -> str:
+    """Make a provider-native structured-output call and return the model's text, parsed or not.
+
+    Output the SDK rejects (invalid JSON, a schema mismatch, a length cut-off) comes back as raw text for
+    the caller to validate with :func:`parse_structured_output` and repair; only transport and API errors
+    raise.
+    """
+    try:
+        result = llm.call(messages, response_model=model)
+    except Exception as error:
+        raw = _rejected_output(error)
+        if raw is None:
+            raise
+        return raw
+    return result.model_dump_json(by_alias=True) if isinstance(result, BaseModel) else str(result)
+
+
+class CrewProgressTracker:
+    """Turns sequential crew task callbacks into stage events for streaming clients.
+
+    Emits ``task_started`` / ``task_finished`` (with elapsed seconds and the token delta read from the
+    shared LLM) for every task, plus a ``partial`` event carrying the first task's structured output as
+    soon as it parses into ``partial_model``.
+    """
+
+    def __init__(
+        self,
+        emit: ProgressCallback,
+        llm: Any,
+        task_names: Sequence[str],
+        partial_model: Optional[Type[BaseModel]] = None,
+    ) -> None:
+        self.emit = emit
+        self.llm = llm
+        self.task_names: List[str] = list(task_names)
+        self.partial_model = partial_model
+        self._index = 0
+        self._started_at = 0.0
+        self._usage_before: Dict[str, int] = {}
+
+    def _start(self, index: int) -> None:
+        self._index = index
+        self._started_at = time.perf_counter()
+        self._usage_before = _usage_snapshot(self.llm)
+        self.emit("task_started", {"index": index, "task": self.task_names[index], "total": len(self.task_names)})
+
+    def start(self) -> None:
+        if self.task_names:
+            self._start(0)
+
+    def extend(self, task_name: str) -> None:
+        """Start a follow-up task that was not planned when the tracker was created."""
+        self.task_names.append(task_name)
+        self._start(len(self.task_names) - 1)
+
+    def on_task_complete(self, output: Any) -> None:
+        usage_after = _usage_snapshot(self.llm)
+        tokens = {
+            key: value - self._usage_before.get(key, 0)
+            for key, value in usage_after.items()
+            if isinstance(value, int)
+        }
+        self.emit(
+            "task_finished",
+            {
+                "index": self._index,
+                "task": self.task_names[self._index],
+                "agent": getattr(output, "agent", None),
+                "elapsed": round(time.perf_counter() - self._started_at, 3),
+                "tokens": tokens,
+            },
+        )
+
+        is_last = self._index + 1 >= len(self.task_names)
+        if self._index == 0 and not is_last and self.partial_model is not None:
+            partial = parse_structured_output(output, self.partial_model)
+            if partial is not None:
+                self.emit("partial", {"task": self.task_names[0], "data": partial.model_dump(mode="json")})
+        if not is_last:
+            self._start(self._index + 1)
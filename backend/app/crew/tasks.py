@@ -1,81 +1,182 @@
-import json
-from typing import Optional
-
-from crewai import Task
+from textwrap import dedent
+from typing import Any, Dict, Optional
 
 from ..models.schemas import GeneratedPromptData, ProviderOptimizedPayload
+from ..services import lazy_crewai
+from ..services.image_ingest import PreparedImage
+from ..services.prompt_encoding import compact_encoding, compact_json, prune_empty
+from ..services.token_accounting import IMAGE_INPUT_TOKENS, estimate_run_tokens
+
+
+def _persona_message(agent) -> dict:
+    return {
+        "role": "system",
+        "content": f"You are the {agent.role}. {agent.backstory}\nYour goal: {agent.goal}",
+    }
+
+
+def _template(text: str) -> str:
+    # Templates are indented for readability; the model is billed for every leading space.
+    return dedent(text).strip()
 
 
 class ImagePromptGenerationTasks:
+    _BLUEPRINT_SECTIONS = _template(
+        """
+        Fill every GeneratedPromptData section:
+        - intent: the creative goal in a short phrase
+        - prompt.primary: rich description; prompt.negative: things to avoid
+        - subjects: role, age, body_attributes, wardrobe, pose, mood
+        - environment; lighting
+        - composition: camera (angle, lens, framing, depth_of_field), shot, aspect_ratio
+        - style (keywords, medium, aesthetic_bias); color (palette, dominant_colors)
+        - controls (image_prompts, control_nets, loras) with URIs and weights, only when applicable
+        - params (width, height, steps, guidance, sampler, seed, images); post (upscale, face_restore)
+        - safety.allow_nsfw; provider_overrides (empty object if none); notes with hints for downstream agents
+        Keep values accurate, concise and production-ready.
+        """
+    )
+
+    _EDIT_CHECKLIST = _template(
+        """
+        - every section present and consistent; precise, non-redundant industry terminology
+        - keywords and dominant colours deduplicated; numeric params valid for diffusion workflows
+        - provider_overrides present even if empty; notes state assumptions and post-processing reminders
+        """
+    )
+
+    _DESCRIBE_INSTRUCTIONS = _template(
+        """
+        Fill the GeneratedPromptData schema from what is clearly visible:
+        - intent, prompt.primary, prompt.negative
+        - subjects: role, age, body attributes, wardrobe, pose, mood
+        - environment, lighting, composition (camera angle, lens, framing, depth of field, shot, aspect ratio)
+        - style, colour palette, dominant colours
+        - plausible controls, params and post-processing defaults for diffusion workflows
+        - safety.allow_nsfw (false if unsure)
+        Leave fields empty when the image gives no evidence and explain gaps in notes; do not invent details.
+        Respond with only the GeneratedPromptData JSON object.
+        """
+    )
+
+    _SEED_INSTRUCTIONS = _template(
+        """
+        The blueprint above was written for a similar prompt. Adapt it to the initial prompt: keep what
+        still fits, rewrite what differs and drop details the initial prompt contradicts.
+        Respond with only the GeneratedPromptData JSON object.
+        """
+    )
+
+    _SECTION_INSTRUCTIONS = _template(
+        """
+        Regenerate only the sections listed above; the rest of the blueprint stays as it is.
+        Keep them consistent with the context, make them more specific than the current values and
+        follow the user's instructions when given. Respond with only a JSON object keyed by section path.
+        """
+    )
+
+    def estimate_generation_tokens(self, initial_prompt: str, calls: int) -> int:
+        return estimate_run_tokens([initial_prompt, self._BLUEPRINT_SECTIONS, self._EDIT_CHECKLIST], calls)
+
+    def estimate_description_tokens(self) -> int:
+        return estimate_run_tokens([self._DESCRIBE_INSTRUCTIONS], 1, IMAGE_INPUT_TOKENS)
+
     def refine_prompt(self, agent, initial_prompt: str):
-        return Task(
-            description=f"""
-            Initial prompt: {initial_prompt}
-
-            Build a complete prompt blueprint using the GeneratedPromptData schema. Populate each section:
-            - version (default to the current schema version unless the user requests otherwise)
-            - intent that captures the creative goal in a short phrase
-            - prompt.primary as a rich natural-language description and prompt.negative for avoidances
-            - subjects array with role, age descriptor, body_attributes, wardrobe, pose, and mood
-            - environment string summarising the scene context
-            - composition.camera (angle, lens, framing, depth_of_field), composition.shot, and composition.aspect_ratio
-            - lighting conditions
-            - style details including keywords, medium, and aesthetic_bias entries
-            - color palette and dominant_colors list
-            - controls (image_prompts, control_nets, loras) with URIs, weights, and ranges when applicable
-            - params (width, height, steps, guidance, sampler, seed, images)
-            - post (upscale mode/strength and face_restore flag)
-            - safety.allow_nsfw and provider_overrides (use empty objects when you have no overrides)
-            - notes with any execution hints for downstream agents
-
-            Keep values accurate, concise, and production-ready.
-            """,
+        return lazy_crewai.Task(
+            description=f"Initial prompt: {initial_prompt}\n\n{self._BLUEPRINT_SECTIONS}",
             expected_output="A GeneratedPromptData JSON object fully populated for review",
             agent=agent
         )
 
     def edit_prompt(self, agent, context):
-        return Task(
-            description="""
-            Review the drafted GeneratedPromptData payload and ensure:
-            - All required schema sections are present and consistent
-            - Field values are precise, free of redundancies, and adhere to industry terminology
-            - Arrays contain meaningful entries (deduplicate keywords and dominant colours when needed)
-            - Numeric parameters are valid for common diffusion workflows
-            - provider_overrides keys exist even if their value is an empty object
-            - Notes call out any assumptions or post-processing reminders
-            """,
+        return lazy_crewai.Task(
+            description=f"Review the drafted GeneratedPromptData and ensure:\n{self._EDIT_CHECKLIST}",
             agent=agent,
             context=context,
             expected_output="An edited GeneratedPromptData JSON object that satisfies the schema",
             output_json=GeneratedPromptData
         )
 
-    def describe_image(self, agent, image_base64: str, filename: Optional[str] = None):
-        preview = image_base64[:1200] + "..." if len(image_base64) > 1200 else image_base64
+    def draft_prompt_messages(self, agent, initial_prompt: str):
+        """Chat messages for the fast path: one schema-constrained call that drafts the finished blueprint."""
+        return [
+            _persona_message(agent),
+            {
+                "role": "user",
+                "content": (
+                    f"Initial prompt: {initial_prompt}\n\n{self._BLUEPRINT_SECTIONS}\n"
+                    "Respond with only the GeneratedPromptData JSON object."
+                ),
+            },
+        ]
+
+    def seeded_draft_messages(self, agent, initial_prompt: str, seed: GeneratedPromptData):
+        """Fast-path messages that adapt the blueprint of a similar earlier prompt instead of drafting from scratch."""
+        return [
+            _persona_message(agent),
+            {
+                "role": "user",
+                "content": (
+                    f"Initial prompt: {initial_prompt}\n\n"
+                    f"Blueprint for a similar prompt: {compact_encoding(seed)}\n\n{self._SEED_INSTRUCTIONS}"
+                ),
+            },
+        ]
+
+    def estimate_seeded_tokens(self, initial_prompt: str, seed: GeneratedPromptData, calls: int) -> int:
+        return estimate_run_tokens([initial_prompt, compact_encoding(seed), self._SEED_INSTRUCTIONS], calls)
+
+    def edit_prompt_messages(self, agent, draft: str):
+        """Chat messages for a single editor pass over a drafted (possibly invalid) blueprint."""
+        return [
+            _persona_message(agent),
+            {
+                "role": "user",
+                "content": (
+                    f"Drafted GeneratedPromptData:\n{draft}\n\n"
+                    f"Repair anything that does not fit the schema and ensure:\n{self._EDIT_CHECKLIST}\n"
+                    "Respond with only the edited GeneratedPromptData JSON object."
+                ),
+            },
+        ]
+
+    def section_material(
+        self, context: Dict[str, Any], current: Dict[str, Any], instructions: Optional[str] = None
+    ) -> str:
+        """The user message body for a section regeneration: surrounding context, current values, instructions."""
+        parts = [f"Blueprint context: {compact_json(prune_empty(context))}"]
+        parts.append(f"Sections to regenerate (current values): {compact_json(prune_empty(current))}")
+        if instructions:
+            parts.append(f"User instructions: {instructions}")
+        return "\n".join(parts)
+
+    def regenerate_sections_messages(self, agent, material: str):
+        """Chat messages for one schema-constrained call that rewrites only the requested blueprint sections."""
+        return [
+            _persona_message(agent),
+            {"role": "user", "content": f"{material}\n\n{self._SECTION_INSTRUCTIONS}"},
+        ]
+
+    def estimate_section_tokens(self, material: str) -> int:
+        return estimate_run_tokens([material, self._SECTION_INSTRUCTIONS], 1)
+
+    def describe_image_messages(self, agent, image: PreparedImage, filename: Optional[str] = None):
+        """Chat messages for a single vision call: the analyst persona plus the image as a real image part."""
         name = filename or "uploaded reference"
-        return Task(
-            description=f"""
-            You are provided with an uploaded reference image in base64 format.
-
-            Filename: {name}
-            Image data (base64): {preview}
-
-            Analyse the visual content and fill the GeneratedPromptData JSON schema so it reflects the scene:
-            - Derive intent, prompt.primary, and prompt.negative from what is clearly visible
-            - Describe subjects with role, age descriptor, body attributes, wardrobe, pose, and mood
-            - Characterise the environment, lighting, composition (camera angle, lens, framing, depth of field, shot type, aspect ratio)
-            - Capture style, colour palette, and dominant colours
-            - Estimate relevant controls, params, and post-processing defaults; prefer realistic diffusion-friendly values
-            - Set safety.allow_nsfw based on whether any explicit content is present (default to false if unsure)
-            - Use empty lists or objects when the image provides no evidence for a field, and explain gaps in notes
-
-            Avoid fabricating details not supported by the reference image.
-            """,
-            expected_output="A GeneratedPromptData JSON object that mirrors the analysed image",
-            agent=agent,
-            output_json=GeneratedPromptData
+        instructions = (
+            f"Reference image: {name}, analysed at {image.width}x{image.height} "
+            f"(original {image.original_width}x{image.original_height}).\n\n{self._DESCRIBE_INSTRUCTIONS}"
         )
+        return [
+            _persona_message(agent),
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": instructions},
+                    {"type": "image_url", "image_url": {"url": image.data_url}},
+                ],
+            },
+        ]
 
 
 class PromptConversionTasks:
@@ -83,70 +184,117 @@ class PromptConversionTasks:
 
     _MODEL_GUIDANCE = {
         "flux.1": (
-            "Prioritise cinematic realism with balanced high-frequency detail. Populate payload with fields such as \
-            prompt, negative_prompt, width, height, steps, guidance_scale, sampler (Euler Ancestral works well) and \
-            num_images. Include scheduler ('ddim' or 'flow') and optional aesthetic controls."
+            "Favour cinematic realism with balanced high-frequency detail. Payload fields: prompt, negative_prompt, "
+            "width, height, steps, guidance_scale, sampler (Euler Ancestral works well), num_images, scheduler "
+            "('ddim' or 'flow') and optional aesthetic controls."
         ),
         "wan-2.2": (
-            "Prioritize photorealism with true-to-life skin, fabric, and material textures. Populate payload with fields such as prompt, negative_prompt, width, height, steps, guidance_scale (CFG), sampler (DPM++ 2M Karras recommended), and num_images. Include scheduler ('karras' or 'ddim') and optional controls (ControlNet/IP-Adapter, LoRA with weights). For RTX 4090 defaults, target 1024–1536 on the long edge, 30–36 steps, guidance 6.0–7.0, and add strong negatives for waxy skin, banding, extra digits, and warped limbs."
+            "Favour photorealism with true-to-life skin, fabric and material textures. Payload fields: prompt, "
+            "negative_prompt, width, height, steps, guidance_scale (CFG), sampler (DPM++ 2M Karras), num_images, "
+            "scheduler ('karras' or 'ddim') and optional ControlNet/IP-Adapter or LoRA controls with weights. "
+            "RTX 4090 defaults: 1024–1536 long edge, 30–36 steps, guidance 6.0–7.0, strong negatives for waxy skin, "
+            "banding, extra digits and warped limbs."
         ),
         "sdxl": (
-            "Optimise for SDXL base + refiner. Supply payload keys prompt, negative_prompt, width, height, \
-            cfg_scale, steps, sampler, scheduler, hi_res_fix (if needed), denoising_strength, and refiner settings."
+            "Optimise for SDXL base + refiner. Payload keys: prompt, negative_prompt, width, height, cfg_scale, "
+            "steps, sampler, scheduler, hi_res_fix (if needed), denoising_strength and refiner settings."
         ),
     }
 
-    def _prompt_snapshot(self, data: GeneratedPromptData) -> str:
-        return json.dumps(data.dict(), indent=2)
+    _PROMPT_BUDGET = (
+        "Condense the positive prompt to about 100 words covering the core subject, signature style cues, "
+        "environment, lighting and critical technical directives; drop filler and repetition."
+    )
+
+    def prompt_snapshot(self, data: GeneratedPromptData) -> str:
+        """Compact blueprint JSON (defaults and empty fields omitted) for embedding in task prompts."""
+        return compact_encoding(data)
 
     def _guidance(self, target_model: str) -> str:
         key = target_model.lower()
         return self._MODEL_GUIDANCE.get(key, "")
 
-    def convert_prompt(self, agent, target_model: str, data: GeneratedPromptData):
-        blueprint = self._prompt_snapshot(data)
-        guidance = self._guidance(target_model)
-        return Task(
-            description=f"""
-            You are preparing a provider-optimised payload for {target_model}.
-
-            Structured prompt blueprint (GeneratedPromptData):
-            ```json
-            {blueprint}
-            ```
+    def estimate_conversion_tokens(self, target_model: str, material: str, calls: int) -> int:
+        return estimate_run_tokens([material, self._guidance(target_model), self._PROMPT_BUDGET], calls)
 
-            {guidance}
-
-            Follow the ProviderOptimizedPayload schema. Map values thoughtfully, reflect any relevant controls, and
-            populate recommended_settings with numeric parameters suited to {target_model}. If controls or overrides are
-            irrelevant, leave the corresponding objects empty.
-
-            When composing the positive prompt, condense it to roughly 100 words that spotlight the core subject, signature
-            style cues, environment, lighting, and the most critical technical directives for {target_model}. Remove filler
-            adjectives, avoid repetition, and keep the phrasing deployment ready while leaving the negative prompt untouched.
-            """,
+    def convert_prompt(
+        self,
+        agent,
+        target_model: str,
+        data: Optional[GeneratedPromptData] = None,
+        blueprint: Optional[str] = None,
+    ):
+        blueprint = blueprint or self.prompt_snapshot(data)
+        guidance = self._guidance(target_model)
+        return lazy_crewai.Task(
+            description=(
+                f"Prepare a provider-optimised payload for {target_model} from this GeneratedPromptData blueprint "
+                f"(omitted fields are empty or default):\n{blueprint}\n\n"
+                f"{guidance}\n\n"
+                f"Follow the ProviderOptimizedPayload schema, reflect relevant controls and fill recommended_settings "
+                f"with numeric parameters suited to {target_model}; leave irrelevant controls or overrides empty. "
+                f"{self._PROMPT_BUDGET} Leave the negative prompt untouched."
+            ),
             agent=agent,
             expected_output="ProviderOptimizedPayload JSON with provider-ready payload details",
             output_json=ProviderOptimizedPayload
         )
 
-    def review_conversion(self, agent, target_model: str, context):
+    def polish_material(self, data: GeneratedPromptData, draft: ProviderOptimizedPayload) -> str:
+        """The blueprint and draft a polish pass reviews, as one kickoff input."""
+        return (
+            f"Blueprint (GeneratedPromptData):\n{self.prompt_snapshot(data)}\n\n"
+            f"Draft ProviderOptimizedPayload:\n{compact_encoding(draft)}"
+        )
+
+    def polish_conversion(self, agent, target_model: str, material: str):
         guidance = self._guidance(target_model)
-        return Task(
-            description=f"""
-            Review the draft ProviderOptimizedPayload for {target_model}.
+        return lazy_crewai.Task(
+            description=(
+                f"A rule-based converter mapped the blueprint below onto a draft ProviderOptimizedPayload for "
+                f"{target_model}. Its numeric parameters, sampler/scheduler and control_assets are clamped to valid "
+                f"ranges; keep them unless they contradict the blueprint.\n\n{material}\n\n{guidance}\n\n"
+                f"Polish the draft: rewrite the positive prompt as fluent, deployment-ready phrasing. "
+                f"{self._PROMPT_BUDGET} Leave the negative prompt untouched, keep payload and recommended_settings "
+                f"aligned and record caveats in notes."
+            ),
+            agent=agent,
+            expected_output="Polished ProviderOptimizedPayload JSON",
+            output_json=ProviderOptimizedPayload
+        )
 
-            Ensure the payload:
-            - Preserves the creative intent and safety controls from the structured prompt
-            - Keeps the positive prompt around 100 words by trimming redundancies while retaining subject, style, environment, and key technical cues
-            - Uses valid field names and realistic numeric ranges for {target_model}
-            - Documents caveats or follow-up actions in the notes array
-            - Keeps payload and recommended_settings aligned (no conflicting values)
+    def rewrite_material(self, prompt: str, changes: Dict[str, Any]) -> str:
+        """The current positive prompt and the prompt-bearing blueprint edits it has to absorb."""
+        return f"Current positive prompt:\n{prompt}\n\nBlueprint edits (path: before/after):\n{compact_json(changes)}"
 
-            {guidance}
+    def rewrite_prompt_messages(self, agent, target_model: str, material: str):
+        """Chat messages for one call that rewrites only the positive prompt of an existing conversion."""
+        instructions = (
+            f"The positive prompt above was written for {target_model} from an earlier version of the blueprint. "
+            f"Rewrite it so it reflects the edits: replace or drop what changed and keep the rest of the wording. "
+            f"{self._PROMPT_BUDGET} Respond with only a JSON object with a single \"prompt\" field."
+        )
+        return [
+            _persona_message(agent),
+            {"role": "user", "content": f"{material}\n\n{instructions}\n\n{self._guidance(target_model)}"},
+        ]
 
-            Deliver the final, deployment-ready ProviderOptimizedPayload JSON.
-            """,
+    def estimate_rewrite_tokens(self, target_model: str, material: str) -> int:
+        return self.estimate_conversion_tokens(target_model, material, 1)
+
+    def review_conversion(self, agent, target_model: str, context):
+        guidance = self._guidance(target_model)
+        checklist = _template(
+            f"""
+            Review the draft ProviderOptimizedPayload for {target_model}. Ensure it:
+            - preserves the creative intent and safety controls of the blueprint
+            - keeps the positive prompt near 100 words without losing subject, style, environment or key technical cues
+            - uses valid field names and realistic numeric ranges for {target_model}
+            - keeps payload and recommended_settings aligned, with caveats in notes
+            """
+        )
+        return lazy_crewai.Task(
+            description=f"{checklist}\n\n{guidance}",
             agent=agent,
             context=context,
             expected_output="Validated ProviderOptimizedPayload JSON",
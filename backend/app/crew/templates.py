@@ -0,0 +1,96 @@
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .progress import CrewProgressTracker
+from ..services import lazy_crewai
+from ..services.settings import env_bool
+
+if TYPE_CHECKING:
+    from crewai import Crew
+
+TemplateKey = Tuple[int, str, Optional[str]]
+
+
+class CrewTemplateRegistry:
+    """Caches prebuilt agents, tasks and crews per (LLM client, pipeline, target model).
+
+    Templates carry ``{placeholders}`` in their task descriptions and are bound to each request through
+    ``Crew.kickoff(inputs=...)``, so the pydantic-validated Agent/Task/Crew objects are only built once per
+    client. A template is only ever used by whoever currently leases its LLM from the client pool, which
+    keeps reuse race-free. Templates hold their client strongly, so the pool must report the clients it
+    lets go (:meth:`forget`); their templates are dropped then.
+    """
+
+    def __init__(self) -> None:
+        self._templates: Dict[TemplateKey, Any] = {}
+        self._lock = threading.Lock()
+        self.built = 0
+        self.reused = 0
+
+    def forget(self, llm: Any) -> None:
+        """Drop every template built around ``llm``."""
+        with self._lock:
+            for key in [key for key in self._templates if key[0] == id(llm)]:
+                del self._templates[key]
+
+    def get(self, llm: Any, pipeline: str, build: Callable[[], Any], target_model: Optional[str] = None) -> Any:
+        key = (id(llm), pipeline, target_model)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self.reused += 1
+                return template
+
+        template = build()
+        with self._lock:
+            self._templates[key] = template
+            self.built += 1
+        return template
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "templates": len(self._templates),
+                "clients": len({key[0] for key in self._templates}),
+                "built": self.built,
+                "reused": self.reused,
+            }
+
+
+def build_sequential_crew(agents: Iterable, tasks: Iterable) -> "Crew":
+    return lazy_crewai.Crew(
+        agents=list(agents),
+        tasks=list(tasks),
+        process=lazy_crewai.sequential_process(),
+        verbose=env_bool("CREW_VERBOSE", False),
+    )
+
+
+def kickoff_template(crew: "Crew", inputs: Dict[str, Any], tracker: Optional[CrewProgressTracker] = None) -> Any:
+    """Run a prebuilt crew with per-request ``inputs``, rebinding the progress callback for this run."""
+    callback = tracker.on_task_complete if tracker else None
+    # Crew only assigns task_callback to tasks without one, so clear the previous run's binding explicitly.
+    crew.task_callback = callback
+    for task in crew.tasks:
+        task.callback = callback
+    if tracker:
+        tracker.start()
+    return crew.kickoff(inputs=inputs)
+
+
+def crew_token_usage(crew: "Crew") -> Optional[Any]:
+    """Token usage of the crew's last run, counting each LLM once.
+
+    CrewAI's own total adds ``agent.llm``'s usage once per agent, so a crew whose agents share the leased
+    LLM would report (and be charged against rate limits for) a multiple of what it spent. Pooled LLMs start
+    every lease with zeroed usage, so the summary covers this run only.
+    """
+    llms = {id(agent.llm): agent.llm for agent in crew.agents if hasattr(agent.llm, "get_token_usage_summary")}
+    total = None
+    for llm in llms.values():
+        usage = llm.get_token_usage_summary()
+        if total is None:
+            total = usage
+        else:
+            total.add_usage_metrics(usage)
+    return total
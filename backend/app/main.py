@@ -1,22 +1,114 @@
+import asyncio
+import json
+import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+)
 
-from fastapi import FastAPI
+from fastapi import FastAPI, File, Form, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
 
 from .crew.crew_manager import ImagePromptGenerationCrew, PromptConversionCrew
+from .crew.progress import ProgressCallback
 from .models.schemas import (
+    BatchGeneratePromptItemResult,
+    BatchGeneratePromptRequest,
+    CacheMode,
+    ConvertPromptMultiRequest,
+    ConvertPromptMultiResponse,
     ConvertPromptRequest,
     ConvertPromptResponse,
+    GeneratedPromptData,
     GeneratePromptFromImageRequest,
     GeneratePromptRequest,
     GeneratePromptResponse,
+    HistoryKind,
+    JobKind,
+    JobStatus,
+    ProviderOptimizedPayload,
+    RegenerateSectionsRequest,
+    RegenerateSectionsResponse,
+    SemanticCacheMatch,
+    TargetModel,
+)
+from .services import lazy_crewai
+from .services.batch import iter_concurrently, run_with_capacity_retries
+from .services.blueprint_sections import SectionPathError, normalise_sections
+from .services.crew_executor import CrewCapacityError, CrewExecutor, priority_scope
+from .services.image_hash_cache import PerceptualHashCache
+from .services.image_ingest import ImageIngestError, PreparedImage, decode_base64_image, prepare_image, read_upload
+from .services.incremental_conversion import ConversionDelta, IncrementalConverter
+from .services.job_queue import TERMINAL_STATES, JobQueue
+from .services.job_worker import JobHandlers
+from .services.metrics import (
+    RequestObservation,
+    current_observation,
+    endpoint_scope,
+    install_llm_listeners,
+    observe_request,
+    render_latest,
+    timed_stage,
 )
 from .services.provider_config import ProviderConfigurationService
+from .services.rate_limits import AdmissionCost
+from .services.request_keys import conversion_key, generation_key, generation_namespace
+from .services.resilience import ProviderResilience
+from .services.response_cache import ResponseCache, canonical_hash
+from .services.result_store import ResultStore
+from .services.rule_based_conversion import RuleBasedPromptConverter
+from .services.semantic_cache import SemanticMatch, SemanticPromptCache
+from .services.single_flight import SingleFlight
+from .services.settings import env_float, env_int
+from .services.streaming import sse_event, stream_with_progress
+from .services.token_accounting import PromptTokenLedger, accounting, estimator_name
+from .services.tracing import tracer
+from .services.warmup import StartupWarmup, WarmupStep
+
+logger = logging.getLogger(__name__)
+
+def start_pipeline_services() -> None:
+    """Process-level setup for running pipelines, shared by the API and the job worker processes."""
+    # CrewAI is imported on first use; its event-bus listeners are attached whenever that happens.
+    lazy_crewai.on_load(install_llm_listeners)
+
+
+def stop_pipeline_services() -> None:
+    crew_executor.shutdown()
+    result_store.close()
+    job_queue.close()
+    tracer.shutdown()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    start_pipeline_services()
+    await startup_warmup.start(_warmup_steps())
+    yield
+    stop_pipeline_services()
+
 
 app = FastAPI(
     title="Text-to-Image Prompt Generator API",
     description="AI-powered prompt generation for text-to-image models",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -33,6 +125,69 @@ app.add_middleware(
 provider_configuration = ProviderConfigurationService()
 image_prompt_crew = ImagePromptGenerationCrew(provider_service=provider_configuration)
 prompt_conversion_crew = PromptConversionCrew(provider_service=provider_configuration)
+# Crew kickoffs are blocking; run them off the event loop with per-provider backpressure
+crew_executor = CrewExecutor(provider_configuration)
+# Circuit breakers, fallbacks and hedging per provider; see ProviderResilience for the knobs
+provider_resilience = ProviderResilience(provider_configuration)
+rule_based_converter = RuleBasedPromptConverter()
+incremental_converter = IncrementalConverter(rule_based_converter)
+generation_cache: ResponseCache[GeneratePromptResponse] = ResponseCache.from_env("GENERATION_CACHE")
+conversion_cache: ResponseCache[ProviderOptimizedPayload] = ResponseCache.from_env(
+    "CONVERSION_CACHE", max_entries=1024
+)
+image_description_cache: PerceptualHashCache[GeneratePromptResponse] = PerceptualHashCache.from_env()
+# Paraphrased prompts: near-identical ones are answered from here, close ones seed a one-call generation
+semantic_prompt_cache: SemanticPromptCache[GeneratedPromptData] = SemanticPromptCache.from_env()
+# Identical requests that arrive while one is running share its crew execution
+generation_flights: SingleFlight[GeneratePromptResponse] = SingleFlight("generate")
+conversion_flights: SingleFlight[ConvertPromptResponse] = SingleFlight("convert")
+prompt_token_ledger = PromptTokenLedger()
+result_store = ResultStore.from_env()
+# Generate, describe and convert jobs submitted here are run by separate worker processes (app.worker)
+job_queue = JobQueue.from_env()
+startup_warmup = StartupWarmup.from_env()
+
+
+def _warmup_steps() -> List[WarmupStep]:
+    steps: List[WarmupStep] = [
+        ("crewai", lazy_crewai.preload),
+        ("tokenizer", estimator_name),
+        ("result_store", result_store.warm_up),
+    ]
+    for provider in startup_warmup.providers or [provider_configuration.default_provider]:
+        steps.append((f"generate:{provider}", lambda provider=provider: image_prompt_crew.warm_up(provider)))
+        steps.append(
+            (
+                f"convert:{provider}",
+                lambda provider=provider: prompt_conversion_crew.warm_up(provider, get_args(TargetModel)),
+            )
+        )
+    return steps
+
+
+@app.middleware("http")
+async def label_metrics_endpoint(request: Request, call_next):
+    request_bytes = int(request.headers.get("content-length") or 0)
+    with endpoint_scope(request.url.path), tracer.span(
+        request.url.path, kind="endpoint", method=request.method, request_bytes=request_bytes
+    ) as span:
+        response = await call_next(request)
+        span.set(status_code=response.status_code)
+        return response
+
+
+@app.exception_handler(CrewCapacityError)
+async def crew_capacity_handler(_: Request, error: CrewCapacityError) -> JSONResponse:
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"success": False, "error": str(error)},
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+@app.exception_handler(ImageIngestError)
+async def image_ingest_handler(_: Request, error: ImageIngestError) -> JSONResponse:
+    return JSONResponse(status_code=error.status_code, content={"success": False, "error": str(error)})
 
 
 @app.get("/")
@@ -42,22 +197,788 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now(),
+        "warmup": startup_warmup.stats(),
+        "tracing": tracer.stats(),
+    }
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    return {
+        "generation": generation_cache.stats(),
+        "conversion": conversion_cache.stats(),
+        "image_description": image_description_cache.stats(),
+        "semantic_prompt": semantic_prompt_cache.stats(),
+        "result_store": result_store.stats(),
+        "single_flight": {"generation": generation_flights.stats(), "conversion": conversion_flights.stats()},
+        "llm_clients": provider_configuration.llm_pool_stats(),
+        "crew_templates": {
+            "generation": image_prompt_crew.templates.stats(),
+            "conversion": prompt_conversion_crew.templates.stats(),
+        },
+    }
+
+
+@app.get("/api/providers/health")
+async def provider_health():
+    return {
+        "lanes": crew_executor.stats(),
+        "rate_limits": crew_executor.rate_limit_stats(),
+        "resilience": provider_resilience.stats(),
+    }
+
+
+@app.get("/metrics")
+async def prometheus_metrics() -> Response:
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+def _observe(provider: Optional[str], target_model: str = ""):
+    """Start a metrics observation; unknown providers share one label value to keep cardinality bounded."""
+    try:
+        provider_id, model = provider_configuration.model_identity(provider)
+    except ValueError:
+        provider_id, model = "unknown", "unknown"
+    return observe_request(provider_id, model, target_model)
+
+
+_SECRETS = {"provider_api_keys"}
+# Earlier blueprint/result pairs sent for incremental conversion; history keeps the request without them.
+_PREVIOUS_CONVERSION = {"previous_data", "previous_result"}
+StoredModel = TypeVar("StoredModel", bound=BaseModel)
+
+
+async def _stored_result(input_hash: Optional[str], schema: Type[StoredModel]) -> Optional[StoredModel]:
+    """Second-tier cache lookup in the durable result store; rows that no longer validate count as misses."""
+    if not input_hash or not result_store.enabled:
+        return None
+    with timed_stage("result_store"):
+        stored = await asyncio.to_thread(result_store.lookup, input_hash)
+    if stored is None:
+        return None
+    try:
+        return schema.model_validate(stored)
+    except ValidationError:
+        return None
+
+
+def _persist(
+    kind: str,
+    input_hash: Optional[str],
+    provider: Optional[str],
+    request_summary: Dict[str, Any],
+    response: Union[GeneratePromptResponse, ConvertPromptResponse],
+    target_model: Optional[str] = None,
+) -> None:
+    try:
+        provider_id, model = provider_configuration.model_identity(provider)
+    except ValueError:
+        return
+    observation = current_observation()
+    result_store.record(
+        kind=kind,
+        input_hash=input_hash,
+        provider=provider_id,
+        model=model,
+        target_model=target_model,
+        request=request_summary,
+        response=response,
+        timings=observation.timings() if observation else None,
+        processing_time=round(observation.elapsed(), 4) if observation else None,
+    )
+
+
+@app.get("/api/history")
+async def history(
+    limit: int = Query(50, ge=1, le=1000),
+    before: Optional[int] = Query(None, description="Return records older than this id (the last id of the previous page)."),
+    kind: Optional[HistoryKind] = None,
+    input_hash: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> StreamingResponse:
+    """Stored results as NDJSON, newest first, fetched from the store in small keyset pages while streaming."""
+    page_size = min(limit, 100)
+
+    async def _lines() -> AsyncIterator[str]:
+        cursor, remaining = before, limit
+        while remaining > 0:
+            rows = await asyncio.to_thread(
+                result_store.page,
+                limit=min(page_size, remaining),
+                before_id=cursor,
+                kind=kind,
+                input_hash=input_hash,
+                since=since,
+                until=until,
+            )
+            for row in rows:
+                yield json.dumps(row) + "\n"
+            if len(rows) < min(page_size, remaining):
+                return
+            cursor, remaining = rows[-1]["id"], remaining - len(rows)
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@app.get("/api/metrics/prompt-tokens")
+async def prompt_token_metrics():
+    return prompt_token_ledger.stats()
+
+
+def _semantic_match(mode: str, match: SemanticMatch[GeneratedPromptData]) -> SemanticCacheMatch:
+    return SemanticCacheMatch(mode=mode, prompt=match.text, similarity=round(match.similarity, 4))
+
+
+PipelineResponse = TypeVar("PipelineResponse", GeneratePromptResponse, ConvertPromptResponse)
+
+
+async def _coalesced(
+    flights: SingleFlight[PipelineResponse],
+    key: Optional[str],
+    cache_mode: str,
+    call: Callable[[], Awaitable[PipelineResponse]],
+) -> PipelineResponse:
+    # Bypass means "do the work", so those requests never share a run. Otherwise only requests with the same
+    # cache mode do: a refresh must not be answered by a default run that may serve the cache, nor a default
+    # request wait on a forced fresh run.
+    if key is not None and cache_mode != "bypass":
+        key = f"{key}:{cache_mode}"
+    else:
+        key = None
+    response, shared = await flights.run(key, call)
+    if shared:
+        # The request that started the run reports its token usage; the ones that joined it spent none.
+        response = response.model_copy(update={"token_usage": None, "prompt_tokens": None})
+    return response
+
+
+async def _generate(
+    request: GeneratePromptRequest, progress: Optional[ProgressCallback] = None
+) -> GeneratePromptResponse:
+    with _observe(request.provider) as observation:
+        # Streamed requests keep their own run so their progress events reach them.
+        key = generation_key(request, provider_configuration) if progress is None else None
+        response = await _coalesced(generation_flights, key, request.cache, lambda: _run_generate(request, progress))
+        return observation.finish(response)
+
+
+async def _run_generate(
+    request: GeneratePromptRequest, progress: Optional[ProgressCallback] = None
+) -> GeneratePromptResponse:
+    input_hash = generation_key(request, provider_configuration)
+    cache_key = input_hash if request.cache != "bypass" else None
+    if cache_key and request.cache == "default":
+        cached = generation_cache.get(cache_key)
+        if cached is None:
+            stored = await _stored_result(cache_key, GeneratedPromptData)
+            if stored is not None:
+                cached = GeneratePromptResponse(success=True, data=stored)
+                generation_cache.set(cache_key, cached)
+        if cached is not None:
+            # Cached answers cost no tokens; don't report the original run's usage again.
+            return cached.model_copy(update={"cached": True, "token_usage": None, "prompt_tokens": None})
+
+    namespace = generation_namespace(request, provider_configuration) if request.cache != "bypass" else None
+    seed: Optional[SemanticMatch[GeneratedPromptData]] = None
+    if namespace and request.cache == "default" and semantic_prompt_cache.enabled:
+        with timed_stage("semantic_cache"):
+            outcome, match = semantic_prompt_cache.lookup(namespace, request.prompt)
+        if outcome == "hit":
+            return GeneratePromptResponse(
+                success=True, data=match.value, cached=True, semantic_match=_semantic_match("hit", match)
+            )
+        seed = match
+    seed_data = seed.value if seed else None
+
+    pipeline = "generate:seeded" if seed else f"generate:{request.quality}"
+    response = await provider_resilience.run(
+        pipeline,
+        request.provider,
+        lambda provider: crew_executor.run(
+            provider,
+            image_prompt_crew.generate_structured_prompt,
+            request.model_copy(update={"provider": provider}),
+            progress,
+            seed_data,
+            cost=AdmissionCost(image_prompt_crew.estimate_tokens(request, seed_data), request.provider_api_keys),
+        ),
+        hedge=progress is None,
+    )
+    prompt_token_ledger.record(pipeline, response.prompt_tokens)
+    if seed and response.success:
+        response = response.model_copy(update={"semantic_match": _semantic_match("seed", seed)})
+    if cache_key and response.success and response.data is not None:
+        generation_cache.set(cache_key, response)
+    if namespace and response.success and response.data is not None:
+        semantic_prompt_cache.add(namespace, request.prompt, response.data)
+    _persist("generate", input_hash, request.provider, request.model_dump(mode="json", exclude=_SECRETS), response)
+    return response
+
+
+def _log_generation(message: str, request: GeneratePromptRequest) -> None:
+    # Summaries only: the request carries provider API keys and can carry a long prompt.
+    logger.info(
+        "%s (%d chars, provider %s, quality %s)", message, len(request.prompt), request.provider, request.quality
+    )
+    tracer.annotate(prompt_chars=len(request.prompt), quality=request.quality, review=request.review)
 
 
 @app.post("/api/generate-prompt", response_model=GeneratePromptResponse)
 async def generate_prompt(request: GeneratePromptRequest) -> GeneratePromptResponse:
-    print(f"Beginning prompt generation for: {request}")
-    return image_prompt_crew.generate_structured_prompt(request)
+    _log_generation("Beginning prompt generation", request)
+    return await _generate(request)
+
+
+@app.post("/api/generate-prompt/stream")
+async def generate_prompt_stream(request: GeneratePromptRequest) -> StreamingResponse:
+    _log_generation("Beginning streamed prompt generation", request)
+    return StreamingResponse(
+        stream_with_progress(lambda progress: _generate(request, progress)), media_type="text/event-stream"
+    )
+
+
+async def _generate_batch_item(index: int, item: Union[GeneratePromptRequest, str]) -> BatchGeneratePromptItemResult:
+    if isinstance(item, str):
+        return BatchGeneratePromptItemResult(index=index, success=False, error=item)
+
+    started = time.perf_counter()
+    try:
+        with priority_scope("batch"):
+            response = await run_with_capacity_retries(lambda: _generate(item))
+    except CrewCapacityError as error:
+        response = GeneratePromptResponse(success=False, error=str(error))
+    fields = dict(response)
+    fields["processing_time"] = response.processing_time or round(time.perf_counter() - started, 3)
+    return BatchGeneratePromptItemResult(index=index, **fields)
+
+
+def _batch_response(
+    items: Sequence[Union[GeneratePromptRequest, str]], concurrency: Optional[int]
+) -> Union[StreamingResponse, JSONResponse]:
+    max_items = env_int("BATCH_MAX_ITEMS", 1000)
+    if len(items) > max_items:
+        return JSONResponse(
+            status_code=413,
+            content={"success": False, "error": f"Batch has {len(items)} items; the limit is {max_items}."},
+        )
+    limit = min(concurrency or env_int("BATCH_CONCURRENCY", 4), env_int("BATCH_MAX_CONCURRENCY", 16))
+    logger.info("Beginning batch prompt generation for %d items (concurrency %d)", len(items), limit)
+    tracer.annotate(items=len(items), concurrency=limit)
+
+    async def _lines() -> AsyncIterator[str]:
+        async for result in iter_concurrently(items, _generate_batch_item, limit):
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@app.post("/api/generate-prompt/batch")
+async def generate_prompt_batch(request: BatchGeneratePromptRequest):
+    return _batch_response(request.items, request.concurrency)
+
+
+@app.post("/api/generate-prompt/batch/upload")
+async def generate_prompt_batch_upload(
+    file: UploadFile = File(...),
+    provider: Optional[str] = Form(None),
+    concurrency: Optional[int] = Form(None),
+):
+    """Accept a JSONL file of GeneratePromptRequest objects; malformed lines become per-item errors."""
+    items: List[Union[GeneratePromptRequest, str]] = []
+    content = (await file.read()).decode("utf-8", errors="replace")
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            raw_item = json.loads(line)
+            if provider and isinstance(raw_item, dict) and "provider" not in raw_item:
+                raw_item["provider"] = provider
+            items.append(GeneratePromptRequest.model_validate(raw_item))
+        except (ValueError, ValidationError) as error:
+            items.append(f"Line {line_number}: {error}")
+    if not items:
+        return JSONResponse(status_code=400, content={"success": False, "error": "Uploaded batch file is empty."})
+    return _batch_response(items, concurrency)
+
+
+@app.post("/api/regenerate-sections", response_model=RegenerateSectionsResponse)
+async def regenerate_sections(request: RegenerateSectionsRequest):
+    """Redo only the given blueprint sections in one focused LLM call; the rest of ``data`` is returned unchanged."""
+    try:
+        sections = normalise_sections(request.data, request.sections)
+    except SectionPathError as error:
+        return JSONResponse(status_code=422, content={"success": False, "error": str(error)})
+
+    with _observe(request.provider) as observation:
+        response = await provider_resilience.run(
+            "regenerate_sections",
+            request.provider,
+            lambda provider: crew_executor.run(
+                provider,
+                image_prompt_crew.regenerate_sections,
+                request.model_copy(update={"provider": provider}),
+                sections,
+                cost=AdmissionCost(
+                    image_prompt_crew.estimate_section_tokens(request, sections), request.provider_api_keys
+                ),
+            ),
+        )
+        prompt_token_ledger.record("regenerate_sections", response.prompt_tokens)
+        request_summary = request.model_dump(mode="json", exclude=_SECRETS)
+        input_hash = canonical_hash({"kind": "regenerate_sections", **request_summary})
+        _persist("regenerate_sections", input_hash, request.provider, request_summary, response)
+        return observation.finish(response)
+
+
+def _image_cache_namespace(provider: Optional[str]) -> Optional[str]:
+    try:
+        provider_id, model = provider_configuration.model_identity(provider)
+    except ValueError:
+        return None
+    return f"{provider_id}:{model}"
+
+
+async def _describe_image(
+    load_image: Callable[[], PreparedImage],
+    *,
+    provider: Optional[str],
+    api_keys: Optional[Dict[str, str]],
+    filename: Optional[str],
+    cache_mode: CacheMode = "default",
+    progress: Optional[ProgressCallback] = None,
+) -> GeneratePromptResponse:
+    with _observe(provider) as observation:
+        response = await _run_describe_image(
+            observation,
+            load_image,
+            provider=provider,
+            api_keys=api_keys,
+            filename=filename,
+            cache_mode=cache_mode,
+            progress=progress,
+        )
+        return observation.finish(response)
+
+
+async def _run_describe_image(
+    observation: RequestObservation,
+    load_image: Callable[[], PreparedImage],
+    *,
+    provider: Optional[str],
+    api_keys: Optional[Dict[str, str]],
+    filename: Optional[str],
+    cache_mode: CacheMode = "default",
+    progress: Optional[ProgressCallback] = None,
+) -> GeneratePromptResponse:
+    # Decoding and resizing are CPU-bound; keep them off the loop without holding a provider slot.
+    started = time.perf_counter()
+    image = await asyncio.to_thread(load_image)
+    observation.stage("image_ingest", time.perf_counter() - started)
+    image_namespace = _image_cache_namespace(provider)
+    namespace = image_namespace if cache_mode != "bypass" else None
+    input_hash = (
+        canonical_hash({"kind": "describe_image", "namespace": image_namespace, "hash": image.perceptual_hash})
+        if image_namespace
+        else None
+    )
+    if namespace and cache_mode == "default":
+        cached = image_description_cache.get(namespace, image.perceptual_hash)
+        if cached is None:
+            # The durable tier matches exact perceptual hashes only; near-duplicates are an in-memory feature.
+            stored = await _stored_result(input_hash, GeneratedPromptData)
+            if stored is not None:
+                cached = GeneratePromptResponse(success=True, data=stored)
+                image_description_cache.set(namespace, image.perceptual_hash, cached)
+        if cached is not None:
+            return cached.model_copy(update={"cached": True, "token_usage": None, "prompt_tokens": None})
+
+    response = await provider_resilience.run(
+        "describe_image",
+        provider,
+        lambda attempt_provider: crew_executor.run(
+            attempt_provider,
+            image_prompt_crew.describe_prepared_image,
+            image,
+            provider=attempt_provider,
+            api_keys=api_keys,
+            filename=filename,
+            progress=progress,
+            cost=AdmissionCost(image_prompt_crew.estimate_image_tokens(), api_keys),
+        ),
+        require_vision=True,
+        hedge=progress is None,
+    )
+    prompt_token_ledger.record("describe_image", response.prompt_tokens)
+    if namespace and response.success and response.data is not None:
+        image_description_cache.set(namespace, image.perceptual_hash, response)
+    request_summary = {"filename": filename, "provider": provider, "perceptual_hash": f"{image.perceptual_hash:016x}"}
+    _persist("describe_image", input_hash, provider, request_summary, response)
+    return response
+
+
+async def _describe(
+    request: GeneratePromptFromImageRequest, progress: Optional[ProgressCallback] = None
+) -> GeneratePromptResponse:
+    return await _describe_image(
+        lambda: prepare_image(decode_base64_image(request.image_base64)),
+        provider=request.provider,
+        api_keys=request.provider_api_keys,
+        filename=request.filename,
+        cache_mode=request.cache,
+        progress=progress,
+    )
+
+
+def _log_image(message: str, filename: Optional[str], size: int) -> None:
+    logger.info("%s for %s (%d bytes)", message, filename or "uploaded image", size)
+    tracer.annotate(image_bytes=size)
 
 
 @app.post("/api/describe-image", response_model=GeneratePromptResponse)
 async def describe_image(request: GeneratePromptFromImageRequest) -> GeneratePromptResponse:
-    print(f"Beginning image description for: {request.filename or 'uploaded image'}")
-    return image_prompt_crew.generate_structured_prompt_from_image(request)
+    _log_image("Beginning image description", request.filename, len(request.image_base64))
+    return await _describe(request)
+
+
+@app.post("/api/describe-image/upload", response_model=GeneratePromptResponse)
+async def describe_image_upload(
+    file: UploadFile = File(...),
+    provider: Optional[str] = Form("openai"),
+    provider_api_keys: Optional[str] = Form(None),
+    cache: CacheMode = Form("default"),
+) -> GeneratePromptResponse:
+    """Multipart variant of /api/describe-image that takes raw image bytes instead of base64 JSON."""
+    try:
+        api_keys = json.loads(provider_api_keys) if provider_api_keys else None
+    except ValueError as error:
+        raise ImageIngestError(f"provider_api_keys is not valid JSON: {error}") from error
+    if api_keys is not None and not isinstance(api_keys, dict):
+        raise ImageIngestError("provider_api_keys must be a JSON object.")
+    raw_image = await read_upload(file)
+    _log_image("Beginning image description", file.filename, len(raw_image))
+    return await _describe_image(
+        lambda: prepare_image(raw_image),
+        provider=provider,
+        api_keys=api_keys,
+        filename=file.filename,
+        cache_mode=cache,
+    )
+
+
+@app.post("/api/describe-image/stream")
+async def describe_image_stream(request: GeneratePromptFromImageRequest) -> StreamingResponse:
+    _log_image("Beginning streamed image description", request.filename, len(request.image_base64))
+    # Decode before the stream opens so a bad image is a 400 (via image_ingest_handler), not an empty 200.
+    image = await asyncio.to_thread(lambda: prepare_image(decode_base64_image(request.image_base64)))
+    return StreamingResponse(
+        stream_with_progress(
+            lambda progress: _describe_image(
+                lambda: image,
+                provider=request.provider,
+                api_keys=request.provider_api_keys,
+                filename=request.filename,
+                cache_mode=request.cache,
+                progress=progress,
+            )
+        ),
+        media_type="text/event-stream",
+    )
+
+
+def _rule_based_convert(request: ConvertPromptRequest) -> ConvertPromptResponse:
+    try:
+        with timed_stage("rule_based"):
+            payload = rule_based_converter.convert(request.data, request.target_model)
+    except ValueError as error:
+        return ConvertPromptResponse(success=False, error=str(error))
+    return ConvertPromptResponse(success=True, data=payload)
+
+
+def _conversion_delta(request: ConvertPromptRequest) -> Optional[ConversionDelta]:
+    """The edit since ``request.previous_result``, if the request carries an earlier conversion for its target."""
+    previous = request.previous_result
+    if request.previous_data is None or previous is None or previous.target_model != request.target_model:
+        return None
+    try:
+        with timed_stage("incremental"):
+            return incremental_converter.delta(request.previous_data, previous, request.data)
+    except ValueError:
+        return None
+
+
+async def _incremental_convert(
+    request: ConvertPromptRequest, delta: ConversionDelta, progress: Optional[ProgressCallback] = None
+) -> ConvertPromptResponse:
+    """Finish a conversion from ``delta``: only prompt-bearing edits cost an LLM call, and only for the prompt."""
+    if not delta.rewrites_prompt:
+        baseline = prompt_conversion_crew.full_conversion_tokens(request, delta.draft)
+        response = ConvertPromptResponse(success=True, data=delta.draft, prompt_tokens=accounting(0, baseline))
+    else:
+        if progress:
+            progress("partial", {"task": "incremental_conversion", "data": delta.draft.model_dump(mode="json")})
+        response = await provider_resilience.run(
+            "rewrite_prompt",
+            request.provider,
+            lambda provider: crew_executor.run(
+                provider,
+                prompt_conversion_crew.rewrite_prompt,
+                request.model_copy(update={"provider": provider}),
+                delta,
+                progress,
+                cost=AdmissionCost(
+                    prompt_conversion_crew.estimate_rewrite_tokens(request, delta), request.provider_api_keys
+                ),
+            ),
+            hedge=progress is None,
+        )
+    prompt_token_ledger.record("convert:incremental", response.prompt_tokens)
+    return response
+
+
+async def _convert(
+    request: ConvertPromptRequest,
+    blueprint: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> ConvertPromptResponse:
+    with _observe(request.provider, request.target_model) as observation:
+        key = conversion_key(request, provider_configuration) if progress is None and request.mode != "fast" else None
+        response = await _coalesced(
+            conversion_flights, key, request.cache, lambda: _run_convert(request, blueprint, progress)
+        )
+        return observation.finish(response)
+
+
+async def _run_convert(
+    request: ConvertPromptRequest,
+    blueprint: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> ConvertPromptResponse:
+    if request.mode == "fast":
+        return _rule_based_convert(request)
+
+    input_hash = conversion_key(request, provider_configuration)
+    cache_key = input_hash if request.cache != "bypass" else None
+    if cache_key and request.cache == "default":
+        cached_payload = conversion_cache.get(cache_key)
+        if cached_payload is None:
+            cached_payload = await _stored_result(cache_key, ProviderOptimizedPayload)
+            if cached_payload is not None:
+                conversion_cache.set(cache_key, cached_payload)
+        if cached_payload is not None:
+            return ConvertPromptResponse(success=True, data=cached_payload, cached=True)
+
+    delta = _conversion_delta(request)
+    if delta is not None:
+        response = await _incremental_convert(request, delta, progress)
+    elif request.mode == "polish":
+        draft = _rule_based_convert(request)
+        if not draft.success:
+            return draft
+        if progress:
+            progress("partial", {"task": "rule_based_conversion", "data": draft.data.model_dump(mode="json")})
+        response = await provider_resilience.run(
+            "polish",
+            request.provider,
+            lambda provider: crew_executor.run(
+                provider,
+                prompt_conversion_crew.polish_conversion,
+                request.model_copy(update={"provider": provider}),
+                draft.data,
+                progress,
+                cost=AdmissionCost(
+                    prompt_conversion_crew.estimate_tokens(request, draft=draft.data), request.provider_api_keys
+                ),
+            ),
+            hedge=progress is None,
+        )
+        prompt_token_ledger.record("convert:polish", response.prompt_tokens)
+        if not response.success:
+            # The rule-based draft is still deployable; hand it back uncached with the polish error noted.
+            notes = [*draft.data.notes, f"LLM polish skipped: {response.error}"]
+            return draft.model_copy(update={"data": draft.data.model_copy(update={"notes": notes})})
+    else:
+        response = await provider_resilience.run(
+            "convert",
+            request.provider,
+            lambda provider: crew_executor.run(
+                provider,
+                prompt_conversion_crew.convert_prompt,
+                request.model_copy(update={"provider": provider}),
+                blueprint,
+                progress,
+                cost=AdmissionCost(
+                    prompt_conversion_crew.estimate_tokens(request, blueprint), request.provider_api_keys
+                ),
+            ),
+            hedge=progress is None,
+        )
+        prompt_token_ledger.record("convert:llm", response.prompt_tokens)
+    if cache_key and response.success and response.data is not None:
+        conversion_cache.set(cache_key, response.data)
+    _persist(
+        "convert",
+        input_hash,
+        request.provider,
+        request.model_dump(mode="json", exclude=_SECRETS | _PREVIOUS_CONVERSION),
+        response,
+        target_model=request.target_model,
+    )
+    return response
 
 
 @app.post("/api/convert-prompt", response_model=ConvertPromptResponse)
 async def convert_prompt(request: ConvertPromptRequest) -> ConvertPromptResponse:
-    print(f"Beginning provider conversion for target {request.target_model}")
-    return prompt_conversion_crew.convert_prompt(request)
+    logger.info("Beginning provider conversion for target %s", request.target_model)
+    return await _convert(request)
+
+
+@app.post("/api/convert-prompt/stream")
+async def convert_prompt_stream(request: ConvertPromptRequest) -> StreamingResponse:
+    logger.info("Beginning streamed provider conversion for target %s", request.target_model)
+    return StreamingResponse(
+        stream_with_progress(lambda progress: _convert(request, progress=progress)), media_type="text/event-stream"
+    )
+
+
+async def _convert_target(
+    request: ConvertPromptMultiRequest, target_model: str, blueprint: Optional[str]
+) -> Tuple[str, ConvertPromptResponse]:
+    try:
+        response = await _convert(request.for_target(target_model), blueprint)
+    except CrewCapacityError as error:
+        response = ConvertPromptResponse(success=False, error=str(error))
+    return target_model, response
+
+
+async def _stream_conversions(pending: List["asyncio.Task[Tuple[str, ConvertPromptResponse]]"]) -> AsyncIterator[str]:
+    try:
+        for next_result in asyncio.as_completed(pending):
+            target_model, response = await next_result
+            yield json.dumps({"target_model": target_model, **response.model_dump(mode="json")}) + "\n"
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+@app.post("/api/convert-prompt/multi", response_model=ConvertPromptMultiResponse)
+async def convert_prompt_multi(request: ConvertPromptMultiRequest):
+    targets = list(dict.fromkeys(request.target_models))
+    logger.info("Beginning provider conversion for targets %s", ", ".join(targets))
+    tracer.annotate(targets=len(targets), mode=request.mode)
+    # Serialise the blueprint once and share it across the per-target crews.
+    blueprint = prompt_conversion_crew.tasks.prompt_snapshot(request.data) if request.mode == "llm" else None
+    pending = [asyncio.ensure_future(_convert_target(request, target, blueprint)) for target in targets]
+
+    if request.stream:
+        return StreamingResponse(_stream_conversions(pending), media_type="application/x-ndjson")
+
+    results = dict(await asyncio.gather(*pending))
+    return ConvertPromptMultiResponse(
+        success=all(response.success for response in results.values()),
+        results=results,
+    )
+
+
+# Jobs: the same pipelines, run by worker processes (python -m app.worker) instead of inside the request.
+JOB_HANDLERS: JobHandlers = {
+    "generate": (GeneratePromptRequest, _generate),
+    "describe_image": (GeneratePromptFromImageRequest, _describe),
+    "convert": (ConvertPromptRequest, lambda request, progress: _convert(request, progress=progress)),
+}
+
+
+def _job_queue_disabled() -> JSONResponse:
+    return JSONResponse(
+        status_code=503, content={"success": False, "error": "The job queue is disabled (JOB_QUEUE_URL is empty)."}
+    )
+
+
+def _unknown_job(job_id: str) -> JSONResponse:
+    return JSONResponse(status_code=404, content={"success": False, "error": f"Unknown job {job_id}."})
+
+
+async def _submit_job(kind: JobKind, request: BaseModel):
+    if not job_queue.enabled:
+        return _job_queue_disabled()
+    status = await asyncio.to_thread(job_queue.submit, kind, request.model_dump(mode="json"))
+    tracer.annotate(job_id=status["id"])
+    return JobStatus(**status)
+
+
+@app.post("/api/jobs/generate-prompt", response_model=JobStatus, status_code=202)
+async def submit_generation_job(request: GeneratePromptRequest):
+    _log_generation("Queueing prompt generation", request)
+    return await _submit_job("generate", request)
+
+
+@app.post("/api/jobs/describe-image", response_model=JobStatus, status_code=202)
+async def submit_description_job(request: GeneratePromptFromImageRequest):
+    _log_image("Queueing image description", request.filename, len(request.image_base64))
+    return await _submit_job("describe_image", request)
+
+
+@app.post("/api/jobs/convert-prompt", response_model=JobStatus, status_code=202)
+async def submit_conversion_job(request: ConvertPromptRequest):
+    logger.info("Queueing provider conversion for target %s", request.target_model)
+    return await _submit_job("convert", request)
+
+
+@app.get("/api/jobs/stats")
+async def job_stats():
+    return await asyncio.to_thread(job_queue.stats)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    if not job_queue.enabled:
+        return _job_queue_disabled()
+    status = await asyncio.to_thread(job_queue.get, job_id)
+    return JobStatus(**status) if status is not None else _unknown_job(job_id)
+
+
+@app.delete("/api/jobs/{job_id}", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    if not job_queue.enabled:
+        return _job_queue_disabled()
+    status = await asyncio.to_thread(job_queue.cancel, job_id)
+    return JobStatus(**status) if status is not None else _unknown_job(job_id)
+
+
+async def _follow_job(job_id: str) -> AsyncIterator[str]:
+    """Replay a job's progress events and follow it to the end: ``status`` events on every state change, then
+    ``result`` (the pipeline response) or ``error``."""
+    poll_interval = env_float("JOB_POLL_INTERVAL", 0.5, minimum=0.05)
+    after_id = 0
+    last_state = None
+    while True:
+        # Status before events: a finished job's events were all written before it finished.
+        status = await asyncio.to_thread(job_queue.get, job_id)
+        for after_id, event, data in await asyncio.to_thread(job_queue.events, job_id, after_id):
+            yield sse_event(event, data)
+        if status is None:
+            yield sse_event("error", {"success": False, "error": f"Unknown job {job_id}."})
+            return
+        if status["status"] != last_state:
+            last_state = status["status"]
+            yield sse_event("status", JobStatus(**{**status, "result": None}).model_dump(mode="json"))
+        if last_state in TERMINAL_STATES:
+            if status["result"] is not None:
+                yield sse_event("result", status["result"])
+            else:
+                yield sse_event("error", {"success": False, "error": status["error"]})
+            return
+        await asyncio.sleep(poll_interval)
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    if not job_queue.enabled:
+        return _job_queue_disabled()
+    if await asyncio.to_thread(job_queue.get, job_id) is None:
+        return _unknown_job(job_id)
+    return StreamingResponse(_follow_job(job_id), media_type="text/event-stream")
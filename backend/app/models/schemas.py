@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+CacheMode = Literal["default", "bypass", "refresh"]
+# llm: specialist + reviewer crew; fast: rule-based only; polish: rule-based draft plus one LLM review pass
+ConversionMode = Literal["llm", "fast", "polish"]
+TargetModel = Literal["flux.1", "wan-2.2", "sdxl"]
+# standard: drafter + editor crew; fast: one schema-constrained call, editor pass only on invalid output or review=True
+GenerationQuality = Literal["fast", "standard"]
+HistoryKind = Literal["generate", "describe_image", "convert", "regenerate_sections"]
+JobKind = Literal["generate", "describe_image", "convert"]
+JobState = Literal["queued", "running", "succeeded", "failed", "cancelled", "expired"]
 
 
 # Request schemas
@@ -10,6 +22,14 @@ class GeneratePromptRequest(BaseModel):
     prompt: str
     provider: Optional[str] = "openai"
     provider_api_keys: Optional[Dict[str, str]] = None
+    cache: CacheMode = "default"
+    quality: GenerationQuality = "standard"
+    review: bool = False
+
+
+class BatchGeneratePromptRequest(BaseModel):
+    items: List[GeneratePromptRequest] = Field(min_length=1)
+    concurrency: Optional[int] = Field(default=None, ge=1)
 
 
 class GeneratePromptFromImageRequest(BaseModel):
@@ -17,6 +37,7 @@ class GeneratePromptFromImageRequest(BaseModel):
     filename: Optional[str] = None
     provider: Optional[str] = "openai"
     provider_api_keys: Optional[Dict[str, str]] = None
+    cache: CacheMode = "default"
 
 
 # Response schemas
@@ -125,12 +146,70 @@ class GeneratedPromptData(BaseModel):
     notes: Optional[str] = None
 
 
+class TokenUsage(BaseModel):
+    """Provider token usage normalised from CrewAI's UsageMetrics (or any object/dict with these fields)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_prompt_tokens: int = 0
+    total_tokens: int = 0
+    successful_requests: int = 0
+
+
+class RequestTimings(BaseModel):
+    """Seconds spent waiting for a crew slot and in each pipeline stage."""
+
+    queue_wait: Optional[float] = None
+    stages: Dict[str, float] = Field(default_factory=dict)
+
+
+class PromptTokenAccounting(BaseModel):
+    """Tokens in the prompts we author for a request, and how many compact encoding saved versus indented JSON."""
+
+    input_tokens: int
+    saved_tokens: int = 0
+    estimator: str
+
+
+class SemanticCacheMatch(BaseModel):
+    """The earlier prompt a generation was served from (``hit``) or seeded with (``seed``)."""
+
+    mode: Literal["hit", "seed"]
+    prompt: str
+    similarity: float
+
+
 class GeneratePromptResponse(BaseModel):
     success: bool
     data: Optional[GeneratedPromptData] = None
     processing_time: Optional[float] = None
+    timings: Optional[RequestTimings] = None
     error: Optional[str] = None
-    token_usage: Optional[Any] = None
+    token_usage: Optional[TokenUsage] = None
+    prompt_tokens: Optional[PromptTokenAccounting] = None
+    cached: bool = False
+    semantic_match: Optional[SemanticCacheMatch] = None
+
+
+class BatchGeneratePromptItemResult(GeneratePromptResponse):
+    index: int
+
+
+class RegenerateSectionsRequest(BaseModel):
+    """Redo selected blueprint sections, addressed by path: ``lighting``, ``subjects[1]``, ``composition.camera``."""
+
+    data: GeneratedPromptData
+    sections: List[str] = Field(min_length=1, max_length=16)
+    instructions: Optional[str] = None
+    provider: Optional[str] = "openai"
+    provider_api_keys: Optional[Dict[str, str]] = None
+
+
+class RegenerateSectionsResponse(GeneratePromptResponse):
+    # Canonical paths of the sections that were regenerated (nested duplicates removed).
+    sections: List[str] = Field(default_factory=list)
 
 
 class GenerateImageResponse(BaseModel):
@@ -141,15 +220,8 @@ class GenerateImageResponse(BaseModel):
 
 
 
-class ConvertPromptRequest(BaseModel):
-    data: GeneratedPromptData
-    target_model: Literal["flux.1", "wan-2.2", "sdxl"]
-    provider: Optional[str] = None
-    provider_api_keys: Optional[Dict[str, str]] = None
-
-
 class ProviderOptimizedPayload(BaseModel):
-    target_model: Literal["flux.1", "wan-2.2", "sdxl"]
+    target_model: TargetModel
     model_identifier: str
     prompt: str
     negative_prompt: Optional[str] = None
@@ -159,10 +231,66 @@ class ProviderOptimizedPayload(BaseModel):
     notes: List[str] = Field(default_factory=list)
 
 
+class ConvertPromptRequest(BaseModel):
+    data: GeneratedPromptData
+    target_model: TargetModel
+    provider: Optional[str] = None
+    provider_api_keys: Optional[Dict[str, str]] = None
+    cache: CacheMode = "default"
+    mode: ConversionMode = "llm"
+    # An earlier conversion and the blueprint it came from; when both are given for the same target, only
+    # the edit between the two blueprints is converted.
+    previous_data: Optional[GeneratedPromptData] = None
+    previous_result: Optional[ProviderOptimizedPayload] = None
+
+
 class ConvertPromptResponse(BaseModel):
     success: bool
     data: Optional[ProviderOptimizedPayload] = None
+    processing_time: Optional[float] = None
+    timings: Optional[RequestTimings] = None
     error: Optional[str] = None
-    token_usage: Optional[Any] = None
+    token_usage: Optional[TokenUsage] = None
+    prompt_tokens: Optional[PromptTokenAccounting] = None
+    cached: bool = False
+
+
+class ConvertPromptMultiRequest(BaseModel):
+    data: GeneratedPromptData
+    target_models: List[TargetModel] = Field(default_factory=lambda: ["flux.1", "wan-2.2", "sdxl"], min_length=1)
+    provider: Optional[str] = None
+    provider_api_keys: Optional[Dict[str, str]] = None
+    cache: CacheMode = "default"
+    mode: ConversionMode = "llm"
+    stream: bool = False
+
+    def for_target(self, target_model: str) -> ConvertPromptRequest:
+        return ConvertPromptRequest(
+            data=self.data,
+            target_model=target_model,
+            provider=self.provider,
+            provider_api_keys=self.provider_api_keys,
+            cache=self.cache,
+            mode=self.mode,
+        )
+
+
+class ConvertPromptMultiResponse(BaseModel):
+    success: bool
+    results: Dict[str, ConvertPromptResponse] = Field(default_factory=dict)
+
 
+class JobStatus(BaseModel):
+    """A queued pipeline run; ``result`` is the pipeline's response once the job has finished."""
 
+    id: str
+    kind: JobKind
+    status: JobState
+    attempts: int
+    max_attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # The last attempt's error; set on retried jobs while they wait for their next attempt.
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
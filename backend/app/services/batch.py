@@ -0,0 +1,53 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Optional, Sequence, Tuple, TypeVar
+
+from .crew_executor import CrewCapacityError
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def run_with_capacity_retries(
+    operation: Callable[[], Awaitable[R]], *, attempts: int = 5
+) -> R:
+    """Await ``operation``, sleeping out 429/503 rejections instead of failing the item straight away."""
+    for attempt in range(attempts):
+        try:
+            return await operation()
+        except CrewCapacityError as error:
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(error.retry_after)
+    raise RuntimeError("unreachable")
+
+
+async def iter_concurrently(
+    items: Sequence[T],
+    worker: Callable[[int, T], Awaitable[R]],
+    concurrency: int,
+) -> AsyncIterator[R]:
+    """Run ``worker`` over ``items`` with at most ``concurrency`` in flight, yielding results as they finish.
+
+    ``worker`` is expected to turn its own failures into result values; closing the iterator early cancels
+    whatever is still running.
+    """
+    results: "asyncio.Queue[Tuple[Optional[R], Optional[BaseException]]]" = asyncio.Queue()
+    cursor = iter(enumerate(items))
+
+    async def _drain() -> None:
+        for index, item in cursor:
+            try:
+                await results.put((await worker(index, item), None))
+            except Exception as error:  # surface unexpected worker bugs instead of hanging the stream
+                await results.put((None, error))
+
+    runners = [asyncio.ensure_future(_drain()) for _ in range(max(1, min(concurrency, len(items))))]
+    try:
+        for _ in range(len(items)):
+            result, error = await results.get()
+            if error is not None:
+                raise error
+            yield result
+    finally:
+        for runner in runners:
+            runner.cancel()
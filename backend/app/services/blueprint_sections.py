@@ -0,0 +1,155 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+PathStep = Union[str, int]
+SectionPath = Tuple[PathStep, ...]
+
+_STEP = re.compile(r"\.?([A-Za-z_][A-Za-z0-9_]*)|\[(\d+)\]")
+
+
+class SectionPathError(ValueError):
+    """Raised for a section path that does not name a field (or list item) of the blueprint."""
+
+
+def parse_section_path(path: str) -> SectionPath:
+    """Split ``composition.camera`` or ``subjects[1]`` into field names and list indexes."""
+    steps: List[PathStep] = []
+    position = 0
+    text = path.strip()
+    while position < len(text):
+        match = _STEP.match(text, position)
+        if match is None or (position == 0 and match.group(0).startswith(".")):
+            raise SectionPathError(f"Malformed section path '{path}'.")
+        name, index = match.groups()
+        steps.append(name if name is not None else int(index))
+        position = match.end()
+    if not steps or not isinstance(steps[0], str):
+        raise SectionPathError(f"Malformed section path '{path}'.")
+    return tuple(steps)
+
+
+def format_section_path(steps: SectionPath) -> str:
+    return "".join(f"[{step}]" if isinstance(step, int) else f".{step}" for step in steps).lstrip(".")
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if get_origin(annotation) is Union and len(args) == 1:
+        return args[0]
+    return annotation
+
+
+def _annotation_at(model: Type[BaseModel], steps: SectionPath, path: str) -> Any:
+    """The sub-schema at ``steps``: a nested model, a list item type or a scalar annotation."""
+    annotation: Any = model
+    for step in steps:
+        annotation = _unwrap_optional(annotation)
+        if isinstance(step, int):
+            if get_origin(annotation) is not list:
+                raise SectionPathError(f"'{path}' indexes a field that is not a list.")
+            annotation = get_args(annotation)[0]
+        else:
+            fields = getattr(annotation, "model_fields", None)
+            if fields is None or step not in fields:
+                raise SectionPathError(f"Unknown blueprint section '{path}'.")
+            annotation = fields[step].annotation
+    return annotation
+
+
+def _value_at(data: BaseModel, steps: SectionPath, path: str) -> Any:
+    value: Any = data
+    for step in steps:
+        if isinstance(step, int):
+            if step >= len(value):
+                raise SectionPathError(f"'{path}' is out of range; the blueprint has {len(value)} items.")
+            value = value[step]
+        else:
+            value = getattr(value, step)
+    return value
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+
+def _covered(steps: SectionPath, sections: Sequence[SectionPath]) -> bool:
+    return any(steps[: len(section)] == section for section in sections)
+
+
+def normalise_sections(data: BaseModel, paths: Sequence[str]) -> List[SectionPath]:
+    """Parse and check ``paths`` against ``data``; duplicates and paths inside another requested section are dropped."""
+    parsed: List[SectionPath] = []
+    for path in paths:
+        steps = parse_section_path(path)
+        _annotation_at(type(data), steps, path)
+        _value_at(data, steps, path)
+        if steps not in parsed:
+            parsed.append(steps)
+    return [steps for steps in parsed if not _covered(steps, [other for other in parsed if other != steps])]
+
+
+def section_values(data: BaseModel, sections: Sequence[SectionPath]) -> Dict[str, Any]:
+    """Current JSON values of ``sections``, keyed by their canonical path."""
+    values = {}
+    for steps in sections:
+        values[format_section_path(steps)] = _dump(_value_at(data, steps, format_section_path(steps)))
+    return values
+
+
+def section_context(
+    data: BaseModel, sections: Sequence[SectionPath], anchors: Sequence[SectionPath]
+) -> Dict[str, Any]:
+    """What frames the regenerated sections: the ``anchors`` plus the siblings of each nested section.
+
+    ``subjects[1]`` sees the other subjects and ``composition.camera`` sees the shot and aspect ratio, but a
+    top-level section only sees the anchors, so the prompt carries a fraction of the blueprint.
+    """
+    context: Dict[str, Any] = {}
+    for steps in anchors:
+        if not _covered(steps, sections):
+            context[format_section_path(steps)] = _dump(_value_at(data, steps, format_section_path(steps)))
+    for steps in sections:
+        if len(steps) < 2:
+            continue
+        parent = steps[:-1]
+        value = _dump(_value_at(data, parent, format_section_path(parent)))
+        siblings = enumerate(value) if isinstance(value, list) else value.items()
+        for key, sibling in siblings:
+            if not _covered(parent + (key,), sections):
+                context[format_section_path(parent + (key,))] = sibling
+    return context
+
+
+@lru_cache(maxsize=256)
+def section_schema(model: Type[BaseModel], sections: Tuple[SectionPath, ...]) -> Type[BaseModel]:
+    """A response model with one required property per section path, typed with that section's sub-schema.
+
+    Only the requested sections are sent as the structured-output schema, so the model cannot touch the rest
+    of the blueprint. Models are cached per section set.
+    """
+    fields: Dict[str, Any] = {}
+    for position, steps in enumerate(sections):
+        path = format_section_path(steps)
+        fields[f"section_{position}"] = (_annotation_at(model, steps, path), Field(alias=path))
+    return create_model(
+        "BlueprintSections", __config__=ConfigDict(populate_by_name=True, extra="forbid"), **fields
+    )
+
+
+def merge_sections(data: BaseModel, sections: Sequence[SectionPath], regenerated: BaseModel) -> BaseModel:
+    """Write the regenerated sections into a copy of ``data`` and validate the result as a whole."""
+    merged = data.model_dump(mode="json")
+    replacements = regenerated.model_dump(mode="json", by_alias=True)
+    for steps in sections:
+        container: Any = merged
+        for step in steps[:-1]:
+            container = container[step]
+        container[steps[-1]] = replacements[format_section_path(steps)]
+    return type(data).model_validate(merged)
@@ -0,0 +1,286 @@
+import asyncio
+import contextvars
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Set, Tuple, TypeVar
+
+from .metrics import current_observation
+from .provider_config import ProviderConfigurationService
+from .rate_limits import AdmissionCost, RateBudget, RateLimiter
+from .settings import env_float, env_int
+
+T = TypeVar("T")
+
+_DEFAULT_LANE = "default"
+_DEFAULT_RUN_ESTIMATE = 20.0
+
+# Admission order within a lane: interactive UI requests are always served before batch work.
+PRIORITIES = ("interactive", "batch")
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("crew_priority", default="interactive")
+
+
+@contextmanager
+def priority_scope(priority: str) -> Iterator[None]:
+    """Schedule crew runs started inside this scope with ``priority``."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority '{priority}'. Expected one of: {', '.join(PRIORITIES)}.")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class CrewCapacityError(Exception):
+    """Raised when a crew run cannot be admitted to its provider lane."""
+
+    def __init__(self, message: str, *, status_code: int, retry_after: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass(eq=False)
+class _Waiter:
+    future: asyncio.Future
+    priority: str
+    budget: Optional[RateBudget]
+    tokens: int
+
+    def wait_time(self) -> float:
+        return self.budget.wait_time(self.tokens) if self.budget is not None else 0.0
+
+
+class _ProviderLane:
+    """Admission state for a single provider: running slots plus a bounded FIFO of waiters per priority."""
+
+    def __init__(self, key: str, limit: int, max_queue: int) -> None:
+        self.key = key
+        self.limit = limit
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiters: Dict[str, Deque[_Waiter]] = {priority: deque() for priority in PRIORITIES}
+        self.average_duration: Optional[float] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self.waiters.values())
+
+    def next_admissible(self) -> Tuple[Optional[_Waiter], Optional[float]]:
+        """The first waiter, by priority then arrival, whose rate budget allows it to start now.
+
+        A waiter held back by its budget also holds back later waiters on the same budget, so batch
+        work cannot overtake interactive work for the same key. Otherwise returns the shortest budget wait.
+        """
+        blocked: Set[int] = set()
+        shortest: Optional[float] = None
+        for priority in PRIORITIES:
+            queue = self.waiters[priority]
+            for waiter in list(queue):
+                if waiter.future.done():
+                    queue.remove(waiter)
+                    continue
+                if waiter.budget is not None and id(waiter.budget) in blocked:
+                    continue
+                wait = waiter.wait_time()
+                if wait <= 0:
+                    return waiter, None
+                blocked.add(id(waiter.budget))
+                shortest = wait if shortest is None else min(shortest, wait)
+        return None, shortest
+
+    def record_duration(self, seconds: float) -> None:
+        if self.average_duration is None:
+            self.average_duration = seconds
+        else:
+            self.average_duration = 0.8 * self.average_duration + 0.2 * seconds
+
+    def retry_after(self) -> int:
+        average = self.average_duration or _DEFAULT_RUN_ESTIMATE
+        return max(1, math.ceil(average * (self.waiting() + 1) / self.limit))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting(),
+            "waiting_by_priority": {priority: len(queue) for priority, queue in self.waiters.items()},
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "average_duration": self.average_duration,
+        }
+
+
+class CrewExecutor:
+    """Runs blocking crew kickoffs on a bounded thread pool with per-provider admission control.
+
+    Each provider gets a lane limited to its configured concurrency. Requests beyond that wait in a
+    bounded FIFO; when the FIFO is full the caller is rejected straight away with a 429, and waiters
+    that exceed ``CREW_QUEUE_TIMEOUT`` are rejected with a 503. Both carry a ``retry_after`` hint
+    derived from the lane's recent run durations.
+
+    Waiters are admitted interactive-first (see ``priority_scope``), and only once their provider/key
+    RPM and TPM budgets (``RateLimiter``) cover one more request and the run's estimated tokens, so
+    bursts queue here instead of turning into vendor 429s and SDK retry stalls.
+    """
+
+    def __init__(
+        self,
+        provider_service: ProviderConfigurationService,
+        *,
+        max_workers: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+    ) -> None:
+        self.provider_service = provider_service
+        self.max_workers = max_workers or env_int("CREW_MAX_WORKERS", 32)
+        self.queue_timeout = queue_timeout if queue_timeout is not None else env_float("CREW_QUEUE_TIMEOUT", 30.0)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crew")
+        self._lanes: Dict[str, _ProviderLane] = {}
+        self.rate_limiter = RateLimiter(provider_service)
+
+    def _lane_for(self, provider_id: Optional[str]) -> _ProviderLane:
+        try:
+            key, limit, max_queue = self.provider_service.execution_limits(provider_id)
+        except ValueError:
+            # Unknown providers fail fast inside the crew; they still share one bounded lane.
+            key, limit, max_queue = _DEFAULT_LANE, 4, 32
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = _ProviderLane(key, limit, max_queue)
+            self._lanes[key] = lane
+        return lane
+
+    async def _acquire(self, lane: _ProviderLane, waiter: _Waiter) -> None:
+        if lane.active < lane.limit and not lane.waiting() and waiter.wait_time() <= 0:
+            self._admit(lane, waiter)
+            return
+
+        if lane.waiting() >= lane.max_queue:
+            raise CrewCapacityError(
+                f"Provider '{lane.key}' is at capacity; try again shortly.",
+                status_code=429,
+                retry_after=lane.retry_after(),
+            )
+
+        lane.waiters[waiter.priority].append(waiter)
+        self._dispatch(lane)
+        try:
+            await asyncio.wait_for(waiter.future, timeout=self.queue_timeout or None)
+        except asyncio.TimeoutError:
+            self._abandon(lane, waiter)
+            raise CrewCapacityError(
+                f"Timed out waiting for a '{lane.key}' execution slot.",
+                status_code=503,
+                retry_after=lane.retry_after(),
+            ) from None
+        except asyncio.CancelledError:
+            self._abandon(lane, waiter)
+            raise
+
+    def _admit(self, lane: _ProviderLane, waiter: _Waiter) -> None:
+        if waiter.budget is not None:
+            waiter.budget.take(waiter.tokens)
+        lane.active += 1
+
+    def _dispatch(self, lane: _ProviderLane) -> None:
+        """Hand free slots to admissible waiters; if budgets hold them back, retry once the budget refills."""
+        if lane.timer is not None:
+            lane.timer.cancel()
+            lane.timer = None
+        while lane.active < lane.limit:
+            waiter, wait = lane.next_admissible()
+            if waiter is None:
+                if wait is not None:
+                    lane.timer = asyncio.get_running_loop().call_later(wait, self._dispatch, lane)
+                return
+            lane.waiters[waiter.priority].remove(waiter)
+            self._admit(lane, waiter)
+            waiter.future.set_result(None)
+
+    def _abandon(self, lane: _ProviderLane, waiter: _Waiter) -> None:
+        if waiter.future.done() and not waiter.future.cancelled():
+            # The slot was handed over just as we gave up on it; pass it on.
+            self._release(lane)
+            return
+        try:
+            lane.waiters[waiter.priority].remove(waiter)
+        except ValueError:
+            pass
+
+    def _release(self, lane: _ProviderLane) -> None:
+        lane.active -= 1
+        self._dispatch(lane)
+
+    def _complete(self, lane: _ProviderLane, duration: float, waiter: _Waiter, result: Any) -> None:
+        lane.record_duration(duration)
+        if waiter.budget is not None:
+            waiter.budget.settle(waiter.tokens, _reported_tokens(result))
+        self._release(lane)
+
+    async def run(
+        self,
+        provider_id: Optional[str],
+        func: Callable[..., T],
+        *args: Any,
+        cost: Optional[AdmissionCost] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``func`` on the crew pool once the provider lane admits it.
+
+        The slot is held until the worker thread actually finishes, even if the awaiting request is
+        cancelled, so lane accounting always reflects the real load on the provider. ``func`` runs in a
+        copy of the caller's context, so request-scoped metrics recorded in the thread reach the request.
+        ``cost`` carries the run's estimated tokens and the request's API keys for rate-limit admission;
+        the estimate is corrected with the token usage the result reports.
+        """
+        entered = time.perf_counter()
+        lane = self._lane_for(provider_id)
+        cost = cost or AdmissionCost()
+        waiter = _Waiter(
+            future=asyncio.get_running_loop().create_future(),
+            priority=_priority.get(),
+            budget=self.rate_limiter.budget(provider_id, cost.api_keys),
+            tokens=cost.tokens,
+        )
+        await self._acquire(lane, waiter)
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        observation = current_observation()
+
+        def _invoke() -> T:
+            if observation is not None:
+                # Lane admission plus any wait for a free pool thread.
+                observation.queued(time.perf_counter() - entered)
+            return func(*args, **kwargs)
+
+        try:
+            future = self._pool.submit(contextvars.copy_context().run, _invoke)
+        except BaseException:
+            self._release(lane)
+            raise
+
+        def _on_done(done: Any) -> None:
+            result = done.result() if not done.cancelled() and done.exception() is None else None
+            loop.call_soon_threadsafe(self._complete, lane, time.perf_counter() - started, waiter, result)
+
+        future.add_done_callback(_on_done)
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: lane.stats() for key, lane in self._lanes.items()}
+
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        return self.rate_limiter.stats()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _reported_tokens(result: Any) -> Optional[int]:
+    usage = getattr(result, "token_usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return total if isinstance(total, int) else None
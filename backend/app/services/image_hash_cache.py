@@ -0,0 +1,121 @@
+import threading
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+import numpy as np
+from PIL import Image
+
+from .settings import env_int
+
+T = TypeVar("T")
+
+
+def difference_hash(image: Image.Image, hash_size: int = 8) -> int:
+    """64-bit dHash: compares neighbouring pixels of a tiny greyscale thumbnail, so it survives re-saves and resizes."""
+    thumbnail = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class PerceptualHashCache(Generic[T]):
+    """Bounded near-duplicate cache keyed by 64-bit perceptual hashes.
+
+    Exact hashes are answered from a dict; otherwise the whole hash table is compared in one vectorised
+    XOR/popcount pass and the closest entry within ``max_distance`` bits (in the same namespace) wins.
+    When full, the least recently used slot is overwritten.
+    """
+
+    def __init__(self, max_entries: int, max_distance: int) -> None:
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._hashes = np.zeros(max_entries, dtype=np.uint64)
+        self._namespaces = np.full(max_entries, -1, dtype=np.int32)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._values: List[Optional[T]] = [None] * max_entries
+        self._exact: Dict[Tuple[int, int], int] = {}
+        self._namespace_ids: Dict[str, int] = {}
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "PerceptualHashCache[T]":
+        return cls(
+            max_entries=env_int("IMAGE_CACHE_MAX_ENTRIES", 2048),
+            max_distance=env_int("IMAGE_CACHE_MAX_DISTANCE", 6, minimum=0),
+        )
+
+    def _namespace_id(self, namespace: str) -> int:
+        if namespace not in self._namespace_ids:
+            self._namespace_ids[namespace] = len(self._namespace_ids)
+        return self._namespace_ids[namespace]
+
+    def _touch(self, slot: int) -> None:
+        self._tick += 1
+        self._last_used[slot] = self._tick
+
+    def get(self, namespace: str, image_hash: int) -> Optional[T]:
+        with self._lock:
+            namespace_id = self._namespace_id(namespace)
+            slot = self._exact.get((namespace_id, image_hash))
+            if slot is not None:
+                self.exact_hits += 1
+                self._touch(slot)
+                return self._values[slot]
+
+            if self._size and self.max_distance > 0:
+                distances = _popcount(self._hashes[: self._size] ^ np.uint64(image_hash)).astype(np.int32)
+                distances[self._namespaces[: self._size] != namespace_id] = 65
+                slot = int(np.argmin(distances))
+                if distances[slot] <= self.max_distance:
+                    self.near_hits += 1
+                    self._touch(slot)
+                    return self._values[slot]
+
+            self.misses += 1
+            return None
+
+    def set(self, namespace: str, image_hash: int, value: T) -> None:
+        with self._lock:
+            namespace_id = self._namespace_id(namespace)
+            key = (namespace_id, image_hash)
+            slot = self._exact.get(key)
+            if slot is None:
+                if self._size < self.max_entries:
+                    slot = self._size
+                    self._size += 1
+                else:
+                    slot = int(np.argmin(self._last_used))
+                    evicted = (int(self._namespaces[slot]), int(self._hashes[slot]))
+                    self._exact.pop(evicted, None)
+                    self.evictions += 1
+                self._hashes[slot] = np.uint64(image_hash)
+                self._namespaces[slot] = namespace_id
+                self._exact[key] = slot
+            self._values[slot] = value
+            self._touch(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.near_hits
+            lookups = hits + self.misses
+            return {
+                "entries": self._size,
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
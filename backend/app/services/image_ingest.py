@@ -0,0 +1,111 @@
+import base64
+import binascii
+import io
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .image_hash_cache import difference_hash
+from .settings import env_int
+
+_CHUNK_SIZE = 64 * 1024
+_FORMAT_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+
+class ImageIngestError(ValueError):
+    """Raised when an uploaded image is too large or cannot be decoded."""
+
+    def __init__(self, message: str, *, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """A decoded, downscaled and re-encoded reference image ready to hand to a vision model."""
+
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    original_width: int
+    original_height: int
+    original_size: int
+    perceptual_hash: int
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{base64.b64encode(self.data).decode('ascii')}"
+
+
+def _env_format() -> str:
+    value = os.getenv("IMAGE_FORMAT", "JPEG").upper()
+    return value if value in _FORMAT_MIME_TYPES else "JPEG"
+
+
+def max_image_bytes() -> int:
+    return env_int("IMAGE_MAX_BYTES", 10 * 1024 * 1024)
+
+
+async def read_upload(upload: UploadFile, limit: Optional[int] = None) -> bytes:
+    """Read an upload in chunks, refusing it as soon as it grows past ``limit`` bytes."""
+    limit = limit or max_image_bytes()
+    buffer = bytearray()
+    while True:
+        chunk = await upload.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer.extend(chunk)
+        if len(buffer) > limit:
+            raise ImageIngestError(f"Image exceeds the {limit} byte upload limit.", status_code=413)
+    if not buffer:
+        raise ImageIngestError("Uploaded image is empty.")
+    return bytes(buffer)
+
+
+def decode_base64_image(image_base64: str, limit: Optional[int] = None) -> bytes:
+    """Decode a base64 (or ``data:`` URL) payload, checking the size bound before allocating the bytes."""
+    limit = limit or max_image_bytes()
+    _, _, encoded = image_base64.rpartition(",") if image_base64.startswith("data:") else ("", "", image_base64)
+    if len(encoded) * 3 // 4 > limit:
+        raise ImageIngestError(f"Image exceeds the {limit} byte upload limit.", status_code=413)
+    try:
+        return base64.b64decode(encoded, validate=False)
+    except (binascii.Error, ValueError) as error:
+        raise ImageIngestError(f"Image data is not valid base64: {error}") from error
+
+
+def prepare_image(raw: bytes, *, max_edge: Optional[int] = None, image_format: Optional[str] = None) -> PreparedImage:
+    """Decode ``raw`` once, shrink it to ``max_edge`` on the long side and re-encode it compactly."""
+    max_edge = max_edge or env_int("IMAGE_MAX_EDGE", 1024, minimum=64)
+    image_format = (image_format or _env_format()).upper()
+    quality = env_int("IMAGE_QUALITY", 85)
+
+    try:
+        image = Image.open(io.BytesIO(raw))
+        original_width, original_height = image.size
+        # Lets the JPEG decoder scale down by a power of two while decoding, avoiding a full-size bitmap.
+        image.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGB")
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as error:
+        raise ImageIngestError(f"Unsupported or corrupt image: {error}") from error
+
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    save_kwargs = {"quality": quality} if image_format in {"JPEG", "WEBP"} else {"optimize": True}
+    image.save(output, format=image_format, **save_kwargs)
+    return PreparedImage(
+        data=output.getvalue(),
+        mime_type=_FORMAT_MIME_TYPES[image_format],
+        width=image.width,
+        height=image.height,
+        original_width=original_width,
+        original_height=original_height,
+        original_size=len(raw),
+        perceptual_hash=difference_hash(image),
+    )
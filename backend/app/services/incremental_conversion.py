@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from pydantic import BaseModel
+
+from ..models.schemas import GeneratedPromptData, ProviderOptimizedPayload
+from .blueprint_sections import SectionPath, format_section_path
+from .rule_based_conversion import RuleBasedPromptConverter
+
+# Blueprint fields the condensed positive prompt is written from. An edit anywhere else (params, controls,
+# post, safety, provider_overrides, the negative prompt) only moves numbers, assets or the negative prompt.
+PROMPT_FIELDS: Tuple[SectionPath, ...] = (
+    ("intent",),
+    ("prompt", "primary"),
+    ("subjects",),
+    ("environment",),
+    ("lighting",),
+    ("style",),
+    ("composition", "shot"),
+    ("composition", "camera"),
+    ("color", "palette"),
+)
+
+_MISSING = object()
+
+
+class RewrittenPrompt(BaseModel):
+    """Structured output for a prompt-only rewrite."""
+
+    prompt: str
+
+
+def _diff(before: Any, after: Any, steps: SectionPath, changed: Dict[SectionPath, Tuple[Any, Any]]) -> None:
+    if before == after:
+        return
+    if isinstance(before, dict) and isinstance(after, dict):
+        for key in dict.fromkeys([*before, *after]):
+            _diff(before.get(key), after.get(key), steps + (key,), changed)
+        return
+    if (
+        isinstance(before, list)
+        and isinstance(after, list)
+        and len(before) == len(after)
+        and all(isinstance(item, dict) for item in before + after)
+    ):
+        for index, (old, new) in enumerate(zip(before, after)):
+            _diff(old, new, steps + (index,), changed)
+        return
+    changed[steps] = (before, after)
+
+
+def blueprint_diff(before: GeneratedPromptData, after: GeneratedPromptData) -> Dict[SectionPath, Tuple[Any, Any]]:
+    """Changed leaves between two blueprints as ``{path: (old, new)}``.
+
+    Nested models are compared field by field and lists of objects item by item when their length is
+    unchanged (``subjects[1].pose``); string lists such as ``style.keywords`` compare as a whole.
+    """
+    changed: Dict[SectionPath, Tuple[Any, Any]] = {}
+    _diff(before.model_dump(mode="json"), after.model_dump(mode="json"), (), changed)
+    return changed
+
+
+def _touches_prompt(steps: SectionPath) -> bool:
+    return any(steps[: len(prefix)] == prefix for prefix in PROMPT_FIELDS)
+
+
+def _patch(
+    current: Dict[str, Any], before: Dict[str, Any], after: Dict[str, Any], keep: Tuple[str, ...] = ()
+) -> Dict[str, Any]:
+    """Copy into ``current`` every key whose rule-based value moved between ``before`` and ``after``."""
+    patched = dict(current)
+    for key in dict.fromkeys([*before, *after]):
+        new = after.get(key, _MISSING)
+        if key in keep or before.get(key, _MISSING) == new:
+            continue
+        if new is _MISSING:
+            patched.pop(key, None)
+        else:
+            patched[key] = new
+    return patched
+
+
+@dataclass
+class ConversionDelta:
+    """The previous conversion with the deterministic part of a blueprint edit already applied."""
+
+    draft: ProviderOptimizedPayload
+    changed: List[str] = field(default_factory=list)
+    # Prompt-bearing edits as {path: {"before": ..., "after": ...}}; non-empty means the prompt needs rewriting.
+    prompt_changes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def rewrites_prompt(self) -> bool:
+        return bool(self.prompt_changes)
+
+
+class IncrementalConverter:
+    """Carry a blueprint edit over to an earlier conversion instead of converting from scratch.
+
+    The rule-based converter is run on both blueprints; every payload, recommended-setting and control-asset
+    key whose rule-based value moved is copied into the previous result, so keys the edit did not touch keep
+    whatever the LLM chose. The positive prompt is left to the caller, which only has to rewrite it when
+    :attr:`ConversionDelta.rewrites_prompt` is set.
+    """
+
+    def __init__(self, converter: RuleBasedPromptConverter) -> None:
+        self.converter = converter
+
+    def delta(
+        self,
+        previous_data: GeneratedPromptData,
+        previous_result: ProviderOptimizedPayload,
+        data: GeneratedPromptData,
+    ) -> ConversionDelta:
+        changed = blueprint_diff(previous_data, data)
+        target_model = previous_result.target_model
+        before = self.converter.convert(previous_data, target_model)
+        after = self.converter.convert(data, target_model)
+
+        payload = _patch(previous_result.payload, before.payload, after.payload, keep=("prompt",))
+        negative_prompt = previous_result.negative_prompt
+        if before.negative_prompt != after.negative_prompt:
+            negative_prompt = after.negative_prompt
+        rule_notes = set(before.notes)
+        draft = previous_result.model_copy(
+            update={
+                "negative_prompt": negative_prompt,
+                "payload": payload,
+                "recommended_settings": _patch(
+                    previous_result.recommended_settings, before.recommended_settings, after.recommended_settings
+                ),
+                "control_assets": _patch(previous_result.control_assets, before.control_assets, after.control_assets),
+                "notes": [note for note in previous_result.notes if note not in rule_notes] + after.notes,
+            }
+        )
+        return ConversionDelta(
+            draft=draft,
+            changed=[format_section_path(steps) for steps in changed],
+            prompt_changes={
+                format_section_path(steps): {"before": old, "after": new}
+                for steps, (old, new) in changed.items()
+                if _touches_prompt(steps)
+            },
+        )
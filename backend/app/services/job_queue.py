@@ -0,0 +1,353 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .settings import env_float, env_int
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session, sessionmaker
+
+    from .job_tables import QueuedJob
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_URL = "sqlite:///./jobs.db"
+TERMINAL_STATES = frozenset({"succeeded", "failed", "cancelled", "expired"})
+# Jobs looked at per claim attempt; more than one so a worker that loses a race moves on to the next job.
+_CLAIM_CANDIDATES = 8
+_LOST_WORKER = "The worker running this job stopped responding."
+
+
+@dataclass
+class ClaimedJob:
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+def _datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None
+
+
+class JobQueue:
+    """Durable queue of pipeline jobs shared by the API process and the worker processes.
+
+    The API submits jobs and reads their status; workers claim queued jobs, hold a lease on them while they
+    run (renewed by heartbeats) and record the outcome. A claim is a guarded ``UPDATE`` on a queued row, so
+    any number of worker processes can share one database without double-running a job. Failed attempts are
+    retried with exponential backoff up to ``max_attempts``; a job whose worker stops heartbeating is picked
+    up again by :meth:`sweep`, which also expires jobs not started within the TTL and deletes finished jobs
+    after the retention period. Payloads hold provider keys and images, so they are cleared as soon as a job
+    finishes.
+
+    Configured by ``JOB_QUEUE_URL`` (any SQLAlchemy URL; SQLite in the working directory by default, empty
+    to disable the job API). Methods block on the database and are meant to be run via ``asyncio.to_thread``;
+    SQLAlchemy is only imported once the queue is first used.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        *,
+        max_attempts: int = 3,
+        ttl_seconds: float = 3600.0,
+        retention_seconds: float = 86400.0,
+        lease_seconds: float = 60.0,
+        retry_backoff: float = 2.0,
+    ) -> None:
+        self.url = url
+        self.enabled = bool(url)
+        self.max_attempts = max_attempts
+        self.ttl_seconds = ttl_seconds
+        self.retention_seconds = retention_seconds
+        self.lease_seconds = lease_seconds
+        self.retry_backoff = retry_backoff
+        self._engine = None
+        self._sessions: Optional["sessionmaker"] = None
+        self._schema_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        url = os.getenv("JOB_QUEUE_URL", _DEFAULT_URL).strip()
+        return cls(
+            url or None,
+            max_attempts=env_int("JOB_MAX_ATTEMPTS", 3),
+            ttl_seconds=env_float("JOB_TTL", 3600.0, minimum=1.0),
+            retention_seconds=env_float("JOB_RESULT_RETENTION", 86400.0),
+            lease_seconds=env_float("JOB_LEASE_SECONDS", 60.0, minimum=1.0),
+            retry_backoff=env_float("JOB_RETRY_BACKOFF", 2.0),
+        )
+
+    def _session(self) -> "Session":
+        if self._sessions is None:
+            with self._schema_lock:
+                if self._sessions is None:
+                    from sqlalchemy.orm import sessionmaker
+
+                    self._sessions = sessionmaker(bind=self._connect(), expire_on_commit=False)
+        return self._sessions()
+
+    def _connect(self):
+        from sqlalchemy import create_engine, event
+
+        from .job_tables import Base
+
+        # SQLite waits up to ``timeout`` seconds for another process's write lock instead of failing.
+        connect_args = {"check_same_thread": False, "timeout": 30} if self.url.startswith("sqlite") else {}
+        engine = create_engine(self.url, connect_args=connect_args)
+        if engine.dialect.name == "sqlite":
+
+            @event.listens_for(engine, "connect")
+            def _sqlite_pragmas(connection, _):
+                # WAL lets status polls read while workers write.
+                cursor = connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+
+        Base.metadata.create_all(engine)
+        self._engine = engine
+        return engine
+
+    @staticmethod
+    def _status(job: "QueuedJob") -> Dict[str, Any]:
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "created_at": _datetime(job.created_at),
+            "started_at": _datetime(job.started_at),
+            "finished_at": _datetime(job.finished_at),
+            "error": job.error,
+            "result": job.result,
+        }
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        from .job_tables import QueuedJob
+
+        now = time.time()
+        job = QueuedJob(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            status="queued",
+            payload=payload,
+            attempts=0,
+            max_attempts=self.max_attempts,
+            created_at=now,
+            available_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+        with self._session() as session, session.begin():
+            session.add(job)
+        return self._status(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        from .job_tables import QueuedJob
+
+        with self._session() as session:
+            job = session.get(QueuedJob, job_id)
+            return self._status(job) if job is not None else None
+
+    def events(self, job_id: str, after_id: int = 0) -> List[Tuple[int, str, Any]]:
+        """Progress events of ``job_id`` newer than ``after_id``, oldest first, as ``(id, event, data)``."""
+        from sqlalchemy import select
+
+        from .job_tables import JobEvent
+
+        statement = (
+            select(JobEvent).where(JobEvent.job_id == job_id, JobEvent.id > after_id).order_by(JobEvent.id)
+        )
+        with self._session() as session:
+            return [(event.id, event.event, json.loads(event.data)) for event in session.scalars(statement)]
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a queued or running job (its worker notices on the next heartbeat); ``None`` if unknown."""
+        from sqlalchemy import update
+
+        from .job_tables import QueuedJob
+
+        statement = (
+            update(QueuedJob)
+            .where(QueuedJob.id == job_id, QueuedJob.status.in_(("queued", "running")))
+            .values(**self._final_values("cancelled", error="Cancelled"))
+        )
+        with self._session() as session, session.begin():
+            session.execute(statement)
+        return self.get(job_id)
+
+    def claim(self, worker: str) -> Optional[ClaimedJob]:
+        """Take the oldest runnable queued job for ``worker``, or return ``None`` when there is none."""
+        from sqlalchemy import func, select, update
+
+        from .job_tables import QueuedJob
+
+        now = time.time()
+        candidates = (
+            select(QueuedJob.id)
+            .where(QueuedJob.status == "queued", QueuedJob.available_at <= now, QueuedJob.expires_at > now)
+            .order_by(QueuedJob.available_at)
+            .limit(_CLAIM_CANDIDATES)
+        )
+        with self._session() as session:
+            job_ids = session.scalars(candidates).all()
+        for job_id in job_ids:
+            with self._session() as session, session.begin():
+                claimed = session.execute(
+                    update(QueuedJob)
+                    .where(QueuedJob.id == job_id, QueuedJob.status == "queued")
+                    .values(
+                        status="running",
+                        worker=worker,
+                        attempts=QueuedJob.attempts + 1,
+                        lease_expires_at=now + self.lease_seconds,
+                        started_at=func.coalesce(QueuedJob.started_at, now),
+                    )
+                ).rowcount
+                if claimed:
+                    job = session.get(QueuedJob, job_id)
+                    return ClaimedJob(job.id, job.kind, job.payload or {}, job.attempts, job.max_attempts)
+        return None
+
+    def _owned(self, job_id: str, worker: str):
+        from .job_tables import QueuedJob
+
+        return (QueuedJob.id == job_id, QueuedJob.status == "running", QueuedJob.worker == worker)
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """Extend the lease; ``False`` once the job is no longer this worker's to run (cancelled or reclaimed)."""
+        from sqlalchemy import update
+
+        from .job_tables import QueuedJob
+
+        statement = (
+            update(QueuedJob)
+            .where(*self._owned(job_id, worker))
+            .values(lease_expires_at=time.time() + self.lease_seconds)
+        )
+        with self._session() as session, session.begin():
+            return bool(session.execute(statement).rowcount)
+
+    def add_event(self, job_id: str, event: str, data: Dict[str, Any]) -> None:
+        """Record a progress event; best-effort, so a failed write never interrupts the job."""
+        from .job_tables import JobEvent
+
+        try:
+            with self._session() as session, session.begin():
+                session.add(
+                    JobEvent(job_id=job_id, event=event, data=json.dumps(data, default=str), created_at=time.time())
+                )
+        except Exception:
+            logger.exception("Failed to record %s event for job %s", event, job_id)
+
+    @staticmethod
+    def _final_values(status: str, *, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        return dict(
+            status=status, payload=None, result=result, error=error, finished_at=time.time(), lease_expires_at=None
+        )
+
+    def complete(
+        self,
+        job: ClaimedJob,
+        worker: str,
+        *,
+        succeeded: bool,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+    ) -> bool:
+        """Store the pipeline response; ``False`` if the job was cancelled or reclaimed meanwhile."""
+        from sqlalchemy import update
+
+        from .job_tables import QueuedJob
+
+        status = "succeeded" if succeeded else "failed"
+        statement = (
+            update(QueuedJob)
+            .where(*self._owned(job.id, worker))
+            .values(**self._final_values(status, result=result, error=error))
+        )
+        with self._session() as session, session.begin():
+            return bool(session.execute(statement).rowcount)
+
+    def fail(self, job: ClaimedJob, worker: str, error: str, *, retry_after: Optional[float] = None) -> Optional[str]:
+        """Requeue a failed attempt with backoff, or fail the job once attempts run out; returns the new status."""
+        from sqlalchemy import update
+
+        from .job_tables import QueuedJob
+
+        if job.attempts < job.max_attempts:
+            delay = retry_after if retry_after is not None else self.retry_backoff * 2 ** (job.attempts - 1)
+            status = "queued"
+            values = dict(
+                status=status, worker=None, lease_expires_at=None, error=error, available_at=time.time() + delay
+            )
+        else:
+            status = "failed"
+            values = self._final_values(status, error=error)
+        statement = update(QueuedJob).where(*self._owned(job.id, worker)).values(**values)
+        with self._session() as session, session.begin():
+            return status if session.execute(statement).rowcount else None
+
+    def sweep(self) -> Dict[str, int]:
+        """Requeue jobs whose worker stopped heartbeating, expire stale queued jobs and drop old finished ones."""
+        from sqlalchemy import delete, select, update
+
+        from .job_tables import JobEvent, QueuedJob
+
+        now = time.time()
+        lost = (QueuedJob.status == "running", QueuedJob.lease_expires_at < now)
+        with self._session() as session, session.begin():
+            requeued = session.execute(
+                update(QueuedJob)
+                .where(*lost, QueuedJob.attempts < QueuedJob.max_attempts)
+                .values(status="queued", worker=None, lease_expires_at=None, available_at=now, error=_LOST_WORKER)
+            ).rowcount
+            abandoned = session.execute(
+                update(QueuedJob)
+                .where(*lost)
+                .values(**self._final_values("failed", error=_LOST_WORKER))
+            ).rowcount
+            expired = session.execute(
+                update(QueuedJob)
+                .where(QueuedJob.status == "queued", QueuedJob.expires_at <= now)
+                .values(**self._final_values("expired", error="The job was not started before its TTL ran out."))
+            ).rowcount
+            removed = 0
+            if self.retention_seconds:
+                old = select(QueuedJob.id).where(
+                    QueuedJob.status.in_(TERMINAL_STATES), QueuedJob.finished_at < now - self.retention_seconds
+                )
+                session.execute(delete(JobEvent).where(JobEvent.job_id.in_(old)))
+                removed = session.execute(delete(QueuedJob).where(QueuedJob.id.in_(old))).rowcount
+        return {"requeued": requeued, "abandoned": abandoned, "expired": expired, "removed": removed}
+
+    def close(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            "enabled": self.enabled,
+            "max_attempts": self.max_attempts,
+            "ttl_seconds": self.ttl_seconds,
+            "retention_seconds": self.retention_seconds,
+        }
+        if not self.enabled:
+            return stats
+        from sqlalchemy import func, select
+
+        from .job_tables import QueuedJob
+
+        with self._session() as session:
+            counts = session.execute(select(QueuedJob.status, func.count()).group_by(QueuedJob.status)).all()
+        stats["jobs"] = {status: count for status, count in counts}
+        return stats
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from ..crew.progress import ProgressCallback
+from .crew_executor import CrewCapacityError
+from .image_ingest import ImageIngestError
+from .job_queue import ClaimedJob, JobQueue
+from .metrics import endpoint_scope
+from .settings import env_float, env_int
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Any, ProgressCallback], Awaitable[BaseModel]]
+# Job kind -> (request model the payload is validated against, pipeline that runs it).
+JobHandlers = Dict[str, Tuple[Type[BaseModel], JobHandler]]
+# Rejections of the request itself; another attempt would fail the same way.
+_FINAL_ERRORS = (ImageIngestError,)
+
+
+class JobWorker:
+    """Claims jobs from a :class:`JobQueue` and runs them in this process, up to ``concurrency`` at a time.
+
+    Pipelines are the same coroutines the API serves synchronous requests with, so a worker process gets the
+    same caches, crew executor and provider resilience as the API (per process). While a job runs its lease
+    is renewed every third of ``JOB_LEASE_SECONDS``; when the renewal finds the job cancelled or reclaimed,
+    the run is abandoned. Progress events are written in order and before the result, so subscribers replay
+    a complete run. A pipeline response is final even when unsuccessful (provider errors are already retried
+    by the resilience layer), as is a rejected input such as an undecodable image; other exceptions and
+    capacity rejections are retried through the queue.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: JobHandlers,
+        *,
+        name: Optional[str] = None,
+        concurrency: int = 4,
+        poll_interval: float = 0.5,
+        sweep_interval: float = 30.0,
+    ) -> None:
+        self.queue = queue
+        self.handlers = handlers
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.sweep_interval = sweep_interval
+        self._stopping: Optional[asyncio.Event] = None
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    @classmethod
+    def from_env(cls, queue: JobQueue, handlers: JobHandlers) -> "JobWorker":
+        return cls(
+            queue,
+            handlers,
+            concurrency=env_int("JOB_WORKER_CONCURRENCY", 4),
+            poll_interval=env_float("JOB_POLL_INTERVAL", 0.5, minimum=0.05),
+            sweep_interval=env_float("JOB_SWEEP_INTERVAL", 30.0, minimum=1.0),
+        )
+
+    def stop(self) -> None:
+        """Stop claiming jobs; :meth:`run` returns once the jobs already running have finished."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _wait(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        slots = asyncio.Semaphore(self.concurrency)
+        running: Set["asyncio.Task[None]"] = set()
+
+        def _finished(task: "asyncio.Task[None]") -> None:
+            running.discard(task)
+            slots.release()
+
+        next_sweep = 0.0
+        logger.info("Job worker %s started (concurrency %d)", self.name, self.concurrency)
+        while not self._stopping.is_set():
+            if time.monotonic() >= next_sweep:
+                await self._sweep()
+                next_sweep = time.monotonic() + self.sweep_interval
+            await slots.acquire()
+            job = None if self._stopping.is_set() else await self._claim()
+            if job is None:
+                slots.release()
+                await self._wait(self.poll_interval)
+                continue
+            task = asyncio.ensure_future(self._execute(job))
+            running.add(task)
+            task.add_done_callback(_finished)
+        if running:
+            await asyncio.wait(running)
+        logger.info("Job worker %s stopped", self.name)
+
+    async def _claim(self) -> Optional[ClaimedJob]:
+        try:
+            return await asyncio.to_thread(self.queue.claim, self.name)
+        except Exception:
+            logger.exception("Claiming a job failed")
+            return None
+
+    async def _sweep(self) -> None:
+        try:
+            swept = await asyncio.to_thread(self.queue.sweep)
+        except Exception:
+            logger.exception("Sweeping the job queue failed")
+            return
+        if any(swept.values()):
+            logger.info("Job queue sweep: %s", swept)
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        schema, handler = self.handlers.get(job.kind, (None, None))
+        if handler is None:
+            error = f"Unknown job kind {job.kind!r}."
+            await self._record(self.queue.complete, job, self.name, succeeded=False, result=None, error=error)
+            return
+        try:
+            request = schema.model_validate(job.payload)
+        except ValidationError as error:
+            await self._record(self.queue.complete, job, self.name, succeeded=False, result=None, error=str(error))
+            return
+
+        loop = asyncio.get_running_loop()
+        events: "asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]]" = asyncio.Queue()
+
+        def _progress(event: str, data: Dict[str, Any]) -> None:
+            # Progress fires on crew threads as well as on the loop.
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+        relay = asyncio.ensure_future(self._relay(job, events))
+        run = asyncio.ensure_future(self._run(job, handler, request, _progress))
+        abandoned = asyncio.Event()
+        heartbeat = asyncio.ensure_future(self._heartbeat(job, run, abandoned))
+        try:
+            response = await run
+        except asyncio.CancelledError:
+            if not abandoned.is_set():
+                raise
+            logger.info("Job %s was cancelled or reclaimed; abandoning it", job.id)
+            return
+        except _FINAL_ERRORS as error:
+            self.failed += 1
+            message = str(error)
+            result = {"success": False, "error": message}
+            await self._record(self.queue.complete, job, self.name, succeeded=False, result=result, error=message)
+            return
+        except CrewCapacityError as error:
+            self.retried += 1
+            await self._record(self.queue.fail, job, self.name, str(error), retry_after=error.retry_after)
+            return
+        except Exception as error:
+            logger.exception("Job %s (%s) raised on attempt %d", job.id, job.kind, job.attempts)
+            status = await self._record(self.queue.fail, job, self.name, f"{type(error).__name__}: {error}")
+            if status == "failed":
+                self.failed += 1
+            else:
+                self.retried += 1
+            return
+        finally:
+            heartbeat.cancel()
+            events.put_nowait(None)
+            await relay
+
+        self.completed += 1
+        await self._record(
+            self.queue.complete,
+            job,
+            self.name,
+            succeeded=bool(getattr(response, "success", False)),
+            result=response.model_dump(mode="json"),
+            error=getattr(response, "error", None),
+        )
+
+    async def _run(
+        self, job: ClaimedJob, handler: JobHandler, request: BaseModel, progress: ProgressCallback
+    ) -> BaseModel:
+        with endpoint_scope(f"job:{job.kind}"), tracer.span(
+            f"job:{job.kind}", kind="job", job_id=job.id, attempt=job.attempts
+        ):
+            return await handler(request, progress)
+
+    async def _relay(self, job: ClaimedJob, events: "asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]]") -> None:
+        while True:
+            item = await events.get()
+            if item is None:
+                return
+            await asyncio.to_thread(self.queue.add_event, job.id, *item)
+
+    async def _heartbeat(self, job: ClaimedJob, run: "asyncio.Future[Any]", abandoned: asyncio.Event) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                owned = await asyncio.to_thread(self.queue.heartbeat, job.id, self.name)
+            except Exception:
+                logger.exception("Renewing the lease of job %s failed", job.id)
+                continue
+            if not owned:
+                abandoned.set()
+                run.cancel()
+                return
+
+    async def _record(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # A failed write leaves the job running; its lease then runs out and the sweep retries it.
+        try:
+            return await asyncio.to_thread(method, *args, **kwargs)
+        except Exception:
+            logger.exception("Recording a job outcome failed")
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
@@ -0,0 +1,74 @@
+import importlib
+import threading
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
+
+if TYPE_CHECKING:
+    from crewai import LLM as _LLM, Agent as _Agent, Crew as _Crew, Task as _Task
+
+_lock = threading.RLock()
+_module: Optional[ModuleType] = None
+_on_load: List[Callable[[], None]] = []
+
+# Provider SDK modules that CrewAI's native clients only import on their first call.
+_FIRST_CALL_MODULES = ("openai.resources",)
+
+
+def crewai() -> ModuleType:
+    """The ``crewai`` module, imported on first use.
+
+    Importing CrewAI takes seconds (its event bus, memory backends, chromadb and the provider SDKs
+    all load with it), so the app only reaches it through this facade and workers start without it.
+    """
+    global _module
+    if _module is None:
+        with _lock:
+            if _module is None:
+                module = importlib.import_module("crewai")
+                for callback in _on_load:
+                    callback()
+                _module = module
+    return _module
+
+
+def preload() -> None:
+    """Import CrewAI and the SDK modules a first provider call would otherwise load mid-request."""
+    crewai()
+    for name in _FIRST_CALL_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+
+def on_load(callback: Callable[[], None]) -> None:
+    """Run ``callback`` once CrewAI has been imported (straight away if it already is)."""
+    with _lock:
+        if _module is None:
+            _on_load.append(callback)
+            return
+    callback()
+
+
+def is_loaded() -> bool:
+    return _module is not None
+
+
+def LLM(**kwargs: Any) -> "_LLM":
+    return crewai().LLM(**kwargs)
+
+
+def Agent(**kwargs: Any) -> "_Agent":
+    return crewai().Agent(**kwargs)
+
+
+def Task(**kwargs: Any) -> "_Task":
+    return crewai().Task(**kwargs)
+
+
+def Crew(**kwargs: Any) -> "_Crew":
+    return crewai().Crew(**kwargs)
+
+
+def sequential_process() -> Any:
+    return crewai().Process.sequential
@@ -0,0 +1,166 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .settings import env_float, env_int
+
+
+def hash_api_key(api_key: Optional[str]) -> str:
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class LLMPoolKey:
+    provider_id: str
+    model: str
+    base_url: Optional[str]
+    api_key_hash: str
+    byo_key: bool = False
+
+
+@dataclass
+class _PoolEntry:
+    idle: List[Tuple[float, Any]] = field(default_factory=list)
+    leased: int = 0
+
+
+def _reset_usage(llm: Any) -> None:
+    # Token counters live on the LLM instance; zero them so each lease reports only its own usage.
+    usage = getattr(llm, "_token_usage", None)
+    if isinstance(usage, dict):
+        for name in usage:
+            usage[name] = 0
+
+
+class LLMClientPool:
+    """Reuses LLM clients (and the HTTP connection pools inside them) across requests.
+
+    Clients are leased exclusively, so per-request token accounting stays accurate, and returned to an
+    idle list capped at ``max_idle`` per key. A leased client makes one call at a time, so it holds at most
+    one connection; sizing ``max_idle`` to the executor lane therefore bounds the connections kept per key
+    without touching the SDK clients' own limits. Idle clients older than ``idle_ttl`` seconds are dropped,
+    and at most ``max_byo_keys`` distinct caller-supplied API keys are kept warm at once. Eviction
+    listeners are told about every client the pool lets go, so caches built around a client (crew
+    templates) are dropped with it.
+    """
+
+    def __init__(self, *, idle_ttl: float, max_byo_keys: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.idle_ttl = idle_ttl
+        self.max_byo_keys = max_byo_keys
+        self._clock = clock
+        self._entries: Dict[LLMPoolKey, _PoolEntry] = {}
+        self._byo_keys: "OrderedDict[LLMPoolKey, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._eviction_listeners: List[Callable[[Any], None]] = []
+        # Clients let go under the lock; listeners are called after it is released.
+        self._dropped: List[Any] = []
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMClientPool":
+        return cls(
+            idle_ttl=env_float("LLM_POOL_IDLE_TTL", 300.0),
+            max_byo_keys=env_int("LLM_POOL_MAX_BYO_KEYS", 32, minimum=0),
+        )
+
+    def add_eviction_listener(self, listener: Callable[[Any], None]) -> None:
+        self._eviction_listeners.append(listener)
+
+    def _drop(self, llms: List[Any]) -> None:
+        self.evicted += len(llms)
+        self._dropped.extend(llms)
+
+    def _notify_dropped(self) -> None:
+        with self._lock:
+            dropped, self._dropped = self._dropped, []
+        for llm in dropped:
+            for listener in self._eviction_listeners:
+                listener(llm)
+
+    def _evict_idle(self, now: float) -> None:
+        for key, entry in list(self._entries.items()):
+            fresh = [(returned_at, llm) for returned_at, llm in entry.idle if now - returned_at < self.idle_ttl]
+            if len(fresh) < len(entry.idle):
+                self._drop([llm for returned_at, llm in entry.idle if now - returned_at >= self.idle_ttl])
+                entry.idle = fresh
+            if not entry.idle and not entry.leased:
+                del self._entries[key]
+                self._byo_keys.pop(key, None)
+
+    def _track_byo_key(self, key: LLMPoolKey) -> None:
+        self._byo_keys[key] = None
+        self._byo_keys.move_to_end(key)
+        while len(self._byo_keys) > self.max_byo_keys:
+            oldest, _ = self._byo_keys.popitem(last=False)
+            entry = self._entries.pop(oldest, None)
+            if entry is not None:
+                self._drop([llm for _, llm in entry.idle])
+
+    def _checkout(self, key: LLMPoolKey) -> Optional[Any]:
+        with self._lock:
+            self._evict_idle(self._clock())
+            if key.byo_key:
+                self._track_byo_key(key)
+            entry = self._entries.setdefault(key, _PoolEntry())
+            entry.leased += 1
+            if entry.idle:
+                self.reused += 1
+                return entry.idle.pop()[1]
+            self.created += 1
+            return None
+
+    def _checkin(self, key: LLMPoolKey, llm: Any, max_idle: int) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # The key was evicted while leased (BYO cap); let this client go.
+                self._drop([llm])
+                return
+            entry.leased -= 1
+            if len(entry.idle) < max_idle and (not key.byo_key or key in self._byo_keys):
+                entry.idle.append((self._clock(), llm))
+            else:
+                self._drop([llm])
+
+    def _discard(self, key: LLMPoolKey) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.leased -= 1
+
+    @contextmanager
+    def lease(self, key: LLMPoolKey, factory: Callable[[], Any], *, max_idle: int) -> Iterator[Any]:
+        llm = self._checkout(key)
+        self._notify_dropped()
+        if llm is None:
+            try:
+                llm = factory()
+            except BaseException:
+                self._discard(key)
+                raise
+        _reset_usage(llm)
+        try:
+            yield llm
+        finally:
+            self._checkin(key, llm, max_idle)
+            self._notify_dropped()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "keys": len(self._entries),
+                "byo_keys": len(self._byo_keys),
+                "idle": sum(len(entry.idle) for entry in self._entries.values()),
+                "leased": sum(entry.leased for entry in self._entries.values()),
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted,
+            }
@@ -0,0 +1,259 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from ..crew.progress import ProgressCallback
+from ..models.schemas import RequestTimings, TokenUsage
+from .tracing import tracer
+
+LABELS = ("endpoint", "provider", "model", "target_model")
+_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+REQUEST_SECONDS = Histogram(
+    "prompt_request_duration_seconds", "End-to-end request processing time.", LABELS, buckets=_LATENCY_BUCKETS
+)
+STAGE_SECONDS = Histogram(
+    "prompt_stage_duration_seconds",
+    "Wall time per pipeline stage (crew run, task, rule-based draft).",
+    LABELS + ("stage",),
+    buckets=_LATENCY_BUCKETS,
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "crew_queue_wait_seconds", "Time spent waiting for a provider lane slot.", LABELS, buckets=_LATENCY_BUCKETS
+)
+PROVIDER_CALL_SECONDS = Histogram(
+    "llm_provider_call_duration_seconds",
+    "Latency of individual provider LLM calls.",
+    LABELS + ("outcome",),
+    buckets=_LATENCY_BUCKETS,
+)
+TOKENS = Counter("llm_tokens_total", "Provider-reported tokens.", LABELS + ("kind",))
+REQUESTS = Counter(
+    "prompt_requests_total", "Requests by outcome (success, failure, validation_error, cached).", LABELS + ("outcome",)
+)
+SINGLE_FLIGHT_WAITERS = Gauge(
+    "single_flight_waiting_requests", "Requests currently waiting on a coalesced in-flight run.", ("pipeline",)
+)
+SINGLE_FLIGHT_COALESCED = Counter(
+    "single_flight_coalesced_total",
+    "Requests that joined an identical in-flight run instead of starting their own.",
+    ("pipeline",),
+)
+
+
+@dataclass(frozen=True)
+class MetricLabels:
+    endpoint: str
+    provider: str
+    model: str
+    target_model: str = ""
+
+    def values(self) -> Dict[str, str]:
+        return {
+            "endpoint": self.endpoint,
+            "provider": self.provider,
+            "model": self.model,
+            "target_model": self.target_model,
+        }
+
+
+@dataclass
+class RequestObservation:
+    """Per-request collector; stages and queue wait recorded here are exported and copied into the response."""
+
+    labels: MetricLabels
+    started_at: float = field(default_factory=time.perf_counter)
+    queue_wait: Optional[float] = None
+    stages: Dict[str, float] = field(default_factory=dict)
+    validation_error: bool = False
+
+    def stage(self, name: str, seconds: float) -> None:
+        self.stages[name] = round(self.stages.get(name, 0.0) + seconds, 4)
+        STAGE_SECONDS.labels(stage=name, **self.labels.values()).observe(seconds)
+
+    def queued(self, seconds: float) -> None:
+        self.queue_wait = round(seconds, 4)
+        QUEUE_WAIT_SECONDS.labels(**self.labels.values()).observe(seconds)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def timings(self) -> RequestTimings:
+        return RequestTimings(queue_wait=self.queue_wait, stages=dict(self.stages))
+
+    def finish(self, response: Any) -> Any:
+        """Record outcome, tokens and total time, and return ``response`` with timings filled in."""
+        elapsed = self.elapsed()
+        labels = self.labels.values()
+        if getattr(response, "cached", False):
+            outcome = "cached"
+        elif response.success:
+            outcome = "success"
+        elif self.validation_error:
+            outcome = "validation_error"
+        else:
+            outcome = "failure"
+        REQUESTS.labels(outcome=outcome, **labels).inc()
+        REQUEST_SECONDS.labels(**labels).observe(elapsed)
+        tracer.annotate(outcome=outcome, processing_ms=round(elapsed * 1000, 3))
+
+        usage: Optional[TokenUsage] = getattr(response, "token_usage", None)
+        if usage is not None:
+            TOKENS.labels(kind="prompt", **labels).inc(usage.prompt_tokens)
+            TOKENS.labels(kind="completion", **labels).inc(usage.completion_tokens)
+            TOKENS.labels(kind="cached_prompt", **labels).inc(usage.cached_prompt_tokens)
+            tracer.annotate(
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                cached_prompt_tokens=usage.cached_prompt_tokens,
+            )
+
+        return response.model_copy(
+            update={
+                "processing_time": round(elapsed, 4),
+                "timings": self.timings(),
+            }
+        )
+
+
+_endpoint: ContextVar[str] = ContextVar("metrics_endpoint", default="")
+_observation: ContextVar[Optional[RequestObservation]] = ContextVar("metrics_observation", default=None)
+
+
+@contextmanager
+def endpoint_scope(endpoint: str) -> Iterator[None]:
+    token = _endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+@contextmanager
+def observe_request(provider: str, model: str, target_model: str = "") -> Iterator[RequestObservation]:
+    """Open a per-request observation labelled with the current endpoint; visible to executor threads."""
+    observation = RequestObservation(MetricLabels(_endpoint.get() or "internal", provider, model, target_model))
+    tracer.annotate(provider=provider, model=model, target_model=target_model)
+    token = _observation.set(observation)
+    try:
+        yield observation
+    except Exception:
+        # Capacity rejections and unexpected errors never reach ``finish``.
+        REQUESTS.labels(outcome="failure", **observation.labels.values()).inc()
+        raise
+    finally:
+        _observation.reset(token)
+
+
+def current_observation() -> Optional[RequestObservation]:
+    return _observation.get()
+
+
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        with tracer.span(name, kind="stage"):
+            yield
+    finally:
+        observation = _observation.get()
+        if observation is not None:
+            observation.stage(name, time.perf_counter() - started)
+
+
+def record_validation_error() -> None:
+    observation = _observation.get()
+    if observation is not None:
+        observation.validation_error = True
+
+
+def observe_progress(progress: Optional[ProgressCallback]) -> ProgressCallback:
+    """Wrap a progress callback so ``task_finished`` events are also recorded as stage timings and task spans."""
+    observation = _observation.get()
+
+    def emit(event: str, data: Dict[str, Any]) -> None:
+        if event == "task_finished":
+            if observation is not None:
+                observation.stage(data["task"], data["elapsed"])
+            tracer.record(
+                data["task"], data["elapsed"], kind="task", agent=data.get("agent"), tokens=data.get("tokens")
+            )
+        if progress is not None:
+            progress(event, data)
+
+    return emit
+
+
+# Provider call latency comes from CrewAI's LLM call events. The event bus runs handlers on its own threads
+# but copies the emitting context, so the request observation and trace span are visible to them; start and
+# finish events are paired by call id in whichever order they are handled.
+_call_edges: Dict[str, Tuple[str, datetime, str, Dict[str, Any]]] = {}
+_call_lock = threading.Lock()
+_listeners_installed = False
+
+
+def _message_chars(messages: Any) -> int:
+    if isinstance(messages, str):
+        return len(messages)
+    return sum(len(str(message.get("content") or "")) for message in messages or [] if isinstance(message, dict))
+
+
+def _record_call_edge(
+    call_id: str, edge: str, timestamp: datetime, outcome: str = "", attributes: Optional[Dict[str, Any]] = None
+) -> None:
+    observation = _observation.get()
+    if observation is None:
+        return
+    attributes = attributes or {}
+    with _call_lock:
+        other = _call_edges.pop(call_id, None)
+        if other is None or other[0] == edge:
+            _call_edges[call_id] = (edge, timestamp, outcome, attributes)
+            return
+    started, finished = (timestamp, other[1]) if edge == "start" else (other[1], timestamp)
+    seconds = max(0.0, (finished - started).total_seconds())
+    outcome = outcome or other[2]
+    PROVIDER_CALL_SECONDS.labels(outcome=outcome, **observation.labels.values()).observe(seconds)
+    tracer.record("llm_call", seconds, kind="llm", outcome=outcome, **other[3], **attributes)
+
+
+def install_llm_listeners() -> None:
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from crewai.events import crewai_event_bus
+    from crewai.events.types.llm_events import LLMCallCompletedEvent, LLMCallFailedEvent, LLMCallStartedEvent
+
+    @crewai_event_bus.on(LLMCallStartedEvent)
+    def _on_started(_: Any, event: LLMCallStartedEvent) -> None:
+        # Sizes only: messages (and CrewAI's task names) carry user prompts and, for image description, the image.
+        attributes = {"llm_model": event.model, "message_chars": _message_chars(event.messages)}
+        _record_call_edge(event.call_id, "start", event.timestamp, attributes=attributes)
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def _on_completed(_: Any, event: LLMCallCompletedEvent) -> None:
+        usage = event.usage or {}
+        attributes = {
+            "agent": event.agent_role,
+            "finish_reason": event.finish_reason,
+            "response_chars": len(str(event.response or "")),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+        }
+        _record_call_edge(event.call_id, "end", event.timestamp, "success", attributes)
+
+    @crewai_event_bus.on(LLMCallFailedEvent)
+    def _on_failed(_: Any, event: LLMCallFailedEvent) -> None:
+        _record_call_edge(event.call_id, "end", event.timestamp, "failure", {"error": event.error})
+
+    _listeners_installed = True
+
+
+def render_latest() -> Tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
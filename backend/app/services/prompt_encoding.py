@@ -0,0 +1,30 @@
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+
+def prune_empty(value: Any) -> Any:
+    """Recursively drop ``None``, empty strings and empty lists/dicts; they carry no information for the model."""
+    if isinstance(value, dict):
+        pruned = {key: prune_empty(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        pruned_items = [prune_empty(item) for item in value]
+        return [item for item in pruned_items if item not in (None, "", [], {})]
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """Minimal, stable JSON: sorted keys, no whitespace, non-ASCII left as-is (escapes cost tokens)."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_encoding(model: BaseModel) -> str:
+    """Token-lean snapshot of a blueprint or payload for task prompts; omitted fields are schema defaults or empty."""
+    return compact_json(prune_empty(model.model_dump(mode="json", exclude_defaults=True)))
+
+
+def verbose_encoding(model: BaseModel) -> str:
+    """The previous indented, fully-populated serialisation; used as the baseline for token savings."""
+    return json.dumps(model.model_dump(mode="json"), indent=2)
@@ -1,8 +1,13 @@
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Dict, Optional, Tuple
 
-from crewai import LLM
+from . import lazy_crewai
+from .llm_pool import LLMClientPool, LLMPoolKey, hash_api_key
+from .settings import env_bool
+
+if TYPE_CHECKING:
+    from crewai import LLM
 
 
 @dataclass(frozen=True)
@@ -17,6 +22,9 @@ class ProviderConfig:
     default_base_url: Optional[str] = None
     model_env: Optional[str] = None
     requires_api_key: bool = True
+    max_concurrency: int = 4
+    max_queue: int = 32
+    timeout: float = 60.0
 
     def validate(self, api_key_override: Optional[str] = None) -> None:
         if not self.requires_api_key:
@@ -40,6 +48,52 @@ class ProviderConfig:
             return os.getenv(self.model_env, self.model)
         return self.model
 
+    def _resolve_int_setting(self, suffix: str, default: int) -> int:
+        raw_value = os.getenv(f"{self.provider_id.upper()}_{suffix}")
+        if not raw_value:
+            return default
+        try:
+            return max(1, int(raw_value))
+        except ValueError:
+            return default
+
+    def _resolve_float_setting(self, suffix: str, default: float) -> float:
+        raw_value = os.getenv(f"{self.provider_id.upper()}_{suffix}")
+        if not raw_value:
+            return default
+        try:
+            return max(0.1, float(raw_value))
+        except ValueError:
+            return default
+
+    def resolve_max_concurrency(self) -> int:
+        return self._resolve_int_setting("MAX_CONCURRENCY", self.max_concurrency)
+
+    def resolve_max_queue(self) -> int:
+        return self._resolve_int_setting("MAX_QUEUE", self.max_queue)
+
+    def resolve_timeout(self) -> float:
+        """Seconds a single provider call may take before the SDK gives up on it."""
+        return self._resolve_float_setting("TIMEOUT", self.timeout)
+
+    def resolve_rate_limits(self) -> Tuple[Optional[int], Optional[int]]:
+        """Vendor requests- and tokens-per-minute limits from ``<PROVIDER>_RPM`` / ``<PROVIDER>_TPM``, if set."""
+        limits = []
+        for suffix in ("RPM", "TPM"):
+            raw_value = os.getenv(f"{self.provider_id.upper()}_{suffix}")
+            try:
+                limits.append(max(1, int(raw_value)) if raw_value else None)
+            except ValueError:
+                limits.append(None)
+        return limits[0], limits[1]
+
+    def resolve_max_retries(self) -> Optional[int]:
+        raw_value = os.getenv(f"{self.provider_id.upper()}_MAX_RETRIES")
+        try:
+            return max(0, int(raw_value)) if raw_value else None
+        except ValueError:
+            return None
+
     def _resolve_base_url(self) -> Optional[str]:
         if self.base_url_env:
             custom_base = os.getenv(self.base_url_env)
@@ -47,9 +101,12 @@ class ProviderConfig:
                 return custom_base
         return self.default_base_url
 
-    def create_llm(self, *, api_key_override: Optional[str] = None) -> LLM:
+    def llm_kwargs(self, *, api_key_override: Optional[str] = None) -> Dict[str, Any]:
         self.validate(api_key_override)
-        llm_kwargs: Dict[str, Any] = {"model": self._resolve_model()}
+        llm_kwargs: Dict[str, Any] = {"model": self._resolve_model(), "timeout": self.resolve_timeout()}
+        max_retries = self.resolve_max_retries()
+        if max_retries is not None:
+            llm_kwargs["max_retries"] = max_retries
 
         if api_key_override:
             llm_kwargs["api_key"] = api_key_override
@@ -62,7 +119,10 @@ class ProviderConfig:
         if base_url:
             llm_kwargs["base_url"] = base_url
 
-        return LLM(**llm_kwargs)
+        return llm_kwargs
+
+    def create_llm(self, *, api_key_override: Optional[str] = None) -> "LLM":
+        return lazy_crewai.LLM(**self.llm_kwargs(api_key_override=api_key_override))
 
 
 class ProviderConfigurationService:
@@ -76,18 +136,21 @@ class ProviderConfigurationService:
                 model="openai/gpt-4.1-mini",
                 api_key_env="OPENAI_API_KEY",
                 supports_vision=True,
+                max_concurrency=8,
             ),
             "anthropic": ProviderConfig(
                 provider_id="anthropic",
                 model="anthropic/claude-3.5-sonnet",
                 api_key_env="ANTHROPIC_API_KEY",
                 supports_vision=False,
+                max_concurrency=8,
             ),
             "google": ProviderConfig(
                 provider_id="google",
                 model="google/gemini-2.0-flash-exp",
                 api_key_env="GOOGLE_API_KEY",
                 supports_vision=True,
+                max_concurrency=8,
             ),
             "lmstudio": ProviderConfig(
                 provider_id="lmstudio",
@@ -98,8 +161,12 @@ class ProviderConfigurationService:
                 model_env="LMSTUDIO_MODEL",
                 supports_vision=False,
                 requires_api_key=False,
+                max_concurrency=1,
+                max_queue=16,
+                timeout=300.0,
             ),
         }
+        self._llm_pool = LLMClientPool.from_env()
 
     def get_provider(self, provider_id: Optional[str]) -> ProviderConfig:
         key = (provider_id or self._default_provider).lower()
@@ -145,19 +212,101 @@ class ProviderConfigurationService:
 
         return None
 
+    def model_identity(self, provider_id: Optional[str]) -> Tuple[str, str]:
+        """Return the canonical provider id and the model it currently resolves to."""
+        config = self.get_provider(provider_id)
+        return config.provider_id, config._resolve_model()
+
+    def execution_limits(self, provider_id: Optional[str]) -> Tuple[str, int, int]:
+        """Return the lane key, concurrency limit and queue bound used to schedule crew runs."""
+        config = self.get_provider(provider_id)
+        return config.provider_id, config.resolve_max_concurrency(), config.resolve_max_queue()
+
+    def rate_limits(
+        self, provider_id: Optional[str], api_keys: Optional[Dict[str, str]] = None
+    ) -> Tuple[str, Optional[int], Optional[int]]:
+        """Return the budget key (provider plus API key hash) and the RPM/TPM limits that apply to it."""
+        config = self.get_provider(provider_id)
+        api_key = self._resolve_override_key(config, api_keys)
+        if api_key is None and config.api_key_env:
+            api_key = os.getenv(config.api_key_env)
+        rpm, tpm = config.resolve_rate_limits()
+        return f"{config.provider_id}:{hash_api_key(api_key)}", rpm, tpm
+
+    def fallback_for(self, provider_id: Optional[str], *, require_vision: bool = False) -> Optional[str]:
+        """The provider named by ``<PROVIDER>_FALLBACK``, if it exists, differs and can serve the stage."""
+        config = self.get_provider(provider_id)
+        raw_value = os.getenv(f"{config.provider_id.upper()}_FALLBACK", "").strip().lower()
+        if not raw_value or raw_value == config.provider_id or raw_value not in self._providers:
+            return None
+        fallback = self._providers[raw_value]
+        if require_vision and not fallback.supports_vision:
+            return None
+        try:
+            fallback.validate()
+        except ValueError:
+            return None
+        return fallback.provider_id
+
+    def hedging_enabled(self, provider_id: Optional[str]) -> bool:
+        config = self.get_provider(provider_id)
+        return env_bool(f"{config.provider_id.upper()}_HEDGE", False)
+
+    def _resolve_config(self, provider_id: Optional[str], require_vision: bool) -> ProviderConfig:
+        config = self.get_provider(provider_id)
+        if require_vision and not config.supports_vision:
+            raise ValueError(f"Provider '{config.provider_id}' does not support vision-enabled workflows.")
+        return config
+
     def create_llm(
         self,
         provider_id: Optional[str],
         *,
         require_vision: bool = False,
         api_keys: Optional[Dict[str, str]] = None,
-    ) -> LLM:
-        config = self.get_provider(provider_id)
-        if require_vision and not config.supports_vision:
-            raise ValueError(f"Provider '{config.provider_id}' does not support vision-enabled workflows.")
+    ) -> "LLM":
+        config = self._resolve_config(provider_id, require_vision)
         override_key = self._resolve_override_key(config, api_keys)
         return config.create_llm(api_key_override=override_key)
 
+    def lease_llm(
+        self,
+        provider_id: Optional[str],
+        *,
+        require_vision: bool = False,
+        api_keys: Optional[Dict[str, str]] = None,
+    ) -> ContextManager["LLM"]:
+        """Validate the provider now and return a context manager that leases a pooled LLM for one run.
+
+        Clients are pooled per (provider, model, base URL, API key hash); at most the provider's
+        concurrency limit is kept idle per key, matching the executor lane that schedules its runs. That is
+        also the connection-pool sizing: CrewAI builds each provider's sync and async SDK clients from the
+        same ``client_params``, so no sized ``httpx`` client can be passed in, and the lane caps the calls
+        (one connection each) in flight instead.
+        """
+        config = self._resolve_config(provider_id, require_vision)
+        override_key = self._resolve_override_key(config, api_keys)
+        llm_kwargs = config.llm_kwargs(api_key_override=override_key)
+        pool_key = LLMPoolKey(
+            provider_id=config.provider_id,
+            model=llm_kwargs["model"],
+            base_url=llm_kwargs.get("base_url"),
+            api_key_hash=hash_api_key(llm_kwargs.get("api_key")),
+            byo_key=bool(override_key),
+        )
+        return self._llm_pool.lease(
+            pool_key,
+            lambda: lazy_crewai.LLM(**llm_kwargs),
+            max_idle=config.resolve_max_concurrency(),
+        )
+
+    def on_llm_evicted(self, listener: Callable[[Any], None]) -> None:
+        """Call ``listener`` with every pooled LLM client the pool drops (idle TTL, idle cap, BYO-key cap)."""
+        self._llm_pool.add_eviction_listener(listener)
+
+    def llm_pool_stats(self) -> Dict[str, Any]:
+        return self._llm_pool.stats()
+
     @property
     def default_provider(self) -> str:
         return self._default_provider
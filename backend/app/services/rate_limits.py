@@ -0,0 +1,128 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from .provider_config import ProviderConfigurationService
+from .settings import env_float
+
+
+class TokenBucket:
+    """A per-minute budget refilled continuously; the level may go negative when actual usage overshoots."""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` fits; work larger than the whole bucket waits for a full bucket."""
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+    def stats(self) -> Dict[str, float]:
+        self._refill()
+        return {"capacity": self.capacity, "available": round(self.level, 1)}
+
+
+@dataclass(frozen=True)
+class AdmissionCost:
+    """What a queued crew run will draw from its provider budget: one request and an estimated token count."""
+
+    tokens: int = 0
+    api_keys: Optional[Dict[str, str]] = None
+
+
+class RateBudget:
+    """Requests-per-minute and tokens-per-minute buckets for one provider and API key."""
+
+    def __init__(
+        self, rpm: Optional[int], tpm: Optional[int], clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.requests = TokenBucket(rpm, clock) if rpm else None
+        self.tokens = TokenBucket(tpm, clock) if tpm else None
+
+    def wait_time(self, tokens: int) -> float:
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens is not None:
+            waits.append(self.tokens.wait_time(tokens))
+        return max(waits)
+
+    def take(self, tokens: int) -> None:
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the token bucket once the provider has reported what the run really used."""
+        if self.tokens is not None and actual is not None:
+            self.tokens.take(actual - estimated)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.requests.stats() if self.requests is not None else None,
+            "tpm": self.tokens.stats() if self.tokens is not None else None,
+        }
+
+
+class RateLimiter:
+    """Budgets keyed by provider and API key hash, sized from ``<PROVIDER>_RPM`` / ``<PROVIDER>_TPM``.
+
+    Vendor limits are enforced per key, so every BYO key gets its own buckets. Budgets are scaled by
+    ``RATE_LIMIT_HEADROOM`` so admitted work stays just under the vendor's limit rather than at it.
+    """
+
+    max_budgets = 1024
+
+    def __init__(
+        self,
+        provider_service: ProviderConfigurationService,
+        *,
+        headroom: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider_service = provider_service
+        self.headroom = headroom if headroom is not None else min(1.0, env_float("RATE_LIMIT_HEADROOM", 0.9))
+        self._clock = clock
+        self._budgets: "OrderedDict[str, RateBudget]" = OrderedDict()
+
+    def budget(self, provider_id: Optional[str], api_keys: Optional[Dict[str, str]] = None) -> Optional[RateBudget]:
+        """The budget for this provider and key, or ``None`` when no limits are configured."""
+        try:
+            key, rpm, tpm = self.provider_service.rate_limits(provider_id, api_keys)
+        except ValueError:
+            return None
+        if not rpm and not tpm:
+            return None
+        budget = self._budgets.get(key)
+        if budget is None:
+            scaled_rpm = max(1, int(rpm * self.headroom)) if rpm else None
+            scaled_tpm = max(1, int(tpm * self.headroom)) if tpm else None
+            budget = RateBudget(scaled_rpm, scaled_tpm, self._clock)
+            self._budgets[key] = budget
+            if len(self._budgets) > self.max_budgets:
+                self._budgets.popitem(last=False)
+        else:
+            self._budgets.move_to_end(key)
+        return budget
+
+    def stats(self) -> Dict[str, Any]:
+        # Keys embed a truncated key hash, never the key itself.
+        return {key: budget.stats() for key, budget in self._budgets.items()}
@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional
+
+from .provider_config import ProviderConfigurationService
+from .response_cache import canonical_hash, normalise_prompt_text
+from ..models.schemas import ConvertPromptRequest, GeneratedPromptData, GeneratePromptRequest
+
+
+def canonical_blueprint(data: GeneratedPromptData) -> Dict[str, Any]:
+    """Blueprint dict with defaults and nulls dropped, so equivalent blueprints serialise identically."""
+    return data.model_dump(exclude_defaults=True, exclude_none=True)
+
+
+def generation_namespace(
+    request: GeneratePromptRequest, provider_service: ProviderConfigurationService
+) -> Optional[str]:
+    """Everything but the prompt text that a generated blueprint depends on, for similarity lookups."""
+    try:
+        provider_id, model = provider_service.model_identity(request.provider)
+    except ValueError:
+        return None
+    return canonical_hash(
+        {
+            "kind": "generate",
+            "quality": request.quality,
+            "review": request.review,
+            "provider": provider_id,
+            "model": model,
+        }
+    )
+
+
+def generation_key(request: GeneratePromptRequest, provider_service: ProviderConfigurationService) -> Optional[str]:
+    """Cache key for a text-to-blueprint request, or ``None`` when the provider is unknown."""
+    try:
+        provider_id, model = provider_service.model_identity(request.provider)
+    except ValueError:
+        return None
+    return canonical_hash(
+        {
+            "kind": "generate",
+            "prompt": normalise_prompt_text(request.prompt),
+            "quality": request.quality,
+            "review": request.review,
+            "provider": provider_id,
+            "model": model,
+        }
+    )
+
+
+def conversion_key(request: ConvertPromptRequest, provider_service: ProviderConfigurationService) -> Optional[str]:
+    """Content address for a blueprint conversion, or ``None`` when the provider is unknown.
+
+    An incremental conversion patches the caller's ``previous_result``, so its output depends on the previous
+    pair as well; it is keyed on that pair too and never lands under a full conversion's key.
+    """
+    try:
+        provider_id, model = provider_service.model_identity(request.provider)
+    except ValueError:
+        return None
+    key: Dict[str, Any] = {
+        "kind": "convert",
+        "blueprint": canonical_blueprint(request.data),
+        "target_model": request.target_model,
+        "mode": request.mode,
+        "provider": provider_id,
+        "model": model,
+    }
+    previous = request.previous_result
+    if request.previous_data is not None and previous is not None and previous.target_model == request.target_model:
+        key["previous"] = canonical_hash(
+            {"data": canonical_blueprint(request.previous_data), "result": previous.model_dump(mode="json")}
+        )
+    return canonical_hash(key)
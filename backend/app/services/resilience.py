@@ -0,0 +1,307 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple, TypeVar
+
+from .crew_executor import CrewCapacityError
+from .provider_config import ProviderConfigurationService
+from .settings import env_float, env_int
+
+R = TypeVar("R")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    window: int = 20
+    min_calls: int = 10
+    error_rate: float = 0.5
+    slow_call_seconds: float = 60.0
+    slow_call_rate: float = 0.8
+    cooldown: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "BreakerSettings":
+        return cls(
+            window=env_int("CIRCUIT_WINDOW", cls.window),
+            min_calls=env_int("CIRCUIT_MIN_CALLS", cls.min_calls),
+            error_rate=env_float("CIRCUIT_ERROR_RATE", cls.error_rate),
+            slow_call_seconds=env_float("CIRCUIT_SLOW_CALL_SECONDS", cls.slow_call_seconds),
+            slow_call_rate=env_float("CIRCUIT_SLOW_CALL_RATE", cls.slow_call_rate),
+            cooldown=env_float("CIRCUIT_COOLDOWN", cls.cooldown),
+        )
+
+
+class CircuitBreaker:
+    """Per-provider breaker over the last ``window`` calls.
+
+    Opens when the share of failed calls or of calls slower than ``slow_call_seconds`` crosses its
+    threshold. After ``cooldown`` a single probe is let through (half-open); its outcome closes the
+    circuit or opens it again. Like the executor lanes, it is only touched from the event loop.
+    """
+
+    def __init__(self, name: str, settings: BreakerSettings, clock: Callable[[], float] = time.monotonic) -> None:
+        self.name = name
+        self.settings = settings
+        self._clock = clock
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=settings.window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.settings.cooldown:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record(self, seconds: float, failed: bool) -> None:
+        slow = seconds >= self.settings.slow_call_seconds
+        if self.state == HALF_OPEN:
+            if failed or slow:
+                self._open()
+            else:
+                self._state = CLOSED
+                self._outcomes.clear()
+            self._probing = False
+            return
+        self._outcomes.append((failed, slow))
+        if self._state == CLOSED and self._should_trip():
+            self._open()
+
+    def abandon(self, seconds: float) -> None:
+        """An attempt was cancelled before it finished; only its elapsed time is known."""
+        if self.state == HALF_OPEN:
+            self._probing = False
+        elif seconds >= self.settings.slow_call_seconds:
+            self.record(seconds, failed=False)
+
+    def retry_after(self) -> int:
+        if self._state != OPEN:
+            return 1
+        return max(1, math.ceil(self.settings.cooldown - (self._clock() - self._opened_at)))
+
+    def _should_trip(self) -> bool:
+        calls = len(self._outcomes)
+        if calls < self.settings.min_calls:
+            return False
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        return failures / calls >= self.settings.error_rate or slow_calls / calls >= self.settings.slow_call_rate
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self.trips += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "calls": len(self._outcomes),
+            "failures": sum(1 for failed, _ in self._outcomes if failed),
+            "slow_calls": sum(1 for _, slow in self._outcomes if slow),
+            "trips": self.trips,
+        }
+
+
+class LatencyWindow:
+    """Recent successful run durations for one provider and stage."""
+
+    def __init__(self, size: int = 200) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(percentile / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class _Attempt:
+    __slots__ = ("provider_failed",)
+
+    def __init__(self) -> None:
+        self.provider_failed = False
+
+
+_attempt: ContextVar[Optional[_Attempt]] = ContextVar("provider_attempt", default=None)
+
+
+def record_provider_failure() -> None:
+    """Mark the current attempt as failed at the provider (timeouts, API errors), as opposed to bad input."""
+    attempt = _attempt.get()
+    if attempt is not None:
+        attempt.provider_failed = True
+
+
+def _succeeded(result: Any) -> bool:
+    return bool(getattr(result, "success", True))
+
+
+class ProviderResilience:
+    """Circuit breaking and hedging for provider-bound stages.
+
+    A stage whose provider circuit is open runs on the provider's configured fallback
+    (``<PROVIDER>_FALLBACK``) or is rejected with a 503. With ``<PROVIDER>_HEDGE`` enabled, a stage
+    still running after the provider's observed p95 for that stage is fired at the fallback as well;
+    the first successful result wins and the other attempt is cancelled. Cancelling stops the wait,
+    not the worker thread, which keeps its executor slot until the provider call returns or times
+    out (``<PROVIDER>_TIMEOUT``).
+    """
+
+    def __init__(
+        self,
+        provider_service: ProviderConfigurationService,
+        *,
+        settings: Optional[BreakerSettings] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider_service = provider_service
+        self.settings = settings or BreakerSettings.from_env()
+        self.hedge_percentile = hedge_percentile or env_float("HEDGE_PERCENTILE", 95.0, minimum=1.0)
+        self.hedge_min_samples = hedge_min_samples or env_int("HEDGE_MIN_SAMPLES", 20)
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[Tuple[str, str], LatencyWindow] = {}
+        self._counters: Dict[str, int] = {"hedged": 0, "hedge_wins": 0, "fallbacks": 0, "rejected": 0}
+
+    def breaker(self, provider_id: str) -> CircuitBreaker:
+        breaker = self._breakers.get(provider_id)
+        if breaker is None:
+            breaker = CircuitBreaker(provider_id, self.settings, self._clock)
+            self._breakers[provider_id] = breaker
+        return breaker
+
+    def _latency(self, provider_id: str, stage: str) -> LatencyWindow:
+        window = self._latencies.get((provider_id, stage))
+        if window is None:
+            window = LatencyWindow()
+            self._latencies[(provider_id, stage)] = window
+        return window
+
+    def hedge_delay(self, provider_id: str, stage: str) -> Optional[float]:
+        window = self._latency(provider_id, stage)
+        if len(window) < self.hedge_min_samples:
+            return None
+        return window.percentile(self.hedge_percentile)
+
+    async def _attempt(self, provider_id: str, stage: str, call: Callable[[str], Awaitable[R]]) -> R:
+        breaker = self.breaker(provider_id)
+        attempt = _Attempt()
+        _attempt.set(attempt)
+        started = self._clock()
+        try:
+            result = await call(provider_id)
+        except CrewCapacityError:
+            # Local backpressure says nothing about the provider's health.
+            breaker.abandon(0.0)
+            raise
+        except asyncio.CancelledError:
+            breaker.abandon(self._clock() - started)
+            raise
+        except Exception:
+            breaker.record(self._clock() - started, failed=True)
+            raise
+        elapsed = self._clock() - started
+        breaker.record(elapsed, failed=attempt.provider_failed)
+        if _succeeded(result):
+            self._latency(provider_id, stage).add(elapsed)
+        return result
+
+    async def run(
+        self,
+        stage: str,
+        provider: Optional[str],
+        call: Callable[[str], Awaitable[R]],
+        *,
+        require_vision: bool = False,
+        hedge: bool = True,
+    ) -> R:
+        """Run ``call(provider_id)`` for ``stage`` under the provider's breaker, falling back or hedging as configured."""
+        try:
+            primary = self.provider_service.model_identity(provider)[0]
+        except ValueError:
+            # Unknown providers fail inside the crew with a helpful message.
+            return await call(provider)
+        fallback = self.provider_service.fallback_for(primary, require_vision=require_vision)
+
+        if not self.breaker(primary).allow():
+            if fallback is not None and self.breaker(fallback).allow():
+                self._counters["fallbacks"] += 1
+                return await asyncio.ensure_future(self._attempt(fallback, stage, call))
+            self._counters["rejected"] += 1
+            raise CrewCapacityError(
+                f"Provider '{primary}' is temporarily unavailable after repeated failures.",
+                status_code=503,
+                retry_after=self.breaker(primary).retry_after(),
+            )
+
+        # Each attempt runs in its own task so its failure marker lives in that task's context.
+        primary_task = asyncio.ensure_future(self._attempt(primary, stage, call))
+        delay = None
+        if hedge and fallback is not None and self.provider_service.hedging_enabled(primary):
+            delay = self.hedge_delay(primary, stage)
+        if delay is None:
+            return await primary_task
+
+        pending: Set["asyncio.Future[R]"] = {primary_task}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not self.breaker(fallback).allow():
+                return await primary_task
+            hedge_task = asyncio.ensure_future(self._attempt(fallback, stage, call))
+            pending.add(hedge_task)
+            self._counters["hedged"] += 1
+            return await self._first_success(pending, primary_task)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _first_success(self, pending: Set["asyncio.Future[R]"], primary_task: "asyncio.Future[R]") -> R:
+        """Wait for the first successful attempt; if none succeeds, surface the primary's outcome."""
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                pending.discard(task)
+                if task.exception() is None and _succeeded(task.result()):
+                    if task is not primary_task:
+                        self._counters["hedge_wins"] += 1
+                    return task.result()
+        return primary_task.result()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counters,
+            "breakers": {provider_id: breaker.stats() for provider_id, breaker in self._breakers.items()},
+            "p95": {
+                f"{provider_id}:{stage}": window.percentile(95)
+                for (provider_id, stage), window in self._latencies.items()
+            },
+        }
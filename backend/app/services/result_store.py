@@ -0,0 +1,210 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .settings import env_float
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_URL = "sqlite:///./prompt_results.db"
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return value
+
+
+class ResultStore:
+    """Durable record of successful results, used as a warm second-tier cache and for history.
+
+    Configured by ``RESULT_STORE_URL`` (any SQLAlchemy URL; SQLite in the working directory by
+    default, empty to disable) and ``RESULT_STORE_TTL`` (seconds a stored result may answer a
+    cache lookup; 0 keeps them indefinitely). Writes go through one background thread so requests
+    never wait on the database; lookups and history pages are meant to be run via ``asyncio.to_thread``.
+    SQLAlchemy and the table definitions are only imported once the store is first used.
+    """
+
+    def __init__(self, url: Optional[str], *, ttl_seconds: float = 0.0) -> None:
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.enabled = bool(url)
+        self._engine = None
+        self._sessions: Optional["sessionmaker"] = None
+        self._schema_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-store")
+        self._counter_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultStore":
+        url = os.getenv("RESULT_STORE_URL", _DEFAULT_URL).strip()
+        return cls(url or None, ttl_seconds=env_float("RESULT_STORE_TTL", 0.0))
+
+    def _session(self) -> "Session":
+        if self._sessions is None:
+            with self._schema_lock:
+                if self._sessions is None:
+                    from sqlalchemy.orm import sessionmaker
+
+                    self._sessions = sessionmaker(bind=self._connect(), expire_on_commit=False)
+        return self._sessions()
+
+    def _connect(self):
+        from sqlalchemy import create_engine, event
+
+        from .result_tables import Base
+
+        connect_args = {"check_same_thread": False} if self.url.startswith("sqlite") else {}
+        engine = create_engine(self.url, connect_args=connect_args)
+        if engine.dialect.name == "sqlite":
+
+            @event.listens_for(engine, "connect")
+            def _sqlite_pragmas(connection, _):
+                # WAL lets history reads proceed while the writer thread appends.
+                cursor = connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+
+        Base.metadata.create_all(engine)
+        self._engine = engine
+        return engine
+
+    def warm_up(self) -> None:
+        """Open the engine and create the schema now instead of on the first lookup."""
+        if self.enabled:
+            self._session().close()
+
+    def _count(self, name: str) -> None:
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def record(
+        self,
+        *,
+        kind: str,
+        input_hash: Optional[str],
+        provider: str,
+        model: str,
+        request: Dict[str, Any],
+        response: Any,
+        target_model: Optional[str] = None,
+        timings: Any = None,
+        processing_time: Optional[float] = None,
+    ) -> None:
+        """Queue a successful ``response`` for writing; never raises or blocks the caller."""
+        if not self.enabled or not input_hash or not getattr(response, "success", False) or response.data is None:
+            return
+        row = dict(
+            kind=kind,
+            input_hash=input_hash,
+            provider=provider,
+            model=model,
+            target_model=target_model,
+            request=request,
+            result=_dump(response.data),
+            processing_time=processing_time,
+            timings=_dump(timings),
+            token_usage=_dump(getattr(response, "token_usage", None)),
+            prompt_tokens=_dump(getattr(response, "prompt_tokens", None)),
+            created_at=datetime.now(timezone.utc),
+        )
+        self._writer.submit(self._write, row)
+
+    def _write(self, row: Dict[str, Any]) -> None:
+        try:
+            from .result_tables import StoredResult
+
+            with self._session() as session, session.begin():
+                session.add(StoredResult(**row))
+            self._count("writes")
+        except Exception:  # the store is best-effort; a failed write must not affect requests
+            self._count("errors")
+            logger.exception("Failed to persist %s result", row["kind"])
+
+    def lookup(self, input_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The newest stored result payload for ``input_hash`` within the TTL, or ``None``."""
+        if not self.enabled or not input_hash:
+            return None
+        from sqlalchemy import select
+
+        from .result_tables import StoredResult
+
+        statement = select(StoredResult.result).where(StoredResult.input_hash == input_hash)
+        if self.ttl_seconds:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+            statement = statement.where(StoredResult.created_at >= cutoff)
+        statement = statement.order_by(StoredResult.created_at.desc()).limit(1)
+        try:
+            with self._session() as session:
+                result = session.execute(statement).scalar_one_or_none()
+        except Exception:
+            self._count("errors")
+            logger.exception("Result store lookup failed")
+            return None
+        self._count("hits" if result is not None else "misses")
+        return result
+
+    def page(
+        self,
+        *,
+        limit: int,
+        before_id: Optional[int] = None,
+        kind: Optional[str] = None,
+        input_hash: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Up to ``limit`` records, newest first, strictly older than ``before_id`` (keyset pagination)."""
+        if not self.enabled:
+            return []
+        from sqlalchemy import select
+
+        from .result_tables import StoredResult
+
+        statement = select(StoredResult)
+        if before_id is not None:
+            statement = statement.where(StoredResult.id < before_id)
+        if kind:
+            statement = statement.where(StoredResult.kind == kind)
+        if input_hash:
+            statement = statement.where(StoredResult.input_hash == input_hash)
+        if since is not None:
+            statement = statement.where(StoredResult.created_at >= since)
+        if until is not None:
+            statement = statement.where(StoredResult.created_at < until)
+        statement = statement.order_by(StoredResult.id.desc()).limit(limit)
+        with self._session() as session:
+            return [row.to_dict() for row in session.scalars(statement)]
+
+    def flush(self) -> None:
+        """Wait for queued writes (used on shutdown and in tools)."""
+        self._writer.submit(lambda: None).result()
+
+    def close(self) -> None:
+        self._writer.shutdown(wait=True)
+        if self._engine is not None:
+            self._engine.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "errors": self.errors,
+                "ttl_seconds": self.ttl_seconds,
+            }
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, DateTime, Float, Index, Integer, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class StoredResult(Base):
+    """One successful generation, image description or conversion, addressed by its request key."""
+
+    __tablename__ = "prompt_results"
+    __table_args__ = (
+        Index("ix_prompt_results_input_hash_created", "input_hash", "created_at"),
+        Index("ix_prompt_results_kind_id", "kind", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(32))
+    input_hash: Mapped[str] = mapped_column(String(64))
+    provider: Mapped[str] = mapped_column(String(32))
+    model: Mapped[str] = mapped_column(String(128))
+    target_model: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    request: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    result: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    processing_time: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    timings: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    token_usage: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    prompt_tokens: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "input_hash": self.input_hash,
+            "provider": self.provider,
+            "model": self.model,
+            "target_model": self.target_model,
+            "request": self.request,
+            "result": self.result,
+            "processing_time": self.processing_time,
+            "timings": self.timings,
+            "token_usage": self.token_usage,
+            "prompt_tokens": self.prompt_tokens,
+            "created_at": self.created_at.isoformat(),
+        }
@@ -0,0 +1,432 @@
+import copy
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..models.schemas import GeneratedPromptData, ProviderOptimizedPayload
+
+PROMPT_WORD_BUDGET = 100
+
+# Canonical sampler ids keyed by their normalised spelling (lower-case, alphanumerics only).
+_SAMPLER_ALIASES: Dict[str, str] = {
+    "euler": "euler",
+    "eulera": "euler_ancestral",
+    "eulerancestral": "euler_ancestral",
+    "eulerancestralkarras": "euler_ancestral",
+    "heun": "heun",
+    "lms": "lms",
+    "ddim": "ddim",
+    "unipc": "unipc",
+    "dpm2m": "dpmpp_2m",
+    "dpmpp2m": "dpmpp_2m",
+    "dpm2mkarras": "dpmpp_2m",
+    "dpmpp2mkarras": "dpmpp_2m",
+    "dpm2msde": "dpmpp_2m_sde",
+    "dpmpp2msde": "dpmpp_2m_sde",
+    "dpm2msdekarras": "dpmpp_2m_sde",
+    "dpmpp2msdekarras": "dpmpp_2m_sde",
+    "dpmsdekarras": "dpmpp_2m_sde",
+    "dpmppsde": "dpmpp_2m_sde",
+    "dpmsde": "dpmpp_2m_sde",
+}
+
+_SAMPLER_LABELS: Dict[str, str] = {
+    "euler": "Euler",
+    "euler_ancestral": "Euler Ancestral",
+    "heun": "Heun",
+    "lms": "LMS",
+    "ddim": "DDIM",
+    "unipc": "UniPC",
+    "dpmpp_2m": "DPM++ 2M",
+    "dpmpp_2m_sde": "DPM++ 2M SDE",
+}
+
+_FILLER_WORDS = {
+    "very", "really", "extremely", "incredibly", "truly", "quite", "highly", "super", "absolutely", "totally",
+}
+
+
+@dataclass(frozen=True)
+class TargetProfile:
+    """Numeric envelope and naming conventions for one conversion target."""
+
+    target_model: str
+    model_identifier: str
+    long_edge: int
+    dimension_range: Tuple[int, int]
+    dimension_multiple: int
+    steps: int
+    steps_range: Tuple[int, int]
+    guidance: float
+    guidance_range: Tuple[float, float]
+    guidance_key: str
+    sampler: str
+    samplers: Tuple[str, ...]
+    scheduler: str
+    schedulers: Tuple[str, ...]
+    max_images: int = 4
+    prompt_directives: Tuple[str, ...] = ()
+    base_negatives: Tuple[str, ...] = ()
+    payload_defaults: Dict[str, Any] = field(default_factory=dict)
+    # Keys under ``provider_overrides`` that address this target, normalised like _override_key; the blueprint
+    # schema uses the model family ("flux", "wan") rather than the versioned target id.
+    override_keys: Tuple[str, ...] = ()
+
+
+TARGET_PROFILES: Dict[str, TargetProfile] = {
+    "flux.1": TargetProfile(
+        target_model="flux.1",
+        model_identifier="black-forest-labs/FLUX.1-dev",
+        long_edge=1024,
+        dimension_range=(256, 2048),
+        dimension_multiple=16,
+        steps=28,
+        steps_range=(20, 50),
+        guidance=3.5,
+        guidance_range=(1.0, 10.0),
+        guidance_key="guidance_scale",
+        sampler="euler_ancestral",
+        samplers=("euler", "euler_ancestral", "ddim", "dpmpp_2m"),
+        scheduler="flow",
+        schedulers=("flow", "ddim"),
+        prompt_directives=("cinematic realism", "balanced high-frequency detail"),
+        override_keys=("flux1", "flux"),
+    ),
+    "wan-2.2": TargetProfile(
+        target_model="wan-2.2",
+        model_identifier="Wan-AI/Wan2.2-T2V-A14B",
+        long_edge=1280,
+        dimension_range=(512, 1536),
+        dimension_multiple=16,
+        steps=32,
+        steps_range=(30, 36),
+        guidance=6.5,
+        guidance_range=(6.0, 7.0),
+        guidance_key="guidance_scale",
+        sampler="dpmpp_2m",
+        samplers=("dpmpp_2m", "dpmpp_2m_sde", "euler", "euler_ancestral", "ddim", "unipc"),
+        scheduler="karras",
+        schedulers=("karras", "ddim"),
+        prompt_directives=("photorealistic", "true-to-life skin, fabric and material textures"),
+        base_negatives=("waxy skin", "banding", "extra digits", "warped limbs"),
+        # Wan 2.2 has no separate text-to-image checkpoint; a still is a single-frame text-to-video render.
+        payload_defaults={"num_frames": 1},
+        override_keys=("wan22", "wan"),
+    ),
+    "sdxl": TargetProfile(
+        target_model="sdxl",
+        model_identifier="stabilityai/stable-diffusion-xl-base-1.0",
+        long_edge=1024,
+        dimension_range=(512, 2048),
+        dimension_multiple=8,
+        steps=30,
+        steps_range=(20, 60),
+        guidance=7.0,
+        guidance_range=(3.0, 12.0),
+        guidance_key="cfg_scale",
+        sampler="dpmpp_2m",
+        samplers=("dpmpp_2m", "dpmpp_2m_sde", "euler", "euler_ancestral", "ddim", "heun", "lms", "unipc"),
+        scheduler="karras",
+        schedulers=("karras", "normal", "exponential", "ddim"),
+        payload_defaults={
+            "refiner": {
+                "model": "stabilityai/stable-diffusion-xl-refiner-1.0",
+                "switch_at": 0.8,
+                "steps": 10,
+            },
+        },
+        override_keys=("sdxl",),
+    ),
+}
+
+
+def _override_key(key: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", key.lower())
+
+
+def _clamp(value: float, bounds: Tuple[float, float]) -> float:
+    low, high = bounds
+    return max(low, min(high, value))
+
+
+def _normalise_sampler(raw: str) -> Tuple[Optional[str], bool]:
+    """Map a free-text sampler name onto a canonical id, reporting whether it implied Karras sigmas."""
+    compact = re.sub(r"[^a-z0-9]", "", raw.lower())
+    return _SAMPLER_ALIASES.get(compact), "karras" in compact
+
+
+def _parse_aspect_ratio(raw: Optional[str]) -> Optional[float]:
+    if not raw:
+        return None
+    match = re.search(r"(\d+(?:\.\d+)?)\s*[:x/]\s*(\d+(?:\.\d+)?)", raw)
+    if not match:
+        return None
+    width, height = float(match.group(1)), float(match.group(2))
+    if width <= 0 or height <= 0:
+        return None
+    return width / height
+
+
+def _dedupe(items: Iterable[str]) -> List[str]:
+    seen = set()
+    unique: List[str] = []
+    for item in items:
+        cleaned = item.strip().strip(",;.").strip()
+        key = cleaned.lower()
+        if cleaned and key not in seen:
+            seen.add(key)
+            unique.append(cleaned)
+    return unique
+
+
+def _plain(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s-]", " ", text.lower()).split())
+
+
+def condense_prompt(clauses: Iterable[str], budget: int = PROMPT_WORD_BUDGET) -> str:
+    """Join prompt clauses in priority order, dropping filler words, repeats and anything past ``budget`` words."""
+    kept: List[str] = []
+    used = 0
+    seen_text = " "
+    for clause in _dedupe(clauses):
+        words = [word for word in clause.split() if word.lower().strip(",.") not in _FILLER_WORDS]
+        if not words:
+            continue
+        text = " ".join(words)
+        if f" {_plain(text)} " in seen_text:
+            continue
+        remaining = budget - used
+        if remaining <= 0:
+            break
+        if len(words) > remaining:
+            if kept:
+                continue
+            text = " ".join(words[:remaining]).rstrip(",;")
+            words = words[:remaining]
+        kept.append(text)
+        used += len(words)
+        seen_text += f"{_plain(text)} "
+    return ", ".join(kept)
+
+
+class RuleBasedPromptConverter:
+    """Deterministic GeneratedPromptData -> ProviderOptimizedPayload mapping; no LLM involved."""
+
+    def __init__(self, profiles: Optional[Dict[str, TargetProfile]] = None) -> None:
+        self.profiles = profiles or TARGET_PROFILES
+
+    def profile_for(self, target_model: str) -> TargetProfile:
+        key = target_model.lower()
+        if key not in self.profiles:
+            raise ValueError(f"Unsupported conversion target '{target_model}'.")
+        return self.profiles[key]
+
+    def _dimensions(self, profile: TargetProfile, data: GeneratedPromptData, notes: List[str]) -> Tuple[int, int]:
+        width, height = data.params.width, data.params.height
+        requested = {"width": width, "height": height}
+        if not width or not height:
+            ratio = _parse_aspect_ratio(data.composition.aspect_ratio)
+            if width and not height:
+                height = round(width / ratio) if ratio else width
+            elif height and not width:
+                width = round(height * ratio) if ratio else height
+            else:
+                ratio = ratio or 1.0
+                if ratio >= 1:
+                    width, height = profile.long_edge, round(profile.long_edge / ratio)
+                else:
+                    width, height = round(profile.long_edge * ratio), profile.long_edge
+
+        multiple = profile.dimension_multiple
+        resolved: List[int] = []
+        for label, value in (("width", width), ("height", height)):
+            clamped = int(_clamp(value, profile.dimension_range))
+            snapped = max(multiple, int(round(clamped / multiple)) * multiple)
+            if requested[label] and snapped != value:
+                notes.append(f"{label} adjusted from {value} to {snapped} for {profile.target_model}.")
+            resolved.append(snapped)
+        return resolved[0], resolved[1]
+
+    def _sampler(self, profile: TargetProfile, raw: Optional[str], notes: List[str]) -> Tuple[str, str]:
+        scheduler = profile.scheduler
+        if not raw:
+            return profile.sampler, scheduler
+        sampler, karras = _normalise_sampler(raw)
+        if karras and "karras" in profile.schedulers:
+            scheduler = "karras"
+        if sampler == "ddim" and "ddim" in profile.schedulers:
+            scheduler = "ddim"
+        if sampler not in profile.samplers:
+            notes.append(
+                f"Sampler '{raw}' is not supported for {profile.target_model}; "
+                f"using {_SAMPLER_LABELS[profile.sampler]}."
+            )
+            return profile.sampler, profile.scheduler
+        return sampler, scheduler
+
+    def _numeric(
+        self,
+        label: str,
+        value: Optional[float],
+        default: float,
+        bounds: Tuple[float, float],
+        profile: TargetProfile,
+        notes: List[str],
+    ) -> float:
+        if value is None:
+            return default
+        clamped = _clamp(value, bounds)
+        if clamped != value:
+            notes.append(f"{label} {value} is outside the {profile.target_model} range {bounds[0]}-{bounds[1]}; using {clamped}.")
+        return clamped
+
+    @staticmethod
+    def _control_assets(data: GeneratedPromptData) -> Dict[str, Any]:
+        controls = data.controls
+        assets: Dict[str, Any] = {}
+        if controls.image_prompts:
+            assets["image_prompts"] = [
+                {
+                    "uri": item.uri,
+                    "weight": _clamp(item.weight, (0.0, 2.0)) if item.weight is not None else 1.0,
+                    "type": item.type or "ip_adapter",
+                }
+                for item in controls.image_prompts
+            ]
+        if controls.control_nets:
+            assets["control_nets"] = [
+                {
+                    "type": item.type,
+                    "image_uri": item.image_uri,
+                    "weight": _clamp(item.weight, (0.0, 2.0)) if item.weight is not None else 1.0,
+                    "start": _clamp(item.start, (0.0, 1.0)) if item.start is not None else 0.0,
+                    "end": _clamp(item.end, (0.0, 1.0)) if item.end is not None else 1.0,
+                }
+                for item in controls.control_nets
+            ]
+        if controls.loras:
+            assets["loras"] = [
+                {"name": item.name, "weight": _clamp(item.weight, (-2.0, 2.0)) if item.weight is not None else 1.0}
+                for item in controls.loras
+            ]
+        return assets
+
+    @staticmethod
+    def prompt_clauses(profile: TargetProfile, data: GeneratedPromptData) -> List[str]:
+        """Positive-prompt clauses in priority order: subject, style, environment, lighting, then technical cues."""
+        clauses: List[str] = []
+        if data.prompt.primary:
+            clauses.extend(part for part in re.split(r"(?<=[.;])\s+", data.prompt.primary) if part)
+        elif data.intent:
+            clauses.append(data.intent)
+        for subject in data.subjects:
+            summary = " ".join(part for part in (subject.age, subject.role) if part)
+            if subject.wardrobe:
+                summary = f"{summary} wearing {subject.wardrobe}" if summary else subject.wardrobe
+            details = [summary, subject.pose, subject.mood]
+            clauses.extend(part for part in details if part)
+        style_parts = [data.style.medium, *data.style.keywords, *data.style.aesthetic_bias]
+        clauses.extend(part for part in style_parts if part)
+        if data.environment:
+            clauses.append(data.environment)
+        if data.lighting:
+            clauses.append(data.lighting)
+        camera = data.composition.camera
+        clauses.extend(
+            part
+            for part in (data.composition.shot, camera.angle, camera.lens, camera.framing, camera.depth_of_field)
+            if part
+        )
+        if data.color.palette:
+            clauses.append(data.color.palette)
+        clauses.extend(profile.prompt_directives)
+        return clauses
+
+    @staticmethod
+    def _negative_prompt(profile: TargetProfile, data: GeneratedPromptData) -> Optional[str]:
+        negatives = [data.prompt.negative] if data.prompt.negative else []
+        existing = (data.prompt.negative or "").lower()
+        negatives.extend(term for term in profile.base_negatives if term not in existing)
+        return ", ".join(negatives) or None
+
+    @staticmethod
+    def _overrides(profile: TargetProfile, data: GeneratedPromptData) -> Dict[str, Any]:
+        """The blueprint's overrides for ``profile``, preferring its versioned key ("flux1") to the family ("flux")."""
+        candidates = {
+            _override_key(key): value for key, value in data.provider_overrides.items() if isinstance(value, dict)
+        }
+        for key in profile.override_keys:
+            if candidates.get(key):
+                return copy.deepcopy(candidates[key])
+        return {}
+
+    def convert(self, data: GeneratedPromptData, target_model: str) -> ProviderOptimizedPayload:
+        profile = self.profile_for(target_model)
+        notes: List[str] = []
+        params = data.params
+
+        width, height = self._dimensions(profile, data, notes)
+        steps = int(self._numeric("steps", params.steps, profile.steps, profile.steps_range, profile, notes))
+        guidance = round(
+            self._numeric("guidance", params.guidance, profile.guidance, profile.guidance_range, profile, notes), 2
+        )
+        sampler, scheduler = self._sampler(profile, params.sampler, notes)
+        images = int(_clamp(params.images or 1, (1, profile.max_images)))
+
+        prompt = condense_prompt(self.prompt_clauses(profile, data))
+        negative_prompt = self._negative_prompt(profile, data)
+
+        payload: Dict[str, Any] = {
+            "prompt": prompt,
+            "negative_prompt": negative_prompt,
+            "width": width,
+            "height": height,
+            "steps": steps,
+            profile.guidance_key: guidance,
+            "sampler": _SAMPLER_LABELS[sampler],
+            "scheduler": scheduler,
+            "num_images": images,
+        }
+        if params.seed is not None:
+            payload["seed"] = params.seed
+        payload.update(copy.deepcopy(profile.payload_defaults))
+
+        recommended: Dict[str, Any] = {
+            "steps": steps,
+            "steps_range": list(profile.steps_range),
+            profile.guidance_key: guidance,
+            "guidance_range": list(profile.guidance_range),
+            "sampler": _SAMPLER_LABELS[sampler],
+            "scheduler": scheduler,
+            "resolution": f"{width}x{height}",
+        }
+
+        upscale = data.post.upscale
+        if upscale.mode or upscale.strength is not None:
+            strength = round(_clamp(upscale.strength, (0.0, 1.0)), 2) if upscale.strength is not None else 0.35
+            if profile.target_model == "sdxl":
+                payload["hi_res_fix"] = {"enabled": True, "upscaler": upscale.mode or "latent", "scale": 1.5}
+                payload["denoising_strength"] = strength
+                recommended["denoising_strength"] = strength
+            else:
+                recommended["upscale"] = {"mode": upscale.mode or "latent", "strength": strength}
+        if data.post.face_restore is not None:
+            recommended["face_restore"] = data.post.face_restore
+        if data.safety.allow_nsfw is not None:
+            recommended["allow_nsfw"] = data.safety.allow_nsfw
+
+        overrides = self._overrides(profile, data)
+        if overrides:
+            payload.update(overrides)
+            notes.append(f"Applied provider_overrides for {profile.target_model}: {', '.join(sorted(overrides))}.")
+
+        return ProviderOptimizedPayload(
+            target_model=profile.target_model,
+            model_identifier=profile.model_identifier,
+            prompt=payload["prompt"],
+            negative_prompt=payload["negative_prompt"],
+            payload=payload,
+            recommended_settings=recommended,
+            control_assets=self._control_assets(data),
+            notes=notes,
+        )
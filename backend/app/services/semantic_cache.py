@@ -0,0 +1,225 @@
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Generic, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from .resilience import LatencyWindow
+from .settings import env_float, env_int
+
+T = TypeVar("T")
+
+_STOPWORDS = frozenset("a an and as at by for from in into is it its of on or the to with".split())
+
+# Feature weights: whole words carry the meaning, adjacent word pairs catch "old man" vs "man old" phrasing
+# only weakly (pairs are order-free), and character trigrams absorb plurals and small spelling changes.
+_WORD_WEIGHT = 1.0
+_PAIR_WEIGHT = 0.6
+_TRIGRAM_WEIGHT = 0.25
+
+
+def _content_words(text: str) -> List[str]:
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in _STOPWORDS]
+
+
+def _features(text: str) -> List[Tuple[str, float]]:
+    words = _content_words(text)
+    features = [(f"w:{word}", _WORD_WEIGHT) for word in words]
+    features.extend((f"p:{' '.join(sorted(pair))}", _PAIR_WEIGHT) for pair in zip(words, words[1:]))
+    for word in words:
+        padded = f"#{word}#"
+        features.extend((f"c:{padded[i:i + 3]}", _TRIGRAM_WEIGHT) for i in range(len(padded) - 2))
+    return features
+
+
+def hashed_vector(text: str, dimensions: int) -> np.ndarray:
+    """L2-normalised hashed n-gram vector: words, unordered word pairs and character trigrams.
+
+    Each feature lands in a CRC32 bucket with a hash-derived sign, so collisions cancel out on average
+    instead of piling up. Repeated features are damped with ``1 + log(tf)``. Empty text gives a zero vector.
+    """
+    features = _features(text)
+    if not features:
+        return np.zeros(dimensions, dtype=np.float32)
+    hashes = np.fromiter((zlib.crc32(name.encode("utf-8")) for name, _ in features), dtype=np.uint32)
+    weights = np.fromiter((weight for _, weight in features), dtype=np.float32)
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+    buckets = (hashes % dimensions).astype(np.int64)
+    # Sublinear TF per (bucket, sign); a feature that repeats should not drown the rest of the prompt.
+    counts = np.bincount(buckets * 2 + (signs < 0), weights=weights, minlength=dimensions * 2)
+    damped = np.where(counts > 0, 1.0 + np.log(np.maximum(counts, 1e-9)), 0.0).reshape(dimensions, 2)
+    vector = (damped[:, 0] - damped[:, 1]).astype(np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+@dataclass
+class SemanticMatch(Generic[T]):
+    value: T
+    text: str
+    similarity: float
+
+
+class SemanticPromptCache(Generic[T]):
+    """Bounded near-duplicate cache for free-text prompts, searched by cosine similarity.
+
+    Prompts are embedded locally as hashed n-gram vectors (no model, no network) into one preallocated
+    float32 matrix stored bucket-major: a prompt sets only a few dozen of the buckets, so a lookup reads just
+    those rows of the matrix, takes their weighted sum as the cosine against every entry and partitions out
+    the top k, which keeps lookups at a few milliseconds with 100k entries. Entries are scoped by namespace
+    (provider, model and generation settings). A match at or above ``hit_threshold`` can be served as-is,
+    but only when it also has the same content words as the query, in any order: swapping one attribute
+    ("yellow raincoat" for "red raincoat") barely moves the cosine of a long prompt, so similarity alone
+    cannot tell a rewording from a different picture. Any other match at or above ``seed_threshold`` is
+    close enough to seed a new generation. When full, the least recently used entry is overwritten.
+    """
+
+    def __init__(
+        self, max_entries: int, dimensions: int = 512, hit_threshold: float = 0.9, seed_threshold: float = 0.6
+    ) -> None:
+        self.max_entries = max_entries
+        self.dimensions = dimensions
+        self.hit_threshold = hit_threshold
+        self.seed_threshold = seed_threshold
+        # One column per entry, one row per hash bucket.
+        self._vectors = np.zeros((dimensions, max_entries), dtype=np.float32)
+        self._namespaces = np.full(max_entries, -1, dtype=np.int32)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._texts: List[Optional[str]] = [None] * max_entries
+        self._words: List[Optional[FrozenSet[str]]] = [None] * max_entries
+        self._values: List[Optional[T]] = [None] * max_entries
+        self._slots: Dict[Tuple[int, str], int] = {}
+        self._namespace_ids: Dict[str, int] = {}
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+        self._latency = LatencyWindow(1000)
+        self.hits = 0
+        self.seeds = 0
+        self.misses = 0
+        self.inserts = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "SemanticPromptCache[T]":
+        return cls(
+            max_entries=env_int("SEMANTIC_CACHE_MAX_ENTRIES", 10000, minimum=0),
+            dimensions=env_int("SEMANTIC_CACHE_DIMENSIONS", 512, minimum=16),
+            hit_threshold=env_float("SEMANTIC_CACHE_HIT_THRESHOLD", 0.9),
+            seed_threshold=env_float("SEMANTIC_CACHE_SEED_THRESHOLD", 0.6),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def _key_text(text: str) -> str:
+        return " ".join(text.split()).lower()
+
+    def _namespace_id(self, namespace: str) -> int:
+        if namespace not in self._namespace_ids:
+            self._namespace_ids[namespace] = len(self._namespace_ids)
+        return self._namespace_ids[namespace]
+
+    def _touch(self, slot: int) -> None:
+        self._tick += 1
+        self._last_used[slot] = self._tick
+
+    def search(self, namespace: str, text: str, k: int = 1) -> List[SemanticMatch[T]]:
+        """Up to ``k`` entries of ``namespace`` most similar to ``text``, best first; does not touch the stats."""
+        query = hashed_vector(text, self.dimensions)
+        with self._lock:
+            return [self._match(slot, similarity) for slot, similarity in self._search(namespace, query, k)]
+
+    def _match(self, slot: int, similarity: float) -> SemanticMatch[T]:
+        return SemanticMatch(self._values[slot], self._texts[slot], similarity)
+
+    def _search(self, namespace: str, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        namespace_id = self._namespace_id(namespace)
+        buckets = np.flatnonzero(query)
+        if not self._size or not buckets.size:
+            return []
+        similarities = query[buckets] @ self._vectors[buckets, : self._size]
+        similarities[self._namespaces[: self._size] != namespace_id] = -1.0
+        k = min(k, self._size)
+        top = np.argpartition(similarities, -k)[-k:] if k < self._size else np.arange(self._size)
+        top = top[np.argsort(similarities[top])[::-1]]
+        return [(int(slot), float(similarities[slot])) for slot in top if similarities[slot] > 0]
+
+    def lookup(self, namespace: str, text: str) -> Tuple[str, Optional[SemanticMatch[T]]]:
+        """Classify the nearest entry as ``"hit"``, ``"seed"`` or ``"miss"`` and return it (``None`` on a miss)."""
+        if not self.enabled:
+            return "miss", None
+        started = time.perf_counter()
+        query = hashed_vector(text, self.dimensions)
+        words = frozenset(_content_words(text))
+        with self._lock:
+            nearest = self._search(namespace, query, 1)
+            slot, similarity = nearest[0] if nearest else (-1, 0.0)
+            if nearest and similarity >= self.hit_threshold and self._words[slot] == words:
+                outcome = "hit"
+                self.hits += 1
+            elif nearest and similarity >= self.seed_threshold:
+                outcome = "seed"
+                self.seeds += 1
+            else:
+                outcome = "miss"
+                self.misses += 1
+            match = None
+            if outcome != "miss":
+                self._touch(slot)
+                match = self._match(slot, similarity)
+            self._latency.add(time.perf_counter() - started)
+        return outcome, match
+
+    def add(self, namespace: str, text: str, value: T) -> None:
+        if not self.enabled:
+            return
+        vector = hashed_vector(text, self.dimensions)
+        if not vector.any():
+            return
+        with self._lock:
+            namespace_id = self._namespace_id(namespace)
+            key = (namespace_id, self._key_text(text))
+            slot = self._slots.get(key)
+            if slot is None:
+                if self._size < self.max_entries:
+                    slot = self._size
+                    self._size += 1
+                else:
+                    slot = int(np.argmin(self._last_used[: self._size]))
+                    self._slots.pop((int(self._namespaces[slot]), self._key_text(self._texts[slot])), None)
+                    self.evictions += 1
+                self._slots[key] = slot
+                self._vectors[:, slot] = vector
+                self._namespaces[slot] = namespace_id
+                self.inserts += 1
+            self._texts[slot] = text
+            self._words[slot] = frozenset(_content_words(text))
+            self._values[slot] = value
+            self._touch(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.seeds + self.misses
+            p50, p95 = self._latency.percentile(50), self._latency.percentile(95)
+            return {
+                "entries": self._size,
+                "max_entries": self.max_entries,
+                "dimensions": self.dimensions,
+                "hit_threshold": self.hit_threshold,
+                "seed_threshold": self.seed_threshold,
+                "hits": self.hits,
+                "seeds": self.seeds,
+                "misses": self.misses,
+                "inserts": self.inserts,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "seed_rate": self.seeds / lookups if lookups else 0.0,
+                "lookup_ms_p50": round(p50 * 1000, 3) if p50 is not None else None,
+                "lookup_ms_p95": round(p95 * 1000, 3) if p95 is not None else None,
+            }
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+from .metrics import SINGLE_FLIGHT_COALESCED, SINGLE_FLIGHT_WAITERS
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent identical calls into one shared execution.
+
+    The first caller for a key starts the call as a task; callers arriving while it runs await that same
+    task and receive its result (or its exception). Cancellation is reference-counted: a cancelled caller
+    only stops waiting, and the shared task is cancelled once no caller is left waiting on it. A key is
+    forgotten as soon as its run finishes, so later callers start afresh (and usually hit a response cache).
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._flights: Dict[str, _Flight] = {}
+        self.started = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    def _forget(self, key: str, flight: _Flight, _: "asyncio.Task[Any]") -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def run(self, key: Optional[str], call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Await ``call()`` or an identical run already in flight; returns the result and whether it was shared.
+
+        A ``None`` key opts out of coalescing.
+        """
+        if key is None:
+            return await call(), False
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda task: self._forget(key, flight, task))
+            self._flights[key] = flight
+            self.started += 1
+        else:
+            self.coalesced += 1
+            SINGLE_FLIGHT_COALESCED.labels(pipeline=self.name).inc()
+
+        flight.waiters += 1
+        SINGLE_FLIGHT_WAITERS.labels(pipeline=self.name).inc()
+        try:
+            # Shielded so that cancelling one waiter does not cancel the run the others are waiting on.
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            SINGLE_FLIGHT_WAITERS.labels(pipeline=self.name).dec()
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self.cancelled += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "waiting": sum(flight.waiters for flight in self._flights.values()),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+        }
@@ -0,0 +1,52 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Tuple
+
+from pydantic import BaseModel
+
+from .crew_executor import CrewCapacityError
+from .image_ingest import ImageIngestError
+from ..crew.progress import ProgressCallback
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def stream_with_progress(
+    run: Callable[[ProgressCallback], Awaitable[BaseModel]],
+) -> AsyncIterator[str]:
+    """Run ``run`` and relay its progress events as Server-Sent Events, finishing with a ``result`` event.
+
+    Progress callbacks fire on crew worker threads, so they are marshalled back onto the event loop
+    before being queued for the client.
+    """
+    loop = asyncio.get_running_loop()
+    events: "asyncio.Queue[Tuple[str, Dict[str, Any]]]" = asyncio.Queue()
+
+    def _progress(event: str, payload: Dict[str, Any]) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, (event, payload))
+
+    job = asyncio.ensure_future(run(_progress))
+    try:
+        while not job.done():
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, job}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield sse_event(*getter.result())
+            else:
+                getter.cancel()
+        while not events.empty():
+            yield sse_event(*events.get_nowait())
+
+        try:
+            response = job.result()
+        except CrewCapacityError as error:
+            yield sse_event("error", {"success": False, "error": str(error), "retry_after": error.retry_after})
+            return
+        except ImageIngestError as error:
+            yield sse_event("error", {"success": False, "error": str(error)})
+            return
+        yield sse_event("result", response.model_dump(mode="json"))
+    finally:
+        job.cancel()
@@ -0,0 +1,98 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+from ..models.schemas import PromptTokenAccounting
+
+_ENCODING_NAME = "cl100k_base"
+# Words, numbers and single punctuation marks; roughly how BPE tokenisers split English and JSON.
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+# A filled-in GeneratedPromptData or provider payload plus agent scaffolding; admission estimates only.
+COMPLETION_ALLOWANCE = 900
+# What a vision call is billed for one image at the ingest size limit.
+IMAGE_INPUT_TOKENS = 800
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(_ENCODING_NAME)
+    except Exception:  # pragma: no cover - encoding files may be unavailable offline
+        return None
+
+
+def estimator_name() -> str:
+    return f"tiktoken:{_ENCODING_NAME}" if _encoding() is not None else "estimate"
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Count tokens with tiktoken when installed, otherwise estimate (long words cost one token per ~4 chars)."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return sum((len(piece) + 3) // 4 if piece[0].isalnum() else 1 for piece in _TOKEN_PIECES.findall(text))
+
+
+def count_message_tokens(messages: Iterable[Dict[str, Any]]) -> int:
+    """Tokens in the text parts of chat messages; image parts are billed separately by providers."""
+    total = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            total += count_tokens(content)
+        elif isinstance(content, list):
+            total += sum(count_tokens(part.get("text")) for part in content if part.get("type") == "text")
+    return total
+
+
+def count_crew_tokens(crew: Any) -> int:
+    """Tokens in the task descriptions and agent personas we author for a crew run (excludes CrewAI scaffolding)."""
+    total = 0
+    for task in crew.tasks:
+        total += count_tokens(task.description) + count_tokens(task.expected_output)
+        if task.agent is not None:
+            total += count_tokens(f"{task.agent.role} {task.agent.goal} {task.agent.backstory}")
+    return total
+
+
+def estimate_run_tokens(instructions: Iterable[str], calls: int, extra_input_tokens: int = 0) -> int:
+    """Rough provider token cost of a run for rate-limit admission: authored text plus a completion per call."""
+    per_call = sum(count_tokens(text) for text in instructions) + extra_input_tokens + COMPLETION_ALLOWANCE
+    return calls * per_call
+
+
+def accounting(input_tokens: int, saved_tokens: int = 0) -> PromptTokenAccounting:
+    return PromptTokenAccounting(
+        input_tokens=input_tokens, saved_tokens=max(0, saved_tokens), estimator=estimator_name()
+    )
+
+
+class PromptTokenLedger:
+    """Running totals of authored prompt tokens and tokens saved by compact encoding, per pipeline."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, pipeline: str, usage: Optional[PromptTokenAccounting]) -> None:
+        if usage is None:
+            return
+        with self._lock:
+            totals = self._totals.setdefault(pipeline, {"requests": 0, "input_tokens": 0, "saved_tokens": 0})
+            totals["requests"] += 1
+            totals["input_tokens"] += usage.input_tokens
+            totals["saved_tokens"] += usage.saved_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"estimator": estimator_name(), "pipelines": {name: dict(totals) for name, totals in self._totals.items()}}
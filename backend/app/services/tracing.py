@@ -0,0 +1,278 @@
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Union
+
+from .settings import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Attribute keys whose values are never exported (matched as substrings, case-insensitively).
+_SECRET_KEYS = ("api_key", "apikey", "authorization", "password", "secret", "image_base64")
+_DATA_URL = re.compile(r"^data:[\w.+/-]+;base64,", re.IGNORECASE)
+_MAX_ITEMS = 20
+
+
+def redact(value: Any, max_chars: int, key: str = "") -> Any:
+    """JSON-safe copy of ``value`` with secrets and inline images removed and long strings and lists cut short."""
+    if key and any(marker in key.lower() for marker in _SECRET_KEYS):
+        return "[redacted]"
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        if _DATA_URL.match(value):
+            return f"[data url, {len(value)} chars]"
+        if len(value) > max_chars:
+            return f"{value[:max_chars]}... [{len(value) - max_chars} more chars]"
+        return value
+    if isinstance(value, dict):
+        return {str(name): redact(item, max_chars, str(name)) for name, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [redact(item, max_chars) for item in value[:_MAX_ITEMS]]
+        if len(value) > _MAX_ITEMS:
+            items.append(f"... [{len(value) - _MAX_ITEMS} more items]")
+        return items
+    return redact(str(value), max_chars)
+
+
+class Span:
+    """A sampled span; entering it makes it the parent of spans opened in the same context."""
+
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_id", "attributes", "status", "_start", "_started", "_token"
+    )
+
+    def __init__(
+        self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]
+    ) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self._start = time.time()
+        self._started = time.perf_counter()
+        self._token = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, _traceback) -> bool:
+        _current.reset(self._token)
+        if exc is not None:
+            self.status = "error"
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self, time.perf_counter() - self._started)
+        return False
+
+
+class _UnsampledSpan:
+    """Root of a trace that was not sampled; marks the context so nested spans are skipped too."""
+
+    __slots__ = ("_token",)
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_UnsampledSpan":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, *_: Any) -> bool:
+        _current.reset(self._token)
+        return False
+
+
+class _DisabledSpan:
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_DisabledSpan":
+        return self
+
+    def __exit__(self, *_: Any) -> bool:
+        return False
+
+
+_DISABLED = _DisabledSpan()
+_current: ContextVar[Union[Span, _UnsampledSpan, None]] = ContextVar("trace_span", default=None)
+
+AnySpan = Union[Span, _UnsampledSpan, _DisabledSpan]
+
+
+class Tracer:
+    """Sampled request tracing with buffered export off the request path.
+
+    A trace starts at the first span opened in a context (the endpoint span) and is kept with probability
+    ``TRACE_SAMPLE_RATE``; nested spans follow that decision, so unsampled requests only pay for a context
+    variable lookup. Finished spans are redacted, truncated and queued; a daemon thread appends them as
+    NDJSON to ``TRACE_FILE`` and/or POSTs them in batches to ``TRACE_COLLECTOR_URL``. When the buffer is
+    full spans are dropped rather than slowing requests down. With a zero sample rate or no destination,
+    tracing is off.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        path: Optional[str] = None,
+        collector_url: Optional[str] = None,
+        max_attribute_chars: int = 256,
+        buffer_size: int = 2048,
+        batch_size: int = 256,
+        flush_interval: float = 2.0,
+    ) -> None:
+        self.sample_rate = min(1.0, sample_rate)
+        self.path = path or None
+        self.collector_url = collector_url or None
+        self.max_attribute_chars = max_attribute_chars
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=buffer_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self.finished = 0
+        self.exported = 0
+        self.dropped = 0
+        self.export_errors = 0
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        return cls(
+            sample_rate=env_float("TRACE_SAMPLE_RATE", 0.0),
+            path=os.getenv("TRACE_FILE", "traces.ndjson").strip(),
+            collector_url=os.getenv("TRACE_COLLECTOR_URL", "").strip(),
+            max_attribute_chars=env_int("TRACE_MAX_ATTRIBUTE_CHARS", 256, minimum=16),
+            buffer_size=env_int("TRACE_BUFFER_SIZE", 2048),
+            batch_size=env_int("TRACE_BATCH_SIZE", 256),
+            flush_interval=env_float("TRACE_FLUSH_INTERVAL", 2.0, minimum=0.05),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 and bool(self.path or self.collector_url)
+
+    def span(self, name: str, **attributes: Any) -> AnySpan:
+        """A context manager for one unit of work; a root span decides whether the whole trace is sampled."""
+        parent = _current.get()
+        if parent is None:
+            if not self.enabled:
+                return _DISABLED
+            if random.random() >= self.sample_rate:
+                return _UnsampledSpan()
+            return Span(self, name, uuid.uuid4().hex, None, attributes)
+        if isinstance(parent, Span):
+            return Span(self, name, parent.trace_id, parent.span_id, attributes)
+        return _DISABLED
+
+    def record(self, name: str, seconds: float, **attributes: Any) -> None:
+        """Export a child of the current span for work that has already finished and was timed elsewhere."""
+        parent = _current.get()
+        if not isinstance(parent, Span):
+            return
+        span = Span(self, name, parent.trace_id, parent.span_id, attributes)
+        span._start = time.time() - seconds
+        self._finish(span, seconds)
+
+    def annotate(self, **attributes: Any) -> None:
+        """Add attributes to the current span, if it is sampled."""
+        parent = _current.get()
+        if isinstance(parent, Span):
+            parent.attributes.update(attributes)
+
+    def _finish(self, span: Span, seconds: float) -> None:
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "name": span.name,
+            "start": round(span._start, 6),
+            "duration_ms": round(seconds * 1000, 3),
+            "status": span.status,
+            "attributes": redact(span.attributes, self.max_attribute_chars),
+        }
+        self._ensure_exporter()
+        try:
+            self._queue.put_nowait(record)
+            self.finished += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_exporter(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self._stopping.is_set():
+                    return
+                continue
+            # Collect for up to one flush interval so a busy server writes in batches, not span by span.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = 0.0 if self._stopping.is_set() else deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._export(batch)
+
+    def _export(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as handle:
+                    handle.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+            if self.collector_url:
+                body = json.dumps({"spans": batch}, default=str).encode("utf-8")
+                request = urllib.request.Request(
+                    self.collector_url, data=body, headers={"Content-Type": "application/json"}, method="POST"
+                )
+                with urllib.request.urlopen(request, timeout=5):
+                    pass
+            self.exported += len(batch)
+        except Exception as error:  # export is best-effort; a broken sink must not affect requests
+            self.export_errors += 1
+            logger.warning("Dropped %d spans: %s", len(batch), error)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Flush queued spans and stop the exporter thread."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "finished": self.finished,
+            "exported": self.exported,
+            "dropped": self.dropped,
+            "export_errors": self.export_errors,
+            "queued": self._queue.qsize(),
+        }
+
+
+tracer = Tracer.from_env()
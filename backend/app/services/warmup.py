@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODES = ("off", "background", "blocking")
+
+WarmupStep = Tuple[str, Callable[[], Any]]
+
+
+class StartupWarmup:
+    """Optional start-up pass that pays lazy-init costs before the first request does.
+
+    ``STARTUP_WARMUP`` selects the mode: ``off`` (default) leaves everything to first use,
+    ``background`` starts serving immediately and warms up on a daemon thread, and ``blocking``
+    finishes warming up before the worker reports ready. ``WARMUP_PROVIDERS`` lists the providers whose
+    pooled clients and crew templates are prebuilt (the default provider when empty). A failing step
+    is logged and skipped; requests then build what they need as usual.
+    """
+
+    def __init__(self, mode: str = "off", providers: Optional[List[str]] = None) -> None:
+        self.mode = mode if mode in WARMUP_MODES else "off"
+        self.providers = providers or []
+        self.state = "off" if self.mode == "off" else "pending"
+        self.durations: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.elapsed: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> "StartupWarmup":
+        mode = os.getenv("STARTUP_WARMUP", "off").strip().lower()
+        providers = [item.strip() for item in os.getenv("WARMUP_PROVIDERS", "").split(",") if item.strip()]
+        return cls(mode, providers)
+
+    def run(self, steps: List[WarmupStep]) -> None:
+        self.state = "running"
+        started = time.perf_counter()
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                step()
+            except Exception as error:  # warm-up is best-effort; requests fall back to lazy init
+                self.errors[name] = str(error)
+                logger.warning("Warm-up step %s failed: %s", name, error)
+            self.durations[name] = round(time.perf_counter() - step_started, 4)
+        self.elapsed = round(time.perf_counter() - started, 4)
+        self.state = "done"
+        logger.info("Warm-up finished in %.2fs", self.elapsed)
+
+    async def start(self, steps: List[WarmupStep]) -> None:
+        """Run ``steps`` according to the configured mode; only ``blocking`` waits for them."""
+        if self.mode == "blocking":
+            await asyncio.to_thread(self.run, steps)
+        elif self.mode == "background":
+            threading.Thread(target=self.run, args=(steps,), name="warmup", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "state": self.state,
+            "elapsed": self.elapsed,
+            "steps": dict(self.durations),
+            "errors": dict(self.errors),
+        }
@@ -0,0 +1,134 @@
+"""Job worker processes.
+
+Runs the generate, describe and convert jobs submitted to ``/api/jobs/*`` in a pool of processes that share
+the API's job queue, so pipeline capacity scales separately from the web tier. Start it next to the API
+(``run.py`` does so when ``JOB_WORKER_PROCESSES`` is above zero) or on its own, from ``backend/``::
+
+    python -m app.worker --processes 4
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from multiprocessing.process import BaseProcess
+from typing import List, Optional
+
+from .services.settings import env_int
+
+logger = logging.getLogger(__name__)
+
+
+def _configure_logging() -> None:
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "info").upper(),
+        format="%(asctime)s %(processName)s %(name)s %(levelname)s %(message)s",
+    )
+
+
+def _process_main() -> None:
+    _configure_logging()
+    # Imported here so the supervising process stays small; every worker process builds its own pipelines.
+    from .main import JOB_HANDLERS, job_queue, start_pipeline_services, stop_pipeline_services
+    from .services.job_worker import JobWorker
+
+    worker = JobWorker.from_env(job_queue, JOB_HANDLERS)
+
+    async def _serve() -> None:
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, worker.stop)
+            except NotImplementedError:  # Windows
+                signal.signal(signum, lambda *_: loop.call_soon_threadsafe(worker.stop))
+        await worker.run()
+
+    start_pipeline_services()
+    try:
+        asyncio.run(_serve())
+    finally:
+        stop_pipeline_services()
+
+
+class WorkerPool:
+    """Keeps ``processes`` job worker processes running, replacing any that exit unexpectedly.
+
+    Workers are spawned rather than forked so none of the parent's threads or open connections leak into
+    them. Stopping sends SIGTERM, which lets each worker finish the jobs it is running; workers still alive
+    after ``stop_timeout`` seconds are killed and their jobs are retried once their leases run out.
+    """
+
+    def __init__(self, processes: int, *, stop_timeout: float = 30.0) -> None:
+        self.processes = processes
+        self.stop_timeout = stop_timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: List[Optional[BaseProcess]] = [None] * processes
+        self._stopping = threading.Event()
+        self.restarts = 0
+
+    def _spawn(self, index: int) -> None:
+        process = self._context.Process(target=_process_main, name=f"job-worker-{index}", daemon=True)
+        process.start()
+        self._workers[index] = process
+
+    def start(self) -> None:
+        for index in range(self.processes):
+            self._spawn(index)
+
+    def supervise(self, check_interval: float = 2.0) -> None:
+        """Block, restarting dead workers, until :meth:`stop` is called."""
+        while not self._stopping.wait(check_interval):
+            for index, process in enumerate(self._workers):
+                if process is not None and not process.is_alive() and not self._stopping.is_set():
+                    logger.warning("%s exited with code %s; restarting it", process.name, process.exitcode)
+                    self.restarts += 1
+                    self._spawn(index)
+
+    def start_in_background(self) -> threading.Thread:
+        self.start()
+        supervisor = threading.Thread(target=self.supervise, name="job-worker-pool", daemon=True)
+        supervisor.start()
+        return supervisor
+
+    def stop(self) -> None:
+        self._stopping.set()
+        alive = [process for process in self._workers if process is not None and process.is_alive()]
+        for process in alive:
+            process.terminate()
+        for process in alive:
+            process.join(self.stop_timeout)
+            if process.is_alive():
+                logger.warning("%s did not stop within %.0fs; killing it", process.name, self.stop_timeout)
+                process.kill()
+                process.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=env_int("JOB_WORKER_PROCESSES", 2),
+        help="Worker processes to run (default: JOB_WORKER_PROCESSES or 2).",
+    )
+    args = parser.parse_args()
+    _configure_logging()
+
+    pool = WorkerPool(max(1, args.processes))
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    pool.start_in_background()
+    logger.info("Started %d job worker processes", pool.processes)
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
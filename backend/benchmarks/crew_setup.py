@@ -0,0 +1,107 @@
+"""Micro-benchmark for per-request crew setup overhead.
+
+Compares building fresh Agent/Task/Crew objects for every request (the previous behaviour) with
+binding inputs to a prebuilt template from ``CrewTemplateRegistry``. No model calls are made.
+
+Run from ``backend/``::
+
+    python -m benchmarks.crew_setup --iterations 200
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from crewai import LLM
+
+from app.crew.agents import ImagePromptGenerationAgents, PromptConversionAgents
+from app.crew.tasks import ImagePromptGenerationTasks, PromptConversionTasks
+from app.crew.templates import CrewTemplateRegistry, build_sequential_crew
+from app.models.schemas import GeneratedPromptData
+
+PROMPT = "a lighthouse keeper reading by lantern light during a storm, oil painting"
+
+
+def _fresh_generation(llm: LLM) -> None:
+    agents = ImagePromptGenerationAgents(llm)
+    tasks = ImagePromptGenerationTasks()
+    drafter, editor = agents.prompt_drafter_agent(), agents.supervising_editor_agent()
+    refine = tasks.refine_prompt(drafter, PROMPT)
+    edit = tasks.edit_prompt(editor, [refine])
+    build_sequential_crew([drafter, editor], [refine, edit])
+
+
+def _fresh_conversion(llm: LLM, blueprint: str) -> None:
+    agents = PromptConversionAgents(llm)
+    tasks = PromptConversionTasks()
+    specialist, reviewer = agents.specialist_for("flux.1"), agents.conversion_reviewer_agent()
+    convert = tasks.convert_prompt(specialist, "flux.1", blueprint=blueprint)
+    review = tasks.review_conversion(reviewer, "flux.1", [convert])
+    build_sequential_crew([specialist, reviewer], [convert, review])
+
+
+def _templated(registry: CrewTemplateRegistry, llm: LLM, pipeline: str, build: Callable, inputs: dict) -> None:
+    crew = registry.get(llm, pipeline, build)
+    # The per-request work kickoff adds on top of model calls: rebinding callbacks and interpolating inputs.
+    crew.task_callback = None
+    for task in crew.tasks:
+        task.callback = None
+    crew._interpolate_inputs(inputs)
+
+
+def _measure(label: str, operation: Callable[[], None], iterations: int) -> float:
+    operation()
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+    median = statistics.median(samples)
+    print(f"{label:<28} median {median:8.3f} ms   p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:8.3f} ms")
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    llm = LLM(model="openai/gpt-4.1-mini", api_key="sk-benchmark")
+    registry = CrewTemplateRegistry()
+    blueprint = PromptConversionTasks().prompt_snapshot(GeneratedPromptData())
+
+    def generation_template():
+        agents = ImagePromptGenerationAgents(llm)
+        tasks = ImagePromptGenerationTasks()
+        drafter, editor = agents.prompt_drafter_agent(), agents.supervising_editor_agent()
+        refine = tasks.refine_prompt(drafter, "{prompt}")
+        return build_sequential_crew([drafter, editor], [refine, tasks.edit_prompt(editor, [refine])])
+
+    def conversion_template():
+        agents = PromptConversionAgents(llm)
+        tasks = PromptConversionTasks()
+        specialist, reviewer = agents.specialist_for("flux.1"), agents.conversion_reviewer_agent()
+        convert = tasks.convert_prompt(specialist, "flux.1", blueprint="{blueprint}")
+        return build_sequential_crew([specialist, reviewer], [convert, tasks.review_conversion(reviewer, "flux.1", [convert])])
+
+    print(f"{args.iterations} iterations per case\n")
+    for name, fresh, templated in (
+        (
+            "generate",
+            lambda: _fresh_generation(llm),
+            lambda: _templated(registry, llm, "generate", generation_template, {"prompt": PROMPT}),
+        ),
+        (
+            "convert",
+            lambda: _fresh_conversion(llm, blueprint),
+            lambda: _templated(registry, llm, "convert", conversion_template, {"blueprint": blueprint}),
+        ),
+    ):
+        before = _measure(f"{name}: rebuild per request", fresh, args.iterations)
+        after = _measure(f"{name}: prebuilt template", templated, args.iterations)
+        print(f"{'':<28} {before / after:.1f}x less setup\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""OpenAI-compatible stand-in server for load tests.
+
+Answers ``/v1/chat/completions`` with schema-valid ``GeneratedPromptData``, ``ProviderOptimizedPayload`` or section JSON
+after a simulated model latency, and fails a configurable share of calls. Point the ``lmstudio`` provider at it
+(``LMSTUDIO_BASE_URL=http://127.0.0.1:1234/v1`` and ``LMSTUDIO_MODEL=openai/fake-llm``) or set
+``OPENAI_BASE_URL`` for the vision path.
+
+Run from ``backend/``::
+
+    python -m benchmarks.fake_llm_server --port 1234 --latency-distribution lognormal --latency-mean 0.8
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.models.schemas import (
+    CameraSettings,
+    ColorSettings,
+    Composition,
+    GeneratedPromptData,
+    PromptTexts,
+    StyleSettings,
+    Subject,
+)
+from app.services.blueprint_sections import parse_section_path, section_values
+from app.services.prompt_encoding import compact_json
+from app.services.rule_based_conversion import RuleBasedPromptConverter
+from app.services.token_accounting import count_message_tokens, count_tokens
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+TARGET_MODELS = ("flux.1", "wan-2.2", "sdxl")
+
+SAMPLE_BLUEPRINT = GeneratedPromptData(
+    intent="moody editorial portrait",
+    prompt=PromptTexts(
+        primary="a lighthouse keeper reading by lantern light during a storm, rain-streaked window, warm glow",
+        negative="blurry, extra fingers, watermark, text",
+    ),
+    subjects=[Subject(role="lighthouse keeper", age="60s", wardrobe="wool sweater", pose="seated", mood="calm")],
+    environment="cramped lighthouse watch room at night",
+    composition=Composition(
+        camera=CameraSettings(angle="eye level", lens="50mm", framing="medium shot", depth_of_field="shallow"),
+        shot="portrait",
+        aspect_ratio="4:5",
+    ),
+    lighting="single warm lantern key light, cold blue storm fill",
+    style=StyleSettings(keywords=["oil painting", "chiaroscuro"], medium="oil on canvas"),
+    color=ColorSettings(palette="amber and slate", dominant_colors=["amber", "slate blue"]),
+    notes="Fake server response.",
+)
+
+
+@dataclass(frozen=True)
+class LatencyModel:
+    """Simulated per-call model latency in seconds; ``spread`` is the distribution's width around ``mean``."""
+
+    distribution: str = "fixed"
+    mean: float = 0.5
+    spread: float = 0.1
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            value = self.mean
+        elif self.distribution == "uniform":
+            value = rng.uniform(self.mean - self.spread, self.mean + self.spread)
+        elif self.distribution == "normal":
+            value = rng.gauss(self.mean, self.spread)
+        elif self.distribution == "lognormal":
+            # Parameterised so the arithmetic mean is ``mean`` and the standard deviation is ``spread``.
+            sigma = math.sqrt(math.log(1 + (self.spread / self.mean) ** 2)) if self.mean > 0 else 0.0
+            value = rng.lognormvariate(math.log(max(self.mean, 1e-6)) - sigma**2 / 2, sigma)
+        elif self.distribution == "exponential":
+            value = rng.expovariate(1 / self.mean) if self.mean > 0 else 0.0
+        else:
+            raise ValueError(f"Unknown latency distribution '{self.distribution}'.")
+        return max(0.0, value)
+
+
+@dataclass
+class FakeServerConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    error_rate: float = 0.0
+    error_status: int = 500
+    seed: Optional[int] = None
+
+
+class FakeServerStats:
+    """Totals the load-test harness reads to separate simulated model time from framework overhead."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.simulated_seconds = 0.0
+            self.by_schema: Dict[str, int] = {}
+
+    def record(self, schema: str, simulated: float, failed: bool) -> None:
+        with self._lock:
+            self.calls += 1
+            self.errors += int(failed)
+            self.simulated_seconds += simulated
+            self.by_schema[schema] = self.by_schema.get(schema, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "simulated_seconds": round(self.simulated_seconds, 6),
+                "by_schema": dict(self.by_schema),
+            }
+
+
+def _message_text(messages: List[Dict[str, Any]]) -> str:
+    parts: List[str] = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(part.get("text", "") for part in content if part.get("type") == "text")
+    return "\n".join(parts)
+
+
+def _requested_schema(body: Dict[str, Any], text: str) -> str:
+    response_format = body.get("response_format") or {}
+    name = (response_format.get("json_schema") or {}).get("name", "")
+    if name in ("GeneratedPromptData", "ProviderOptimizedPayload", "BlueprintSections", "RewrittenPrompt"):
+        return name
+    return "ProviderOptimizedPayload" if "ProviderOptimizedPayload" in text else "GeneratedPromptData"
+
+
+def _section_payload(body: Dict[str, Any]) -> str:
+    """Sample values for each requested section path; list indexes map to the sample's first item."""
+    properties = body["response_format"]["json_schema"]["schema"].get("properties", {})
+    values = {}
+    for path in properties:
+        steps = tuple(0 if isinstance(step, int) else step for step in parse_section_path(path))
+        values[path] = next(iter(section_values(SAMPLE_BLUEPRINT, [steps]).values()))
+    return compact_json(values)
+
+
+def _requested_target(text: str) -> str:
+    match = re.search(r"for (flux\.1|wan-2\.2|sdxl)\b", text)
+    if match:
+        return match.group(1)
+    return next((target for target in TARGET_MODELS if target in text), TARGET_MODELS[0])
+
+
+def create_app(config: FakeServerConfig) -> FastAPI:
+    app = FastAPI(title="Fake LLM server")
+    rng = random.Random(config.seed)
+    stats = FakeServerStats()
+    converter = RuleBasedPromptConverter()
+    payloads = {
+        "GeneratedPromptData": compact_json(SAMPLE_BLUEPRINT.model_dump(mode="json")),
+        **{
+            target: compact_json(converter.convert(SAMPLE_BLUEPRINT, target).model_dump(mode="json"))
+            for target in TARGET_MODELS
+        },
+    }
+    app.state.stats = stats
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "fake-llm", "object": "model", "owned_by": "benchmarks"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages") or []
+        text = _message_text(messages)
+        schema = _requested_schema(body, text)
+        simulated = config.latency.sample(rng)
+        failed = rng.random() < config.error_rate
+        await asyncio.sleep(simulated)
+        stats.record(schema, simulated, failed)
+        if failed:
+            return JSONResponse(
+                status_code=config.error_status,
+                content={"error": {"message": "Simulated provider error", "type": "server_error", "code": None}},
+            )
+
+        if schema == "BlueprintSections":
+            content = _section_payload(body)
+        elif schema == "RewrittenPrompt":
+            content = compact_json({"prompt": converter.convert(SAMPLE_BLUEPRINT, _requested_target(text)).prompt})
+        elif schema == "GeneratedPromptData":
+            content = payloads["GeneratedPromptData"]
+        else:
+            content = payloads[_requested_target(text)]
+        if not body.get("response_format"):
+            # CrewAI agents answer in the ReAct format; structured-output calls expect bare JSON.
+            content = f"Thought: I now know the final answer\nFinal Answer: {content}"
+        prompt_tokens = count_message_tokens(messages)
+        completion_tokens = count_tokens(content)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-llm"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    @app.get("/stats")
+    async def read_stats():
+        return stats.snapshot()
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.reset()
+        return stats.snapshot()
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--latency-distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-mean", type=float, default=0.5, help="Mean simulated latency per call (seconds).")
+    parser.add_argument("--latency-spread", type=float, default=0.1, help="Half-width (uniform) or std dev (seconds).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls that fail, 0-1.")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeServerConfig(
+        latency=LatencyModel(args.latency_distribution, args.latency_mean, args.latency_spread),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Load test for the prompt API against the bundled fake LLM server.
+
+Starts ``benchmarks.fake_llm_server`` and the API (unless ``--app-url`` points at a running one), then drives
+``/api/generate-prompt``, ``/api/describe-image`` and ``/api/convert-prompt`` at a fixed concurrency with the
+response caches bypassed. Reports throughput, p50/p95/p99 latency and framework overhead: request time minus
+the simulated model time the fake server spent answering, averaged per request.
+
+Run from ``backend/``::
+
+    python -m benchmarks.load_test --requests 200 --concurrency 16 --latency-mean 0.3
+    python -m benchmarks.load_test --endpoints convert --max-overhead-ms 150   # exits 1 on regression
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from PIL import Image
+
+from .fake_llm_server import DISTRIBUTIONS, SAMPLE_BLUEPRINT
+
+ENDPOINTS = ("generate", "describe", "convert")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class EndpointReport:
+    endpoint: str
+    requests: int
+    failures: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    llm_calls: int
+    llm_errors: int
+    simulated_llm_ms: float
+    overhead_ms: float
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percentile / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Process serving {url} exited with code {process.returncode}.")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}.")
+
+
+@contextmanager
+def _spawn(command: List[str], env: Dict[str, str], ready_url: str, quiet: bool) -> Iterator[None]:
+    output = subprocess.DEVNULL if quiet else None
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=output, stderr=output)
+    try:
+        _wait_until_up(ready_url, process)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _sample_image_base64() -> str:
+    image = Image.new("RGB", (512, 384), (40, 60, 90))
+    for x in range(0, 512, 32):
+        image.paste((200, 150, 60), (x, 0, x + 16, 384))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _request_bodies(args: argparse.Namespace) -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    blueprint = SAMPLE_BLUEPRINT.model_dump(mode="json")
+    image = _sample_image_base64()
+    return {
+        "generate": lambda index: {
+            "prompt": f"a lighthouse keeper reading by lantern light, variation {index}",
+            "provider": args.provider,
+            "quality": args.quality,
+            "cache": "bypass",
+        },
+        "describe": lambda index: {
+            "image_base64": image,
+            "filename": f"reference-{index}.png",
+            "provider": args.vision_provider,
+            "cache": "bypass",
+        },
+        "convert": lambda index: {
+            "data": blueprint,
+            "target_model": ("flux.1", "wan-2.2", "sdxl")[index % 3],
+            "provider": args.provider,
+            "mode": args.convert_mode,
+            "cache": "bypass",
+        },
+    }
+
+
+PATHS = {"generate": "/api/generate-prompt", "describe": "/api/describe-image", "convert": "/api/convert-prompt"}
+
+
+async def _drive(
+    client: httpx.AsyncClient, path: str, body: Callable[[int], Dict[str, Any]], total: int, concurrency: int
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    failures = 0
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal failures
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                response = await client.post(path, json=body(index))
+                ok = response.status_code == 200 and response.json().get("success", False)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            failures += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"latencies": latencies, "failures": failures, "seconds": time.perf_counter() - started}
+
+
+async def _run_endpoint(args: argparse.Namespace, endpoint: str, body: Callable[[int], Dict[str, Any]]) -> EndpointReport:
+    path = PATHS[endpoint]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.app_url, timeout=args.timeout, limits=limits) as client:
+        await _drive(client, path, body, args.warmup, min(args.warmup, args.concurrency) or 1)
+        async with httpx.AsyncClient(base_url=args.llm_url, timeout=10) as llm:
+            await llm.post("/stats/reset")
+            result = await _drive(client, path, body, args.requests, args.concurrency)
+            llm_stats = (await llm.get("/stats")).json()
+
+    latencies = result["latencies"]
+    simulated = llm_stats["simulated_seconds"]
+    return EndpointReport(
+        endpoint=endpoint,
+        requests=len(latencies),
+        failures=result["failures"],
+        seconds=round(result["seconds"], 3),
+        rps=round(len(latencies) / result["seconds"], 2),
+        p50_ms=round(_percentile(latencies, 50) * 1000, 1),
+        p95_ms=round(_percentile(latencies, 95) * 1000, 1),
+        p99_ms=round(_percentile(latencies, 99) * 1000, 1),
+        llm_calls=llm_stats["calls"],
+        llm_errors=llm_stats["errors"],
+        simulated_llm_ms=round(simulated / len(latencies) * 1000, 1),
+        overhead_ms=round((sum(latencies) - simulated) / len(latencies) * 1000, 1),
+    )
+
+
+def _print_reports(reports: List[EndpointReport]) -> None:
+    header = f"{'endpoint':<10}{'reqs':>6}{'fail':>6}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    header += f"{'llm calls':>11}{'llm ms/req':>12}{'overhead ms':>13}"
+    print(header)
+    for report in reports:
+        print(
+            f"{report.endpoint:<10}{report.requests:>6}{report.failures:>6}{report.rps:>9.2f}"
+            f"{report.p50_ms:>10.1f}{report.p95_ms:>10.1f}{report.p99_ms:>10.1f}"
+            f"{report.llm_calls:>11}{report.simulated_llm_ms:>12.1f}{report.overhead_ms:>13.1f}"
+        )
+
+
+def app_env(llm_url: str, concurrency: int) -> Dict[str, str]:
+    """Environment for an API process whose ``lmstudio`` and ``openai`` providers point at the fake server."""
+    env = dict(os.environ)
+    api_base = f"{llm_url}/v1"
+    lane = str(concurrency)
+    env.update(
+        {
+            "LMSTUDIO_BASE_URL": api_base,
+            "LMSTUDIO_MODEL": "openai/fake-llm",
+            "LMSTUDIO_MAX_CONCURRENCY": lane,
+            "LMSTUDIO_MAX_QUEUE": str(concurrency * 4),
+            # The vision path needs a provider that supports images; the OpenAI SDK honours OPENAI_BASE_URL.
+            "OPENAI_BASE_URL": api_base,
+            "OPENAI_API_KEY": env.get("FAKE_LLM_API_KEY", "sk-fake"),
+            "OPENAI_MAX_CONCURRENCY": lane,
+            "OPENAI_MAX_QUEUE": str(concurrency * 4),
+            "CREW_MAX_WORKERS": str(max(32, concurrency * 2)),
+            "CREW_VERBOSE": "false",
+        }
+    )
+    return env
+
+
+@contextmanager
+def _servers(args: argparse.Namespace) -> Iterator[None]:
+    """Start the fake LLM server and, unless ``--app-url`` was given, the API wired to it."""
+    if args.llm_url:
+        llm_server = None
+    else:
+        llm_port = _free_port()
+        args.llm_url = f"http://127.0.0.1:{llm_port}"
+        llm_server = [
+            sys.executable, "-m", "benchmarks.fake_llm_server", "--port", str(llm_port),
+            "--latency-distribution", args.latency_distribution,
+            "--latency-mean", str(args.latency_mean), "--latency-spread", str(args.latency_spread),
+            "--error-rate", str(args.error_rate),
+        ]
+        if args.seed is not None:
+            llm_server += ["--seed", str(args.seed)]
+
+    env = app_env(args.llm_url, args.concurrency)
+    with _maybe_spawn(llm_server, env, f"{args.llm_url}/stats", args.quiet):
+        if args.app_url:
+            yield
+            return
+        app_port = _free_port()
+        args.app_url = f"http://127.0.0.1:{app_port}"
+        app_server = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(app_port), "--log-level", "warning", "--no-access-log",
+        ]
+        with _spawn(app_server, env, f"{args.app_url}/health", args.quiet):
+            yield
+
+
+@contextmanager
+def _maybe_spawn(command: Optional[List[str]], env: Dict[str, str], ready_url: str, quiet: bool) -> Iterator[None]:
+    if command is None:
+        yield
+        return
+    with _spawn(command, env, ready_url, quiet):
+        yield
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated subset of: generate, describe, convert.")
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per endpoint.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=4, help="Unmeasured requests per endpoint before timing.")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--provider", default="lmstudio", help="Provider for generate/convert requests.")
+    parser.add_argument("--vision-provider", default="openai", help="Provider for describe-image requests.")
+    parser.add_argument("--quality", choices=("fast", "standard"), default="standard")
+    parser.add_argument("--convert-mode", choices=("llm", "polish", "fast"), default="llm")
+    parser.add_argument("--app-url", default=None, help="Benchmark a running API instead of starting one.")
+    parser.add_argument("--llm-url", default=None, help="Use a running fake LLM server (its /stats is read).")
+    parser.add_argument("--latency-distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-mean", type=float, default=0.2)
+    parser.add_argument("--latency-spread", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the reports to this file.")
+    parser.add_argument("--max-overhead-ms", type=float, default=None, help="Exit 1 if any endpoint exceeds this.")
+    parser.add_argument("--verbose", dest="quiet", action="store_false", help="Show server output.")
+    args = parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = sorted(set(endpoints) - set(ENDPOINTS))
+    if unknown:
+        parser.error(f"Unknown endpoints: {', '.join(unknown)}")
+
+    with _servers(args):
+        bodies = _request_bodies(args)
+        reports = [asyncio.run(_run_endpoint(args, endpoint, bodies[endpoint])) for endpoint in endpoints]
+
+    _print_reports(reports)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump({"config": vars(args), "reports": [asdict(report) for report in reports]}, handle, indent=2)
+    if args.max_overhead_ms is not None:
+        regressions = [report for report in reports if report.overhead_ms > args.max_overhead_ms]
+        for report in regressions:
+            print(f"{report.endpoint}: overhead {report.overhead_ms} ms exceeds {args.max_overhead_ms} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
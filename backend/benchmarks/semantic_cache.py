@@ -0,0 +1,176 @@
+"""Benchmark for the semantic prompt cache.
+
+Fills a :class:`SemanticPromptCache` with synthetic image prompts, then times lookups for three query sets:
+paraphrases of stored prompts (same content, different wording and order), near variants (one attribute
+changed) and unseen prompts built from a disjoint vocabulary. Reports how each set lands (hit / seed /
+miss), whether paraphrase hits found the prompt they came from, insert throughput, matrix memory and
+lookup latency percentiles. No LLM or server is involved.
+
+Run from ``backend/``::
+
+    python -m benchmarks.semantic_cache --entries 100000 --queries 2000
+    python -m benchmarks.semantic_cache --dimensions 1024 --hit-threshold 0.85 --json semantic.json
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Tuple
+
+from app.services.semantic_cache import SemanticPromptCache
+
+MOODS = (
+    "moody", "serene", "gritty", "whimsical", "melancholic", "vibrant", "eerie", "dreamy", "tense", "nostalgic",
+    "joyful", "austere", "lonely", "cozy", "chaotic", "majestic", "somber", "playful", "mysterious", "tranquil",
+)
+SETTINGS = (
+    "cabin", "harbour", "desert", "forest", "rooftop", "subway", "library", "greenhouse", "lighthouse", "market",
+    "cathedral", "kitchen", "glacier", "vineyard", "alley", "observatory", "workshop", "meadow", "canyon", "diner",
+    "laboratory", "monastery", "bazaar", "shipyard", "ballroom", "orchard", "tundra", "boardwalk", "attic", "temple",
+)
+STYLES = (
+    "portrait", "painting", "photograph", "illustration", "sketch", "render", "watercolour", "woodcut", "mural",
+    "etching", "collage", "still", "lithograph", "pastel", "miniature",
+)
+AGES = ("old", "young", "teenage", "elderly", "middle-aged", "infant", "adult", "ancient")
+SUBJECTS = (
+    "man", "woman", "fisherman", "dancer", "astronaut", "blacksmith", "violinist", "gardener", "knight", "chef",
+    "nurse", "sailor", "monk", "farmer", "pilot", "scholar", "painter", "miner", "queen", "beekeeper",
+    "cartographer", "clockmaker", "falconer", "weaver", "potter",
+)
+LIGHTING = (
+    "golden hour light", "candlelight", "neon glow", "overcast daylight", "harsh noon sun", "moonlight",
+    "rim lighting", "soft window light", "firelight", "studio strobes", "fog-diffused light", "lantern light",
+)
+# Unseen prompts draw from words the cache never stored.
+NOVEL_WORDS = (
+    "hexagonal", "turbine", "origami", "quasar", "basalt", "kelp", "magnetar", "trellis", "zeppelin", "obsidian",
+    "cactus", "glyph", "sprocket", "nebula", "marimba", "pagoda", "chrysalis", "tapestry", "geyser", "sonar",
+)
+
+Prompt = Tuple[str, str, str, str, str, str]
+
+
+def _attributes(rng: random.Random) -> Prompt:
+    return (
+        rng.choice(MOODS),
+        rng.choice(SETTINGS),
+        rng.choice(STYLES),
+        rng.choice(AGES),
+        rng.choice(SUBJECTS),
+        rng.choice(LIGHTING),
+    )
+
+
+def _stored_text(prompt: Prompt) -> str:
+    mood, setting, style, age, subject, lighting = prompt
+    return f"{mood} {setting} {style} of an {age} {subject}, {lighting}"
+
+
+def _paraphrase(prompt: Prompt) -> str:
+    mood, setting, style, age, subject, lighting = prompt
+    return f"{style} of the {age} {subject} in a {mood} {setting} with {lighting}"
+
+
+def _variant(prompt: Prompt, rng: random.Random) -> str:
+    changed = list(prompt)
+    changed[5] = rng.choice([lighting for lighting in LIGHTING if lighting != prompt[5]])
+    return _stored_text(tuple(changed))
+
+
+def _novel(rng: random.Random) -> str:
+    return " ".join(rng.sample(NOVEL_WORDS, 6))
+
+
+@dataclass
+class QuerySet:
+    name: str
+    outcomes: Dict[str, int] = field(default_factory=lambda: {"hit": 0, "seed": 0, "miss": 0})
+    correct_hits: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, object]:
+        total = sum(self.outcomes.values()) or 1
+        ordered = sorted(self.latencies_ms)
+        return {
+            "queries": sum(self.outcomes.values()),
+            **{f"{outcome}_rate": round(count / total, 4) for outcome, count in self.outcomes.items()},
+            "correct_hit_rate": round(self.correct_hits / max(1, self.outcomes["hit"]), 4),
+            "p50_ms": round(statistics.median(ordered), 3) if ordered else None,
+            "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 3) if ordered else None,
+            "p99_ms": round(ordered[int(0.99 * (len(ordered) - 1))], 3) if ordered else None,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000, help="Prompts stored before querying.")
+    parser.add_argument("--queries", type=int, default=1000, help="Queries per query set.")
+    parser.add_argument("--dimensions", type=int, default=512)
+    parser.add_argument("--hit-threshold", type=float, default=0.9)
+    parser.add_argument("--seed-threshold", type=float, default=0.6)
+    parser.add_argument("--namespaces", type=int, default=1, help="Spread entries over this many namespaces.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cache: SemanticPromptCache[int] = SemanticPromptCache(
+        args.entries, args.dimensions, args.hit_threshold, args.seed_threshold
+    )
+    namespaces = [f"ns-{index}" for index in range(args.namespaces)]
+
+    stored: List[Tuple[str, Prompt]] = []
+    seen = set()
+    while len(stored) < args.entries:
+        prompt = _attributes(rng)
+        if prompt not in seen:
+            seen.add(prompt)
+            stored.append((namespaces[len(stored) % len(namespaces)], prompt))
+
+    started = time.perf_counter()
+    for index, (namespace, prompt) in enumerate(stored):
+        cache.add(namespace, _stored_text(prompt), index)
+    insert_seconds = time.perf_counter() - started
+
+    query_sets = [QuerySet("paraphrase"), QuerySet("variant"), QuerySet("novel")]
+    sample = rng.sample(range(len(stored)), min(args.queries, len(stored)))
+    for index in sample:
+        namespace, prompt = stored[index]
+        for query_set, text in zip(query_sets, (_paraphrase(prompt), _variant(prompt, rng), _novel(rng))):
+            lookup_started = time.perf_counter()
+            outcome, match = cache.lookup(namespace, text)
+            query_set.latencies_ms.append((time.perf_counter() - lookup_started) * 1000)
+            query_set.outcomes[outcome] += 1
+            if outcome == "hit" and match.value == index:
+                query_set.correct_hits += 1
+
+    results = {
+        "config": vars(args),
+        "insert_per_second": round(len(stored) / insert_seconds, 1),
+        "matrix_mb": round(args.entries * args.dimensions * 4 / 2**20, 1),
+        "sets": {query_set.name: query_set.summary() for query_set in query_sets},
+        "cache": cache.stats(),
+    }
+
+    print(
+        f"{len(stored)} entries x {args.dimensions} dims ({results['matrix_mb']} MB), "
+        f"{results['insert_per_second']:.0f} inserts/s"
+    )
+    print(f"{'set':<12}{'hit':>8}{'seed':>8}{'miss':>8}{'correct':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, summary in results["sets"].items():
+        print(
+            f"{name:<12}{summary['hit_rate']:>8.3f}{summary['seed_rate']:>8.3f}{summary['miss_rate']:>8.3f}"
+            f"{summary['correct_hit_rate']:>9.3f}{summary['p50_ms']:>9.3f}{summary['p95_ms']:>9.3f}"
+            f"{summary['p99_ms']:>9.3f}"
+        )
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Cold-start benchmark for the prompt API.
+
+Measures, in fresh interpreters: the time to ``import app.main`` (and which heavy libraries that import
+pulled in), the time from launching a uvicorn worker until ``/health`` answers, and the latency of the
+first request against that worker compared with the requests after it. Requests go to the bundled fake LLM
+server, so only our own start-up and lazy-init costs are measured.
+
+Run from ``backend/``::
+
+    python -m benchmarks.startup --runs 5 --budget-ms 1000      # exits 1 if the median import is slower
+    python -m benchmarks.startup --warmup blocking --requests 5 # first request after a blocking warm-up
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+from .load_test import BACKEND_DIR, _free_port, _spawn, app_env
+
+# Libraries that must not be imported by ``app.main`` itself; they load on first use or during warm-up.
+HEAVY_MODULES = ("crewai", "litellm", "openai", "chromadb", "sqlalchemy")
+
+_IMPORT_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "heavy": [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+@dataclass
+class StartupRun:
+    import_ms: float
+    heavy_modules: List[str]
+    ready_ms: Optional[float] = None
+    first_request_ms: Optional[float] = None
+    later_request_ms: Optional[float] = None
+
+
+def _measure_import() -> Dict[str, object]:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _measure_worker(args: argparse.Namespace, run: StartupRun) -> None:
+    """Launch a worker, time it to a healthy ``/health``, then time its first and following requests."""
+    env = app_env(args.llm_url, 4)
+    env["STARTUP_WARMUP"] = args.warmup
+    env["RESULT_STORE_URL"] = ""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    output = subprocess.DEVNULL if args.quiet else None
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=output, stderr=output)
+    try:
+        with httpx.Client(base_url=url, timeout=args.timeout) as client:
+            while True:
+                if process.poll() is not None:
+                    raise RuntimeError(f"Worker exited with code {process.returncode}.")
+                try:
+                    client.get("/health", timeout=0.5)
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.01)
+            run.ready_ms = round((time.perf_counter() - started) * 1000, 1)
+
+            latencies = []
+            for index in range(args.requests):
+                body = {
+                    "prompt": f"a quiet harbour at dawn, take {index}",
+                    "provider": "lmstudio",
+                    "quality": args.quality,
+                    "cache": "bypass",
+                }
+                request_started = time.perf_counter()
+                response = client.post("/api/generate-prompt", json=body)
+                latencies.append((time.perf_counter() - request_started) * 1000)
+                if response.status_code != 200 or not response.json().get("success"):
+                    raise RuntimeError(f"Request failed: {response.status_code} {response.text[:200]}")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    if latencies:
+        run.first_request_ms = round(latencies[0], 1)
+    if len(latencies) > 1:
+        run.later_request_ms = round(statistics.median(latencies[1:]), 1)
+
+
+@contextmanager
+def _fake_llm(args: argparse.Namespace) -> Iterator[None]:
+    if args.requests <= 0 or args.llm_url:
+        yield
+        return
+    port = _free_port()
+    args.llm_url = f"http://127.0.0.1:{port}"
+    command = [sys.executable, "-m", "benchmarks.fake_llm_server", "--port", str(port), "--latency-mean", str(args.latency_mean)]
+    with _spawn(command, app_env(args.llm_url, 4), f"{args.llm_url}/stats", args.quiet):
+        yield
+
+
+def _median(runs: List[StartupRun], field: str) -> Optional[float]:
+    values = [getattr(run, field) for run in runs if getattr(run, field) is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters / workers to measure.")
+    parser.add_argument("--requests", type=int, default=3, help="Requests per worker; 0 skips the worker phase.")
+    parser.add_argument("--warmup", choices=("off", "background", "blocking"), default="off", help="STARTUP_WARMUP for the workers.")
+    parser.add_argument("--quality", choices=("fast", "standard"), default="fast")
+    parser.add_argument("--latency-mean", type=float, default=0.05, help="Fake LLM latency per call.")
+    parser.add_argument("--llm-url", default=None, help="Use a running fake LLM server.")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the runs to this file.")
+    parser.add_argument(
+        "--budget-ms", type=float, default=None, help="Exit 1 if the median import exceeds this or loads heavy modules."
+    )
+    parser.add_argument("--verbose", dest="quiet", action="store_false", help="Show server output.")
+    args = parser.parse_args()
+
+    runs: List[StartupRun] = []
+    with _fake_llm(args):
+        for _ in range(args.runs):
+            probe = _measure_import()
+            run = StartupRun(import_ms=round(probe["seconds"] * 1000, 1), heavy_modules=probe["heavy"])
+            if args.requests > 0:
+                _measure_worker(args, run)
+            runs.append(run)
+
+    print(f"{'run':<5}{'import ms':>11}{'ready ms':>10}{'first req ms':>14}{'later req ms':>14}  heavy imports")
+    for index, run in enumerate(runs, start=1):
+        print(
+            f"{index:<5}{run.import_ms:>11.1f}{run.ready_ms or 0:>10.1f}{run.first_request_ms or 0:>14.1f}"
+            f"{run.later_request_ms or 0:>14.1f}  {', '.join(run.heavy_modules) or '-'}"
+        )
+    summary = {field: _median(runs, field) for field in ("import_ms", "ready_ms", "first_request_ms", "later_request_ms")}
+    print("median  " + "  ".join(f"{field}={value}" for field, value in summary.items()))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump({"config": vars(args), "median": summary, "runs": [asdict(run) for run in runs]}, handle, indent=2)
+    if args.budget_ms is not None:
+        failed = False
+        heavy = sorted({name for run in runs for name in run.heavy_modules})
+        if heavy:
+            print(f"app.main imports {', '.join(heavy)} eagerly")
+            failed = True
+        if summary["import_ms"] > args.budget_ms:
+            print(f"median import {summary['import_ms']} ms exceeds the {args.budget_ms} ms budget")
+            failed = True
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ from pathlib import Path
 # Add the current directory to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from app.services.settings import env_int
+from app.worker import WorkerPool
+
 def main():
     """Main entry point for the application"""
     
@@ -24,16 +27,29 @@ def main():
     print(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
     print(f"Reload: {reload}")
     print(f"API Documentation: http://{host}:{port}/docs")
+
+    # Job workers run the queued pipeline jobs; set JOB_WORKER_PROCESSES=0 to run them elsewhere
+    # with `python -m app.worker`.
+    worker_pool = None
+    worker_processes = env_int("JOB_WORKER_PROCESSES", 2, minimum=0)
+    if worker_processes and os.getenv("JOB_QUEUE_URL", "sqlite:///./jobs.db").strip():
+        worker_pool = WorkerPool(worker_processes)
+        worker_pool.start_in_background()
+        print(f"Job workers: {worker_processes}")
     
     # Start the server
-    uvicorn.run(
-        "app.main:app",
-        host=host,
-        port=port,
-        reload=reload,
-        log_level=log_level,
-        access_log=True
-    )
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            log_level=log_level,
+            access_log=True
+        )
+    finally:
+        if worker_pool is not None:
+            worker_pool.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
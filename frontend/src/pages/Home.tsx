@@ -3,7 +3,6 @@ import { ArrowLeft, ArrowRight, Settings } from 'lucide-react';
 import SettingsModal from '@/components/SettingsModal';
 import { useSession } from '@/hooks/useSession';
 import {
-  GeneratePromptFromImageRequest,
   GeneratePromptRequest,
   GeneratePromptResponse,
   GeneratedPromptData,
@@ -11,8 +10,9 @@ import {
   ConvertPromptResponse,
   ProviderTargetModel,
   generatePrompt,
-  generatePromptFromImage,
+  describeImageUpload,
   convertPrompt,
+  regenerateSections,
 } from '@/services/api';
 import { DescribeStep, ProviderOption } from '@/pages/steps/DescribeStep';
 import { RefineStep } from '@/pages/steps/RefineStep';
@@ -164,6 +164,10 @@ export default function Home() {
   const [conversionResponse, setConversionResponse] = useState<ConvertPromptResponse | null>(null);
   const [conversionLoading, setConversionLoading] = useState(false);
   const [conversionError, setConversionError] = useState<string | null>(null);
+  // Blueprint behind conversionResponse; re-converting sends both so the server only converts the edit.
+  const [convertedBlueprint, setConvertedBlueprint] = useState<GeneratedPromptData | null>(null);
+  const [regeneratingSections, setRegeneratingSections] = useState<string[]>([]);
+  const [regenerationError, setRegenerationError] = useState<string | null>(null);
   const lastEditableSnapshot = useRef<string | null>(null);
 
   const { apiKeys, addTokenUsage, tokenUsage } = useSession();
@@ -202,6 +206,7 @@ export default function Home() {
 
   const resetConversion = useCallback(() => {
     setConversionResponse(null);
+    setConvertedBlueprint(null);
     setConversionError(null);
     setConversionLoading(false);
   }, []);
@@ -230,22 +235,6 @@ export default function Home() {
 
   const isSubmitDisabled = loading || (inputMode === 'text' ? !prompt.trim() : !referenceImage);
 
-  const convertFileToBase64 = (file: File) =>
-    new Promise<string>((resolve, reject) => {
-      const reader = new FileReader();
-      reader.onload = () => {
-        if (typeof reader.result === 'string') {
-          const resultString = reader.result as string;
-          const parts = resultString.split(',');
-          resolve(parts.length > 1 ? parts[1] : resultString);
-        } else {
-          reject(new Error('Unable to read image'));
-        }
-      };
-      reader.onerror = () => reject(new Error('Unable to read image'));
-      reader.readAsDataURL(file);
-    });
-
   const handleReferenceImageSelection = (file: File | null) => {
     setReferenceImage(file);
     if (!file) {
@@ -289,16 +278,24 @@ export default function Home() {
     setConversionLoading(true);
     setConversionError(null);
 
+    const previousResult = conversionResponse?.data;
+    const previous =
+      previousResult && convertedBlueprint && previousResult.target_model === conversionTarget
+        ? { previous_data: convertedBlueprint, previous_result: previousResult }
+        : {};
+
     try {
       const result = await convertPrompt({
         data: editableData,
         target_model: conversionTarget,
         provider: textProvider,
         provider_api_keys: sanitisedApiKeys,
+        ...previous,
       });
 
       if (result.success && result.data) {
         setConversionResponse(result);
+        setConvertedBlueprint(editableData);
       } else {
         setConversionResponse(null);
         setConversionError(result.error || 'Unable to convert the prompt.');
@@ -312,7 +309,46 @@ export default function Home() {
     } finally {
       setConversionLoading(false);
     }
-  }, [editableData, conversionTarget, textProvider, sanitisedApiKeys, trackTokenUsage]);
+  }, [
+    editableData,
+    conversionTarget,
+    conversionResponse,
+    convertedBlueprint,
+    textProvider,
+    sanitisedApiKeys,
+    trackTokenUsage,
+  ]);
+
+  const handleRegenerateSection = useCallback(
+    async (path: string) => {
+      if (!editableData) {
+        return;
+      }
+
+      setRegeneratingSections((current) => [...current, path]);
+      setRegenerationError(null);
+      try {
+        const result = await regenerateSections({
+          data: editableData,
+          sections: [path],
+          provider: textProvider,
+          provider_api_keys: sanitisedApiKeys,
+        });
+        if (result.success && result.data) {
+          setEditableData(normaliseGeneratedPromptData(result.data));
+        } else {
+          setRegenerationError(result.error || 'Unable to regenerate this section.');
+        }
+        trackTokenUsage(result.token_usage);
+      } catch (error) {
+        console.error('Failed to regenerate section:', error);
+        setRegenerationError('An unexpected error occurred while regenerating the section.');
+      } finally {
+        setRegeneratingSections((current) => current.filter((entry) => entry !== path));
+      }
+    },
+    [editableData, textProvider, sanitisedApiKeys, trackTokenUsage]
+  );
 
   const handleSubmit = async (event: React.FormEvent<HTMLFormElement>) => {
     event.preventDefault();
@@ -334,14 +370,11 @@ export default function Home() {
         if (!referenceImage) {
           throw new Error('Missing reference image');
         }
-        const imageBase64 = await convertFileToBase64(referenceImage);
-        const request: GeneratePromptFromImageRequest = {
-          image_base64: imageBase64,
-          filename: referenceImage.name,
+        result = await describeImageUpload({
+          file: referenceImage,
           provider: visionProvider,
           provider_api_keys: sanitisedApiKeys,
-        };
-        result = await generatePromptFromImage(request);
+        });
       }
 
       setResponse(result);
@@ -710,6 +743,9 @@ export default function Home() {
                   onSafetyChange={handleSafetyChange}
                   onNotesChange={handleNotesChange}
                   onSubjectChange={handleSubjectChange}
+                  onRegenerateSection={handleRegenerateSection}
+                  regeneratingSections={regeneratingSections}
+                  regenerationError={regenerationError}
                   response={response}
                   navigation={renderNavigationControls({
                     continueLabel: 'Continue',
@@ -39,6 +39,9 @@ interface RefineStepProps {
   onSubjectChange: <K extends keyof Subject>(index: number, field: K, value: string) => void;
   navigation: ReactNode;
   response: GeneratePromptResponse | null;
+  onRegenerateSection?: (path: string) => void;
+  regeneratingSections?: string[];
+  regenerationError?: string | null;
 }
 
 const getSuggestions = (key?: FieldSuggestionKey) => (key ? getSuggestionsForField(key) : []);
@@ -136,7 +139,29 @@ export function RefineStep({
   onSubjectChange,
   navigation,
   response,
+  onRegenerateSection,
+  regeneratingSections = [],
+  regenerationError,
 }: RefineStepProps) {
+  const renderRegenerateButton = (path: string, label: string) => {
+    if (!onRegenerateSection) {
+      return null;
+    }
+    const busy = regeneratingSections.includes(path);
+    // One section at a time: each response carries the whole merged blueprint.
+    return (
+      <button
+        type="button"
+        onClick={() => onRegenerateSection(path)}
+        disabled={regeneratingSections.length > 0}
+        className="rounded-lg border border-slate-700 px-3 py-1 text-xs font-medium text-slate-300 transition hover:border-indigo-400 hover:text-white disabled:cursor-wait disabled:opacity-60"
+        title={`Regenerate ${label} only`}
+      >
+        {busy ? 'Regenerating…' : 'Regenerate'}
+      </button>
+    );
+  };
+
   return (
     <section className="w-full flex-shrink-0 p-8 space-y-6">
       <div className="flex flex-col gap-4 lg:flex-row lg:items-start lg:justify-between lg:gap-6">
@@ -153,6 +178,11 @@ export function RefineStep({
       {editableData ? (
         <div className="grid grid-cols-1 gap-8 lg:grid-cols-[minmax(0,1fr)_minmax(280px,1fr)]">
           <div className="space-y-6">
+            {regenerationError && (
+              <p className="rounded-xl border border-red-500/40 bg-red-500/10 px-4 py-3 text-sm text-red-200">
+                {regenerationError}
+              </p>
+            )}
             <div className="rounded-2xl border border-slate-800 bg-slate-900/70 p-6 shadow-inner">
               <h3 className="text-lg font-semibold text-white mb-4">Overview & prompt</h3>
               <dl className="grid gap-4 text-sm text-slate-200 md:grid-cols-2">
@@ -186,9 +216,12 @@ export function RefineStep({
             </div>
 
             <div className="rounded-2xl border border-slate-800 bg-slate-900/70 p-6 shadow-inner space-y-6">
-              <div>
-                <h3 className="text-lg font-semibold text-white">Composition</h3>
-                <p className="text-xs text-slate-500">Tune the camera recipe and framing rules.</p>
+              <div className="flex items-start justify-between gap-4">
+                <div>
+                  <h3 className="text-lg font-semibold text-white">Composition</h3>
+                  <p className="text-xs text-slate-500">Tune the camera recipe and framing rules.</p>
+                </div>
+                {renderRegenerateButton('composition', 'composition')}
               </div>
               <dl className="grid gap-4 text-sm text-slate-200 md:grid-cols-2">
                 <div className="flex flex-col gap-1">
@@ -258,7 +291,10 @@ export function RefineStep({
                   )}
                 </div>
                 <div className="flex flex-col gap-1 md:col-span-2">
-                  <dt className="text-xs uppercase tracking-wide text-slate-500">Lighting</dt>
+                  <div className="flex items-center justify-between gap-4">
+                    <dt className="text-xs uppercase tracking-wide text-slate-500">Lighting</dt>
+                    {renderRegenerateButton('lighting', 'lighting')}
+                  </div>
                   {renderTokenizedValue(
                     editableData.lighting,
                     onLightingChange,
@@ -317,7 +353,10 @@ export function RefineStep({
                     key={index}
                     className="rounded-xl border border-slate-800/70 bg-slate-950/60 p-4 space-y-4"
                   >
-                    <p className="text-xs uppercase tracking-wide text-slate-500">Subject {index + 1}</p>
+                    <div className="flex items-center justify-between gap-4">
+                      <p className="text-xs uppercase tracking-wide text-slate-500">Subject {index + 1}</p>
+                      {renderRegenerateButton(`subjects[${index}]`, `subject ${index + 1}`)}
+                    </div>
                     <div className="grid grid-cols-1 gap-3 text-sm text-slate-200 md:grid-cols-2">
                       <div className="flex flex-col gap-1">
                         <span className="text-xs uppercase tracking-wide text-slate-500">Role</span>
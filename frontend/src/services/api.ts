@@ -9,10 +9,16 @@ const api = axios.create({
   },
 });
 
+export type CacheMode = 'default' | 'bypass' | 'refresh';
+export type GenerationQuality = 'fast' | 'standard';
+
 export interface GeneratePromptRequest {
   prompt: string;
   provider?: string;
   provider_api_keys?: Record<string, string>;
+  cache?: CacheMode;
+  quality?: GenerationQuality;
+  review?: boolean;
 }
 
 export interface GeneratePromptFromImageRequest {
@@ -129,16 +135,47 @@ export interface GeneratedPromptData {
   notes?: string;
 }
 
+export interface PromptTokenAccounting {
+  input_tokens: number;
+  saved_tokens: number;
+  estimator: string;
+}
+
+export interface TokenUsage {
+  prompt_tokens: number;
+  completion_tokens: number;
+  cached_prompt_tokens: number;
+  total_tokens: number;
+  successful_requests: number;
+}
+
+export interface RequestTimings {
+  queue_wait?: number;
+  stages: Record<string, number>;
+}
+
 export interface GeneratePromptResponse {
   success: boolean;
   data?: GeneratedPromptData;
   processing_time?: number;
+  timings?: RequestTimings;
   error?: string;
-  token_usage?: unknown;
+  token_usage?: TokenUsage;
+  prompt_tokens?: PromptTokenAccounting;
+  cached?: boolean;
+  semantic_match?: SemanticCacheMatch;
+}
+
+export interface SemanticCacheMatch {
+  mode: 'hit' | 'seed';
+  prompt: string;
+  similarity: number;
 }
 
 export type ProviderTargetModel = 'flux.1' | 'wan-2.2' | 'sdxl';
 
+export type ConversionMode = 'llm' | 'fast' | 'polish';
+
 export interface ProviderOptimizedPayload {
   target_model: ProviderTargetModel;
   model_identifier: string;
@@ -155,13 +192,76 @@ export interface ConvertPromptRequest {
   target_model: ProviderTargetModel;
   provider?: string;
   provider_api_keys?: Record<string, string>;
+  cache?: CacheMode;
+  mode?: ConversionMode;
+  previous_data?: GeneratedPromptData;
+  previous_result?: ProviderOptimizedPayload;
 }
 
 export interface ConvertPromptResponse {
   success: boolean;
   data?: ProviderOptimizedPayload;
+  processing_time?: number;
+  timings?: RequestTimings;
   error?: string;
-  token_usage?: unknown;
+  token_usage?: TokenUsage;
+  prompt_tokens?: PromptTokenAccounting;
+  cached?: boolean;
+}
+
+export interface ConvertPromptMultiRequest {
+  data: GeneratedPromptData;
+  target_models?: ProviderTargetModel[];
+  provider?: string;
+  provider_api_keys?: Record<string, string>;
+  cache?: CacheMode;
+  mode?: ConversionMode;
+}
+
+export interface ConvertPromptMultiResponse {
+  success: boolean;
+  results: Partial<Record<ProviderTargetModel, ConvertPromptResponse>>;
+  error?: string;
+}
+
+/** Section paths such as `lighting`, `subjects[1]` or `composition.camera`. */
+export interface RegenerateSectionsRequest {
+  data: GeneratedPromptData;
+  sections: string[];
+  instructions?: string;
+  provider?: string;
+  provider_api_keys?: Record<string, string>;
+}
+
+export interface RegenerateSectionsResponse extends GeneratePromptResponse {
+  sections?: string[];
+}
+
+export type HistoryKind = 'generate' | 'describe_image' | 'convert' | 'regenerate_sections';
+
+export interface HistoryQuery {
+  limit?: number;
+  before?: number;
+  kind?: HistoryKind;
+  input_hash?: string;
+  since?: string;
+  until?: string;
+}
+
+export interface HistoryRecord {
+  id: number;
+  kind: HistoryKind;
+  input_hash: string;
+  provider: string;
+  model: string;
+  target_model?: ProviderTargetModel | null;
+  request: Record<string, unknown>;
+  result: GeneratedPromptData | ProviderOptimizedPayload;
+  processing_time?: number | null;
+  timings?: RequestTimings | null;
+  token_usage?: TokenUsage | null;
+  prompt_tokens?: PromptTokenAccounting | null;
+  created_at: string;
 }
 
 const handleAxiosError = (error: unknown, fallbackMessage: string) => {
@@ -197,6 +297,33 @@ export const generatePromptFromImage = async (
   }
 };
 
+export interface DescribeImageUploadRequest {
+  file: File;
+  provider?: string;
+  provider_api_keys?: Record<string, string>;
+}
+
+export const describeImageUpload = async (
+  request: DescribeImageUploadRequest
+): Promise<GeneratePromptResponse> => {
+  const form = new FormData();
+  form.append('file', request.file, request.file.name);
+  if (request.provider) {
+    form.append('provider', request.provider);
+  }
+  if (request.provider_api_keys) {
+    form.append('provider_api_keys', JSON.stringify(request.provider_api_keys));
+  }
+  try {
+    const response = await api.post<GeneratePromptResponse>('/api/describe-image/upload', form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  } catch (error) {
+    return handleAxiosError(error, 'An error occurred while analysing the image');
+  }
+};
+
 export const convertPrompt = async (
   request: ConvertPromptRequest
 ): Promise<ConvertPromptResponse> => {
@@ -207,3 +334,34 @@ export const convertPrompt = async (
     return handleAxiosError(error, 'An error occurred while converting the prompt');
   }
 };
+
+export const convertPromptMulti = async (
+  request: ConvertPromptMultiRequest
+): Promise<ConvertPromptMultiResponse> => {
+  try {
+    const response = await api.post<ConvertPromptMultiResponse>('/api/convert-prompt/multi', request);
+    return response.data;
+  } catch (error) {
+    return { results: {}, ...handleAxiosError(error, 'An error occurred while converting the prompt') };
+  }
+};
+
+export const regenerateSections = async (
+  request: RegenerateSectionsRequest
+): Promise<RegenerateSectionsResponse> => {
+  try {
+    const response = await api.post<RegenerateSectionsResponse>('/api/regenerate-sections', request);
+    return response.data;
+  } catch (error) {
+    return handleAxiosError(error, 'An error occurred while regenerating the section');
+  }
+};
+
+/** One page of stored results, newest first; pass the last record's id as `before` for the next page. */
+export const fetchHistory = async (query: HistoryQuery = {}): Promise<HistoryRecord[]> => {
+  const response = await api.get<string>('/api/history', { params: query, responseType: 'text' });
+  return response.data
+    .split('\n')
+    .filter((line) => line.trim())
+    .map((line) => JSON.parse(line) as HistoryRecord);
+};